@@ -17,35 +17,103 @@ import pandas as pd
 import numpy as np
 import os
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, ClientsideFunction, Input, Output, State, callback, ctx
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import copy
+import gzip
+import io
+import threading
 import traceback
-from scipy import stats
+import time
+from flask import Response, g, jsonify, request
 
-def load_and_prepare_data():
-    """Load and prepare the MLB attendance data for analysis"""
+from aggregates import Aggregates
+from championships import championship_stats
+from client_data import CLIENTSIDE_FILTERING, season_ranking, team_series
+from data_index import DataIndex
+from downsample import WEBGL_THRESHOLD, box_stats, lttb, minmax, target_points, visible_x_range
+import exports
+from exports import ExportError, ExportService
+from figure_cache import ErrorFigure, FigureCache, figure_cache
+from figure_pool import FigurePool
+from ingest import GAME_LOG_DIR, TEAM_NAME_MAP, game_log_files, ingest_game_logs
+import metrics
+import payloads
+from payloads import compress, figure_template, response_body, template_script
+from prepared_cache import load_or_prepare, source_fingerprint
+from query import QUERY_CACHE_SIZE, QueryError, make_engine, run_query
+from regression import Regressions
+from schema import compact_frame, concat_compact
+from season_updates import UPDATE_ALLOW_LOCAL, UPDATE_TOKEN, UPDATES_DIR, UpdateWatcher, parse_rows
+from shared_data import load_shared
+from static_bundle import STATIC_BUNDLE_DIR, StaticBundle
+from team_summary import TeamSummary
+from trends import Trends
+from ws_data import WS_DATA_FILE, get_ws_data
+
+def add_ws_markers(df, ws_df):
+    """Add World Series champion/finalist flag columns to df in place.
+
+    Flags are resolved with a single hashed (team, Season) lookup per
+    column instead of scanning ws_df once per row.
+    """
+    row_keys = pd.MultiIndex.from_arrays([df['team'], df['Season']])
+    for col, ws_col in (('ws_champion', 'Winner'), ('ws_finalist', 'Loser')):
+        ws_keys = pd.MultiIndex.from_arrays([ws_df[ws_col], ws_df['Season']])
+        df[col] = row_keys.isin(ws_keys)
+    return df
+
+def find_data_file():
+    """Locate the attendance CSV"""
     # Check if the data file exists (try 2025 first, fallback to 2024)
     if os.path.exists('MLB_attendance_data_2000-2025.csv'):
-        data_file = 'MLB_attendance_data_2000-2025.csv'
+        return 'MLB_attendance_data_2000-2025.csv'
     elif os.path.exists('MLB_attendance_data_2000-2024.csv'):
-        data_file = 'MLB_attendance_data_2000-2024.csv'
-    else:
-        raise FileNotFoundError("MLB attendance data file not found!")
+        return 'MLB_attendance_data_2000-2024.csv'
+    raise FileNotFoundError("MLB attendance data file not found!")
+
+def data_sources():
+    """Source files the dataset is built from: the attendance CSV or game logs, plus the World Series CSV"""
+    ws_sources = [WS_DATA_FILE] if os.path.exists(WS_DATA_FILE) else []
+    if GAME_LOG_DIR:
+        return game_log_files(GAME_LOG_DIR) + ws_sources
+    return [find_data_file()] + ws_sources
+
+def load_and_prepare_data():
+    """Load and prepare the MLB attendance data for analysis
+
+    The prepared frame is cached on disk keyed by a hash of the source CSVs,
+    so only the first start after a data change pays for prepare_data().
+    In the shared-memory deployment mode the frame exported by the master
+    process is attached instead.
+    """
+    shared = load_shared()
+    if shared is not None:
+        return shared
+    
+    # Game-level mode: stream per-game logs and roll them up to team-seasons
+    if GAME_LOG_DIR:
+        log_files = game_log_files(GAME_LOG_DIR)
+        if not log_files:
+            raise FileNotFoundError(f"No game logs found in {GAME_LOG_DIR}")
+        return load_or_prepare(data_sources(), lambda: prepare_frame(ingest_game_logs(log_files)))
     
+    data_file = find_data_file()
+    return load_or_prepare(data_sources(), lambda: prepare_data(data_file))
+
+def prepare_data(data_file):
+    """Parse data_file and build the prepared frame used by the callbacks"""
     # Load data
     df = pd.read_csv(data_file)
     print(f"✓ Loaded {data_file} with {len(df)} records")
-    
+    return prepare_frame(df)
+
+def prepare_frame(df):
+    """Normalize a raw team-season frame and add the computed columns"""
     # Normalize team names - consolidate all variants
-    df['team'] = df['team'].replace({
-        'Anaheim Angels': 'Los Angeles Angels',
-        'Los Angeles Angels of Anaheim': 'Los Angeles Angels',
-        'Florida Marlins': 'Miami Marlins',
-        'Tampa Bay Devil Rays': 'Tampa Bay Rays',
-        'Montreal Expos': 'Washington Nationals'
-    })
+    df['team'] = df['team'].replace(TEAM_NAME_MAP)
     
     # Ensure all numeric columns are properly converted
     numeric_cols = ['attendance', 'Attend/G', 'Est. Payroll']
@@ -57,70 +125,420 @@ def load_and_prepare_data():
     
     # Load World Series data if available
     try:
-        if os.path.exists('MLB Wolrd Series Winners 2000-25.csv'):
-            ws_df = pd.read_csv('MLB Wolrd Series Winners 2000-25.csv', skiprows=1)
-            ws_df.columns = ['Season', 'Winner', 'Loser', 'Series']
-            ws_df['Winner'] = ws_df['Winner'].str.strip()
-            ws_df['Loser'] = ws_df['Loser'].str.strip()
-            
-            # Normalize WS team names
-            ws_df['Winner'] = ws_df['Winner'].replace({
-                'Anaheim Angels': 'Los Angeles Angels',
-                'Florida Marlins': 'Miami Marlins',
-                'Cleveland Indians': 'Cleveland Guardians'
-            })
-            ws_df['Loser'] = ws_df['Loser'].replace({
-                'Anaheim Angels': 'Los Angeles Angels',
-                'Florida Marlins': 'Miami Marlins',
-                'Cleveland Indians': 'Cleveland Guardians'
-            })
-            
+        ws_data = get_ws_data()
+        if ws_data is not None:
             # Add championship markers
-            df['ws_champion'] = df.apply(
-                lambda row: '🏆' if any((ws_df['Winner'] == row['team']) & (ws_df['Season'] == row['Season'])) else '',
-                axis=1
-            )
-            df['ws_finalist'] = df.apply(
-                lambda row: '🥈' if any((ws_df['Loser'] == row['team']) & (ws_df['Season'] == row['Season'])) else '',
-                axis=1
-            )
+            add_ws_markers(df, ws_data.frame)
             print("✓ World Series data loaded and integrated")
         else:
-            df['ws_champion'] = ''
-            df['ws_finalist'] = ''
+            df['ws_champion'] = False
+            df['ws_finalist'] = False
     except Exception as e:
         print(f"Note: World Series data not loaded: {e}")
-        df['ws_champion'] = ''
-        df['ws_finalist'] = ''
+        df['ws_champion'] = False
+        df['ws_finalist'] = False
     
-    return df
+    # Categorical team, int16 Season, bool flags, float32 where lossless
+    return compact_frame(df)
 
 # Initialize the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 server = app.server  # For deployment
 
-# Function to get clean list of teams
-def get_teams(df):
-    """Get a clean sorted list of teams"""
-    teams = df['team'].astype(str).unique()
-    return sorted([team for team in teams if team and team != 'nan'])
+# The shared Plotly templates go to the browser once per page instead of in every figure (payloads.py)
+app.index_string = app.index_string.replace('{%scripts%}', template_script() + '\n        {%scripts%}')
 
-# Load data at startup
-try:
-    df = load_and_prepare_data()
-    teams = get_teams(df)
-    seasons = sorted(df['Season'].unique())
-    
-    # Color scale for teams
+@server.before_request
+def start_callback_timer():
+    """Count and time every /_dash-update-component request by its output"""
+    if request.path.endswith('/_dash-update-component'):
+        body = request.get_json(silent=True) or {}
+        g.callback_output = body.get('output', 'unknown')
+        g.callback_started = time.perf_counter()
+        metrics.callback_requests.inc(g.callback_output)
+
+@server.after_request
+def record_callback_timer(response):
+    """Record server time and response size of a callback request"""
+    started = g.pop('callback_started', None)
+    if started is not None and metrics.sampled():
+        metrics.callback_seconds.observe(time.perf_counter() - started, g.callback_output)
+        if not response.is_streamed:
+            metrics.callback_response_bytes.observe(response.calculate_content_length() or 0, g.callback_output)
+    return response
+
+@server.route('/stats/callbacks')
+def callback_dispatch_stats():
+    """Callback dispatch counts, including the average per tab switch"""
+    by_output = {output: count for (output,), count in metrics.callback_requests.values().items()}
+    total = sum(by_output.values())
+    tab_switches = by_output.get('tab-content.children', 0)
+    return jsonify(
+        total=total,
+        tab_switches=tab_switches,
+        per_tab_switch=total / tab_switches if tab_switches else None,
+        by_output=by_output,
+    )
+
+@server.route('/metrics')
+def prometheus_metrics():
+    """Callback latency, payload size and cache metrics in Prometheus text format"""
+    stats = figure_cache.stats()
+    gauges = [
+        ('mlb_figure_cache_entries', 'Figures held in the cache', stats['entries']),
+        ('mlb_figure_cache_bytes', 'Serialized size of the cached figures', stats['bytes']),
+        ('mlb_figure_cache_evictions', 'Figures evicted from the cache since start', stats['evictions']),
+        ('mlb_query_cache_entries', 'Query API results held in the cache', len(query_cache)),
+        ('mlb_export_jobs_pending', 'Export jobs queued or running', export_service.pending()),
+        ('mlb_dataset_version', 'Version of the loaded dataset', dataset_version),
+        ('mlb_dataset_rows', 'Team-season rows loaded', len(df)),
+    ]
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+def figure_error(name, error):
+    """Report a failed figure callback and return the figure shown in its place"""
+    print(f"Error in {name}: {error}")
+    traceback.print_exc()
+    metrics.callback_errors.inc(name)
+    return ErrorFigure().update_layout(title=f"Error: {str(error)}")
+
+def build_team_color_map(teams):
+    """Color scale for teams"""
     team_colors = px.colors.qualitative.Plotly[:len(teams)]
-    team_color_map = {team: team_colors[i % len(team_colors)] for i, team in enumerate(teams)}
+    return {team: team_colors[i % len(team_colors)] for i, team in enumerate(teams)}
+
+# Bumped on every (re)load or append; part of every figure cache key
+dataset_version = 0
+# dataset_version of the last full reload (or of the last append that changed the team list)
+base_version = 0
+# dataset_version at which each season last received rows, since base_version
+season_versions = {}
+
+# Serializes appends; readers never take it
+_append_lock = threading.Lock()
+
+# Query API results (query.py), keyed on the query and dataset_version
+query_cache = FigureCache(QUERY_CACHE_SIZE)
+
+def reload_data():
+    """(Re)load the dataset and rebuild everything derived from it"""
+    global df, teams, seasons, data_index, aggregates, regressions, trends, team_color_map, query_engine, team_summary
+    global dataset_version, base_version, season_versions
+    try:
+        df = load_and_prepare_data()
+        # Per-team statistics; its sorted team names are the team list
+        team_summary = TeamSummary(df)
+        teams = team_summary.teams
+        seasons = [int(season) for season in sorted(df['Season'].unique())]
+        # Shared-memory frames are indexed by position to stay zero-copy
+        data_index = DataIndex(df, materialize='shared_memory' not in df.attrs)
+        aggregates = Aggregates(df)
+        regressions = Regressions(df)
+        trends = Trends(df)
+        query_engine = make_engine(df)
+        team_color_map = build_team_color_map(teams)
+        
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        df = pd.DataFrame()
+        team_summary = TeamSummary(df)
+        teams = []
+        seasons = []
+        data_index = DataIndex(df)
+        aggregates = Aggregates(df)
+        regressions = Regressions(df)
+        trends = Trends(df)
+        query_engine = make_engine(df)
+        team_color_map = {}
     
-except Exception as e:
-    print(f"Error loading data: {e}")
-    df = pd.DataFrame()
-    teams = []
-    seasons = []
-    team_color_map = {}
+    # Figures built from the previous dataset can never be served again
+    dataset_version += 1
+    base_version = dataset_version
+    season_versions = {}
+    figure_cache.clear()
+
+def append_rows(rows):
+    """Fold new team-season rows into the loaded dataset without a full reload
+
+    Only the new rows are prepared, indexed, rolled up and fitted; the loaded
+    rows are not revisited. Everything is built on copies and swapped in at
+    the end, so requests running meanwhile keep reading the previous state.
+    Returns the sorted list of seasons that received rows.
+    """
+    global df, teams, seasons, data_index, aggregates, regressions, trends, team_color_map, query_engine, team_summary
+    global dataset_version, base_version, season_versions
+    with _append_lock:
+        new_rows = prepare_frame(parse_rows(rows))
+        if new_rows.duplicated(['team', 'Season']).any():
+            raise ValueError("Duplicate team-season rows in the update")
+        loaded = {season: set(data_index.season(season)['team']) if len(df) else set()
+                  for season in new_rows['Season'].unique()}
+        clashes = [f"{team} {season}" for team, season in zip(new_rows['team'], new_rows['Season'])
+                   if team in loaded[season]]
+        if clashes:
+            raise ValueError(f"Already loaded: {', '.join(clashes[:5])}" + (" ..." if len(clashes) > 5 else ""))
+        
+        combined = concat_compact(df, new_rows) if len(df) else new_rows.reset_index(drop=True)
+        new_index = copy.copy(data_index)
+        new_index.append(combined, len(df))
+        new_aggregates = copy.copy(aggregates)
+        affected = new_aggregates.append(new_rows)
+        new_regressions = copy.copy(regressions)
+        new_regressions.append(new_rows)
+        new_trends = copy.copy(trends)
+        new_trends.append(combined, len(df))
+        new_query_engine = copy.copy(query_engine)
+        new_query_engine.append(combined, len(df))
+        new_team_summary = copy.copy(team_summary)
+        new_team_summary.append(new_rows, new_index)
+        new_teams = new_team_summary.teams
+        
+        # Publish the data first and the version last, so a figure keyed on
+        # the new version is always built from the new data
+        df, data_index, aggregates, regressions, trends, query_engine, team_summary = (
+            combined, new_index, new_aggregates, new_regressions, new_trends, new_query_engine, new_team_summary)
+        seasons = sorted(set(seasons) | {int(season) for season in affected})
+        teams_changed = new_teams != teams
+        if teams_changed:
+            teams, team_color_map = new_teams, build_team_color_map(new_teams)
+        dataset_version += 1
+        if teams_changed:
+            base_version, season_versions = dataset_version, {}
+        else:
+            season_versions = {**season_versions, **{season: dataset_version for season in affected}}
+        evicted = figure_cache.evict_stale()
+        print(f"✓ Appended {len(new_rows)} rows for seasons {sorted(affected)}; "
+              f"evicted {evicted} cached figures")
+        return sorted(affected)
+
+def get_dataset_version(*args):
+    """Version of the loaded attendance dataset (callback arguments are ignored)"""
+    return dataset_version
+
+def get_season_version(selected_seasons, *args):
+    """Version of the rows of the season(s) a figure shows
+
+    Season figures stay cached when rows for other seasons are appended.
+    """
+    if not isinstance(selected_seasons, (list, tuple)):
+        selected_seasons = [selected_seasons]
+    versions = []
+    for season in selected_seasons:
+        try:
+            versions.append(season_versions.get(int(season), base_version))
+        except (TypeError, ValueError):
+            versions.append(base_version)
+    return (base_version, tuple(versions))
+
+def get_ws_dataset_version(*args):
+    """Version of the attendance dataset plus the World Series file"""
+    ws_data = get_ws_data()
+    return (dataset_version, ws_data.signature if ws_data is not None else None)
+
+# (get_ws_dataset_version(), ChampionshipStats) for the data last asked about
+_championship_stats = (None, None)
+
+def get_championship_stats():
+    """ChampionshipStats for the loaded data and World Series file (None without it), computed once per version"""
+    global _championship_stats
+    # Version first: appends publish the data before the version, so the data is never older
+    version = get_ws_dataset_version()
+    cached_version, stats = _championship_stats
+    if cached_version != version:
+        ws_data = get_ws_data()
+        team_means = team_summary.table['attendance_mean'].dropna()
+        stats = championship_stats(df, team_means, ws_data) if ws_data is not None else None
+        _championship_stats = (version, stats)
+    return stats
+
+# Load data at startup
+reload_data()
+get_championship_stats()
+
+# Pre-rendered figures (static_bundle.py), served while the loaded data is what they were rendered from
+static_bundle = None
+static_bundle_version = None
+
+def use_static_bundle(directory):
+    """Serve the bundle in directory if it was rendered from the current source files"""
+    global static_bundle, static_bundle_version
+    bundle = StaticBundle.load(directory)
+    if bundle.fingerprint != source_fingerprint(data_sources()):
+        print(f"Note: static bundle in {directory} was rendered from other data; not served")
+        return None
+    static_bundle, static_bundle_version = bundle, get_ws_dataset_version()
+    print(f"✓ Serving {len(bundle)} pre-rendered figures from {directory}")
+    return bundle
+
+if STATIC_BUNDLE_DIR:
+    try:
+        use_static_bundle(STATIC_BUNDLE_DIR)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Note: static bundle not loaded from {STATIC_BUNDLE_DIR}: {e}")
+
+@server.before_request
+def serve_static_figure():
+    """Answer bundled figure requests from the pre-rendered bundle, without running the callback"""
+    if static_bundle is None or not request.path.endswith('/_dash-update-component'):
+        return None
+    # Appended rows or a changed World Series file retire the bundle
+    if get_ws_dataset_version() != static_bundle_version:
+        return None
+    payload = static_bundle.lookup(request.get_json(silent=True))
+    if payload is None:
+        return None
+    metrics.static_bundle_responses.inc(g.get('callback_output', 'unknown'))
+    if request.accept_encodings['gzip']:
+        response = Response(payload, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(gzip.decompress(payload), mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    return response
+
+@server.before_request
+def serve_cached_figure():
+    """Answer a memoized figure callback from the figure cache, sending the stored JSON as-is"""
+    if not payloads.CACHED_FIGURE_PASSTHROUGH or not request.path.endswith('/_dash-update-component'):
+        return None
+    body = request.get_json(silent=True)
+    output = body.get('output') if isinstance(body, dict) else None
+    spec = app.callback_map.get(output) if isinstance(output, str) else None
+    func = getattr(spec.get('callback'), '__wrapped__', None) if spec else None
+    if getattr(func, 'lookup', None) is None:
+        return None
+    deps = (body.get('inputs') or []) + (body.get('state') or [])
+    if len(deps) != len(spec['inputs']) + len(spec['state']) or not all(isinstance(dep, dict) for dep in deps):
+        return None
+    # A miss falls through to Dash, which runs the callback and fills the cache
+    payload = func.lookup(func.cache_key(*[dep.get('value') for dep in deps]), record_miss=False)
+    if payload is None:
+        return None
+    return Response(response_body(output, payload), mimetype='application/json')
+
+@server.after_request
+def compress_response(response):
+    """gzip/brotli-encode JSON and HTML responses the client accepts encoded"""
+    return compress(response, request.accept_encodings)
+
+def loaded_rows():
+    """Rows of the loaded dataset; appends only ever add rows"""
+    return len(df)
+
+def sync_worker(rows):
+    """Catch a spawned pool worker up with a serving process that has loaded rows rows
+
+    Workers load the data and replay the update files when they import this
+    module; rows appended since are applied from the update files here.
+    """
+    if len(df) < rows:
+        update_watcher.poll()
+    if len(df) < rows:
+        raise RuntimeError(f"Worker has {len(df)} of {rows} rows; appends only reach workers through MLB_UPDATES_DIR")
+
+# Pool for building a tab's sibling figures concurrently (off unless MLB_FIGURE_WORKERS > 0)
+figure_pool = FigurePool(sync=sync_worker, state=loaded_rows)
+
+# CSV/Parquet/image exports of the views registered below, on their own worker processes
+export_service = ExportService(version=get_ws_dataset_version, sync=sync_worker, state=loaded_rows)
+
+# Client-side filtering (client_data.py), only while no figure needs server-side downsampling
+clientside_filtering = CLIENTSIDE_FILTERING and len(df) <= WEBGL_THRESHOLD
+
+# The Team Analysis tab is only pooled when its main graph is drawn on the server
+pool_team_tab = figure_pool.enabled and not clientside_filtering
+
+def callback_if(condition, *args, **kwargs):
+    """app.callback if condition holds; otherwise another mode serves the output and func stays unregistered"""
+    if not condition:
+        return lambda func: func
+    return app.callback(*args, **kwargs)
+
+# Apply season update files now and whenever new ones are dropped in UPDATES_DIR
+update_watcher = UpdateWatcher(UPDATES_DIR, append_rows)
+update_watcher.start()
+
+@server.route('/api/seasons', methods=['POST'])
+def post_season_rows():
+    """Append team-season rows sent as a JSON list of records or as CSV"""
+    local = UPDATE_ALLOW_LOCAL and request.remote_addr in ('127.0.0.1', '::1')
+    if UPDATE_TOKEN is None and not local:
+        return jsonify(error="Season updates are off; set MLB_UPDATE_TOKEN to accept them"), 403
+    if not local and request.headers.get('Authorization') != f"Bearer {UPDATE_TOKEN}":
+        return jsonify(error="Unauthorized"), 401
+    try:
+        if request.is_json:
+            body = request.get_json()
+            rows = body.get('rows') if isinstance(body, dict) else body
+        else:
+            rows = pd.read_csv(io.StringIO(request.get_data(as_text=True)))
+        rows = parse_rows(rows)
+        affected = update_watcher.submit(rows)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(appended=len(rows), seasons=affected, dataset_version=dataset_version)
+
+@server.route('/api/query', methods=['POST'])
+def post_query():
+    """Run a read-only filter/group-by/aggregate query over the loaded dataset (see query.py)"""
+    # Version first: appends publish the data before the version, so the engine is never older
+    version = dataset_version
+    engine = query_engine
+    started = time.perf_counter()
+    try:
+        payload, hit = run_query(engine, request.get_json(silent=True), query_cache, version)
+    except QueryError as e:
+        metrics.query_requests.inc(engine.name, 'error')
+        return jsonify(error=str(e)), 400
+    metrics.query_requests.inc(engine.name, 'hit' if hit else 'miss')
+    if not hit:
+        metrics.query_seconds.observe(time.perf_counter() - started, engine.name)
+    return Response(payload, mimetype='application/json')
+
+@server.route('/api/teams')
+def get_team_summary():
+    """Team summary table (team_summary.py) as JSON records, or as a CSV download with ?format=csv"""
+    table = team_summary.with_titles(get_ws_data()).reset_index()
+    export_format = request.args.get('format', 'json')
+    if export_format == 'csv':
+        return Response(table.to_csv(index=False), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=team_summary.csv'})
+    if export_format != 'json':
+        return jsonify(error=f"Unknown format: {export_format!r} (use json or csv)"), 400
+    return Response(table.to_json(orient='records'), mimetype='application/json')
+
+@server.route('/api/export', methods=['POST'])
+def post_export():
+    """Queue an export of a view for the callback's input values (see exports.py)"""
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify(error="Send a JSON object with output, inputs and format"), 400
+    try:
+        job = export_service.submit(body.get('output'), body.get('inputs', []), body.get('format'),
+                                    body.get('options'))
+    except ExportError as e:
+        response = jsonify(error=str(e))
+        if e.status == 429:
+            response.headers['Retry-After'] = '5'
+        return response, e.status
+    return jsonify(**export_service.describe(job), url=f"/api/export/{job['id']}"), 202
+
+@server.route('/api/export/<job_id>')
+def get_export(job_id):
+    """Status of an export job, or its file once it is done"""
+    job = export_service.job(job_id)
+    if job is None:
+        return jsonify(error="Unknown export job"), 404
+    if job['status'] == 'error':
+        # The poll itself succeeded; the job record says the export failed
+        return jsonify(export_service.describe(job))
+    if job['status'] != 'done':
+        return jsonify(export_service.describe(job)), 202
+    data = export_service.result(job)
+    if data is None:
+        return jsonify(error="The export has expired; submit it again"), 410
+    return Response(data, mimetype=export_service.media_type(job),
+                    headers={'Content-Disposition': f"attachment; filename={export_service.filename(job)}"})
 
 # App layout structure
 app.layout = html.Div([
@@ -151,6 +569,12 @@ app.layout = html.Div([
     # Content div - will be filled based on selected tab
     html.Div(id='tab-content'),
     
+    # Browser width, used to size server-side downsampling
+    dcc.Store(id='viewport-width'),
+    
+    # Plotly template of the figures drawn in the browser, sent once (client-side filtering)
+    dcc.Store(id='figure-template', data=figure_template('plotly_white') if clientside_filtering else None),
+    
     # Error message div
     html.Div(id='error-message', style={'color': 'red', 'margin': '10px'}),
     
@@ -161,6 +585,13 @@ app.layout = html.Div([
     ], style={'padding': '10px', 'marginTop': '20px'})
 ], style={'fontFamily': 'Arial, sans-serif', 'maxWidth': '1200px', 'margin': '0 auto', 'padding': '20px'})
 
+# Report the browser width once on page load (no server round-trip)
+app.clientside_callback(
+    "function(_) { return window.innerWidth; }",
+    Output('viewport-width', 'data'),
+    Input('viewport-width', 'id')
+)
+
 # Define the tab content callback
 @app.callback(
     Output('tab-content', 'children'),
@@ -211,8 +642,10 @@ def render_tab_content(tab):
                 ),
             ], style={'marginBottom': '20px'}),
             
-            # Team analysis graph
+            # Team analysis graph (zoom store is only written for downsampled figures)
             dcc.Graph(id='team-analysis-graph'),
+            dcc.Store(id='team-analysis-zoom'),
+            dcc.Store(id='team-analysis-store'),
             
             # Attendance vs Payroll
             html.Div([
@@ -245,6 +678,7 @@ def render_tab_content(tab):
                     ),
                 ], style={'marginBottom': '20px'}),
                 dcc.Graph(id='top-teams-graph'),
+                dcc.Store(id='top-teams-store'),
             ]),
             
             # Team performance distribution
@@ -303,6 +737,8 @@ def render_tab_content(tab):
         ], style={'padding': '20px'})
     
     elif tab == 'tab-championship-analysis':
+        stats = get_championship_stats()
+        findings = stats.findings() if stats is not None else ["World Series data not available"]
         return html.Div([
             # Championship Impact
             html.Div([
@@ -311,13 +747,7 @@ def render_tab_content(tab):
                 html.Div([
                     html.Div([
                         html.H5("Key Findings:", style={'color': '#0B3D91'}),
-                        html.Ul([
-                            html.Li("Teams WITH championships average 2.58M fans/season"),
-                            html.Li("Teams WITHOUT championships average 1.97M fans/season"),
-                            html.Li("Championship Premium: +613K fans (+31%)"),
-                            html.Li("Post-Championship Bump: +34% average increase"),
-                            html.Li("Dodgers Dynasty: 3 championships (2020, 2024, 2025) → 4.01M attendance"),
-                        ]),
+                        html.Ul([html.Li(finding) for finding in findings]),
                     ], style={'padding': '20px', 'backgroundColor': '#f0f8ff', 'borderRadius': '10px', 'marginBottom': '20px'}),
                 ]),
                 dcc.Graph(id='championship-impact-graph'),
@@ -334,24 +764,90 @@ def render_tab_content(tab):
         html.H3("Please select a tab to view analysis")
     ], style={'textAlign': 'center', 'marginTop': '50px'})
 
+def triggered_id():
+    """Id of the component that triggered the running callback (None outside callbacks)"""
+    try:
+        return ctx.triggered_id
+    except Exception:
+        return None
+
+# Forward zoom events to the server only for downsampled figures; everything
+# else (small figures, autosize events) is handled by Plotly in the browser
+app.clientside_callback(
+    """
+    function(relayoutData, figure) {
+        var meta = figure && figure.layout && figure.layout.meta;
+        if (!relayoutData || !meta || !meta.downsampled) {
+            return window.dash_clientside.no_update;
+        }
+        if ('xaxis.range[0]' in relayoutData || 'xaxis.range' in relayoutData || 'xaxis.autorange' in relayoutData) {
+            return relayoutData;
+        }
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output('team-analysis-zoom', 'data'),
+    Input('team-analysis-graph', 'relayoutData'),
+    State('team-analysis-graph', 'figure')
+)
+
+# Axis labels of the Team Analysis metrics
+METRIC_LABELS = {
+    'attendance': 'Total Attendance',
+    'Attend/G': 'Attendance Per Game',
+    'Est. Payroll': 'Estimated Payroll ($)',
+    'efficiency': 'Attendance per Million $ of Payroll'
+}
+
+# Values of the chart-type radio items
+CHART_TYPES = ['line', 'bar', 'scatter']
+
 # Callback for team analysis graph
-@app.callback(
+@callback_if(
+    not pool_team_tab and not clientside_filtering,
     Output('team-analysis-graph', 'figure'),
     [Input('team-dropdown', 'value'),
      Input('metric-dropdown', 'value'),
-     Input('chart-type', 'value')]
+     Input('chart-type', 'value'),
+     Input('team-analysis-zoom', 'data')],
+    State('viewport-width', 'data')
 )
-def update_team_analysis_graph(selected_teams, metric, chart_type):
+def update_team_analysis_graph(selected_teams, metric, chart_type, zoom=None, viewport_width=None):
     """Update the team analysis graph based on selections"""
+    return build_team_analysis_figure(*team_analysis_args(selected_teams, metric, chart_type, zoom, viewport_width))
+
+def team_analysis_args(selected_teams, metric, chart_type, zoom, viewport_width):
+    """Arguments of build_team_analysis_figure for the current callback inputs"""
+    # Only a zoom on the graph itself narrows the data that is re-sampled
+    x_range = visible_x_range(zoom) if triggered_id() == 'team-analysis-zoom' else None
+    return (selected_teams, metric, chart_type, x_range, target_points(viewport_width))
+
+@figure_cache.memoize(version=get_dataset_version)
+def build_team_analysis_figure(selected_teams, metric, chart_type, x_range=None, n_points=None):
+    """Build the team analysis figure, downsampled when it has too many points"""
     try:
         if not selected_teams or not metric or not selected_teams[0]:
             return go.Figure().update_layout(title="Please select teams and a metric")
         
         fig = go.Figure()
         
-        for team in selected_teams:
-            team_data = df[df['team'] == team]
-            if len(team_data) > 0:
+        # Large-data mode: WebGL traces, LTTB / min-max sampled to the viewport
+        large = sum(data_index.team_count(team) for team in selected_teams) > WEBGL_THRESHOLD
+        team_frames = [(team, data_index.team(team)) for team in selected_teams]
+        metrics.mark_filtered()
+        
+        for team, team_data in team_frames:
+            if large and chart_type in ('line', 'scatter'):
+                team_data = downsample_team_series(team_data, metric, chart_type, x_range, n_points)
+                fig.add_trace(go.Scattergl(
+                    x=team_data['Season'],
+                    y=team_data[metric],
+                    mode='lines+markers' if chart_type == 'line' else 'markers',
+                    name=team,
+                    line=dict(color=team_color_map.get(team)),
+                    marker=dict(size=8 if chart_type == 'line' else 12, color=team_color_map.get(team))
+                ))
+            elif len(team_data) > 0:
                 if chart_type == 'line':
                     fig.add_trace(go.Scatter(
                         x=team_data['Season'], 
@@ -378,14 +874,7 @@ def update_team_analysis_graph(selected_teams, metric, chart_type):
                     ))
         
         # Improve layout
-        # Create a mapping of metric values to their labels
-        metric_labels = {
-            'attendance': 'Total Attendance',
-            'Attend/G': 'Attendance Per Game',
-            'Est. Payroll': 'Estimated Payroll ($)',
-            'efficiency': 'Attendance per Million $ of Payroll'
-        }
-        metric_label = metric_labels.get(metric, metric)
+        metric_label = METRIC_LABELS.get(metric, metric)
         
         fig.update_layout(
             title=f"{metric_label} by Season",
@@ -397,18 +886,40 @@ def update_team_analysis_graph(selected_teams, metric, chart_type):
         )
         
         # Format x-axis to show integer seasons
-        fig.update_xaxes(tickmode='array', tickvals=list(df['Season'].unique()))
+        fig.update_xaxes(tickmode='array', tickvals=list(seasons))
+        
+        if large:
+            # meta tells the clientside zoom filter to forward relayout events;
+            # uirevision keeps the user's zoom when the re-sampled figure arrives
+            fig.update_layout(meta={'downsampled': True}, uirevision=metric)
+            if x_range is not None:
+                fig.update_xaxes(range=list(x_range))
         
         return fig
     except Exception as e:
-        print(f"Error in team analysis graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('team analysis graph', e)
+
+def downsample_team_series(team_data, metric, chart_type, x_range, n_points):
+    """Reduce one team's (Season, metric) series to about n_points rows"""
+    team_data = team_data.dropna(subset=[metric])
+    if not team_data['Season'].is_monotonic_increasing:
+        team_data = team_data.sort_values('Season', kind='stable')
+    if x_range is not None:
+        x = team_data['Season'].to_numpy()
+        team_data = team_data.iloc[np.searchsorted(x, x_range[0], 'left'):np.searchsorted(x, x_range[1], 'right')]
+    if chart_type == 'line':
+        keep = lttb(team_data['Season'].to_numpy(), team_data[metric].to_numpy(), n_points)
+    else:
+        keep = minmax(team_data[metric].to_numpy(), n_points)
+    return team_data.iloc[keep]
 
 # Callback for attendance vs payroll graph
-@app.callback(
+@callback_if(
+    not pool_team_tab,
     Output('attendance-payroll-graph', 'figure'),
     [Input('team-dropdown', 'value')]
 )
+@figure_cache.memoize(version=get_dataset_version)
 def update_attendance_payroll_graph(selected_teams):
     """Update the attendance vs payroll comparison graph"""
     try:
@@ -417,7 +928,7 @@ def update_attendance_payroll_graph(selected_teams):
         
         # Use the first selected team for this graph
         team = selected_teams[0]
-        team_data = df[df['team'] == team]
+        team_data = data_index.team(team)
         
         if len(team_data) == 0:
             return go.Figure().update_layout(title=f"No data found for {team}")
@@ -427,6 +938,7 @@ def update_attendance_payroll_graph(selected_teams):
         
         if len(team_data) == 0:
             return go.Figure().update_layout(title=f"No complete data found for {team}")
+        metrics.mark_filtered()
         
         # Create scatter plot
         fig = px.scatter(
@@ -436,7 +948,6 @@ def update_attendance_payroll_graph(selected_teams):
             color='Season',
             size='Attend/G',
             hover_name='Season',
-            trendline='ols',
             title=f"{team} - Attendance vs Payroll Relationship",
             labels={
                 'Est. Payroll': 'Estimated Payroll ($)',
@@ -446,17 +957,35 @@ def update_attendance_payroll_graph(selected_teams):
             template='plotly_white'
         )
         
+        # OLS trendline from the fits computed at load time
+        fit = regressions.team_fit(team)
+        if fit is not None:
+            x_range = np.array([fit['x_min'], fit['x_max']])
+            fig.add_trace(go.Scatter(
+                x=x_range,
+                y=fit['slope'] * x_range + fit['intercept'],
+                mode='lines',
+                name='',
+                showlegend=False,
+                hovertemplate=(
+                    f"<b>OLS trendline</b><br>attendance = {fit['slope']:g} * Est. Payroll + {fit['intercept']:g}"
+                    f"<br>R<sup>2</sup>={fit['r'] ** 2:f}<br><br>Estimated Payroll ($)=%{{x}}"
+                    "<br>Total Attendance=%{y} <b>(trend)</b><extra></extra>"
+                )
+            ))
+        
         return fig
     except Exception as e:
-        print(f"Error in attendance vs payroll graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('attendance vs payroll graph', e)
 
 # Callback for top teams graph
-@app.callback(
+@callback_if(
+    not clientside_filtering,
     Output('top-teams-graph', 'figure'),
     [Input('season-dropdown', 'value'),
      Input('top-teams-slider', 'value')]
 )
+@figure_cache.memoize(version=get_season_version)
 def update_top_teams_graph(season, n_teams):
     """Update the top teams by attendance graph"""
     try:
@@ -464,13 +993,14 @@ def update_top_teams_graph(season, n_teams):
             return go.Figure().update_layout(title="Please select a season")
         
         # Filter data for the selected season
-        season_data = df[df['Season'] == season]
+        season_data = data_index.season(season)
         
         if len(season_data) == 0:
             return go.Figure().update_layout(title=f"No data found for season {season}")
         
         # Sort by total attendance and get top N
         top_teams = season_data.sort_values('attendance', ascending=False).head(n_teams)
+        metrics.mark_filtered()
         
         # Create bar chart
         fig = px.bar(
@@ -492,14 +1022,14 @@ def update_top_teams_graph(season, n_teams):
         
         return fig
     except Exception as e:
-        print(f"Error in top teams graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('top teams graph', e)
 
 # Callback for team distribution graph
 @app.callback(
     Output('team-distribution-graph', 'figure'),
     [Input('season-dropdown', 'value')]
 )
+@figure_cache.memoize(version=get_season_version)
 def update_team_distribution_graph(season):
     """Update the team distribution graph"""
     try:
@@ -507,7 +1037,8 @@ def update_team_distribution_graph(season):
             return go.Figure().update_layout(title="Please select a season")
         
         # Get data for the selected season
-        season_data = df[df['Season'] == season]
+        season_data = data_index.season(season)
+        metrics.mark_filtered()
         
         if len(season_data) == 0:
             return go.Figure().update_layout(title=f"No data found for season {season}")
@@ -516,6 +1047,20 @@ def update_team_distribution_graph(season):
         fig = make_subplots(rows=1, cols=2, 
                             subplot_titles=("Attendance Distribution", "Payroll Distribution"))
         
+        # Large-data mode: quartiles are computed here and no raw points are sent
+        if len(season_data) > WEBGL_THRESHOLD:
+            for col_idx, (column, name) in enumerate([('attendance', 'Attendance'), ('Est. Payroll', 'Payroll')], start=1):
+                summary = box_stats(season_data[column])
+                if summary is not None:
+                    fig.add_trace(go.Box(x=[name], name=name, boxpoints=False, **summary), row=1, col=col_idx)
+            fig.update_layout(
+                title=f"Team Performance Distribution in {season} Season",
+                template="plotly_white",
+                showlegend=False,
+                height=600
+            )
+            return fig
+        
         # Add attendance box plot
         fig.add_trace(
             go.Box(
@@ -553,27 +1098,20 @@ def update_team_distribution_graph(season):
         
         return fig
     except Exception as e:
-        print(f"Error in team distribution graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('team distribution graph', e)
 
 # Callback for league trends graph
 @app.callback(
     Output('league-trends-graph', 'figure'),
-    [Input('tabs', 'value')]  # This ensures the callback fires when tab is selected
+    [Input('league-trends-graph', 'id')]  # Fires once, when the graph is mounted with its tab
 )
-def update_league_trends_graph(tab_value):
+@figure_cache.memoize(version=get_dataset_version)
+def update_league_trends_graph(graph_id):
     """Update the league-wide attendance trends graph"""
     try:
-        # Only generate the graph if we're on the correct tab
-        if tab_value != 'tab-league-trends':
-            return go.Figure()
-            
-        # Group by season and calculate statistics
-        season_stats = df.groupby('Season').agg({
-            'attendance': 'sum',
-            'Est. Payroll': 'sum',
-            'Attend/G': 'mean'
-        }).reset_index()
+        # Season statistics are materialized at load time
+        season_stats = aggregates.season_stats()
+        metrics.mark_filtered()
         
         # Create figure with secondary y-axis
         fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -638,15 +1176,14 @@ def update_league_trends_graph(tab_value):
         
         return fig
     except Exception as e:
-        print(f"Error in league trends graph: {e}")
-        traceback.print_exc()
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('league trends graph', e)
 
 # Callback for attendance distribution graph
 @app.callback(
     Output('attendance-distribution-graph', 'figure'),
     [Input('seasons-multi-dropdown', 'value')]
 )
+@figure_cache.memoize(version=get_season_version)
 def update_attendance_distribution_graph(selected_seasons):
     """Update the attendance distribution analysis graph"""
     try:
@@ -654,7 +1191,8 @@ def update_attendance_distribution_graph(selected_seasons):
             return go.Figure().update_layout(title="Please select at least one season")
         
         # Filter data for selected seasons
-        filtered_data = df[df['Season'].isin(selected_seasons)]
+        filtered_data = data_index.seasons(selected_seasons)
+        metrics.mark_filtered()
         
         if len(filtered_data) == 0:
             return go.Figure().update_layout(title="No data found for selected seasons")
@@ -679,53 +1217,71 @@ def update_attendance_distribution_graph(selected_seasons):
         
         return fig
     except Exception as e:
-        print(f"Error in attendance distribution graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('attendance distribution graph', e)
+
+# Above this many points the payroll scatter is drawn as a single WebGL trace
+PAYROLL_SCATTER_GL_THRESHOLD = int(os.environ.get('MLB_PAYROLL_SCATTER_GL_THRESHOLD', WEBGL_THRESHOLD))
+
+def payroll_scatter_traces(filtered_df, mode='auto'):
+    """Build the season-colored markers of the payroll correlation graph
+
+    'grouped' draws one trace per season (legend entry per season) from a
+    single groupby pass; 'single' draws every point in one Scattergl trace
+    colored by season. 'auto' switches to 'single' above
+    PAYROLL_SCATTER_GL_THRESHOLD points.
+    """
+    if mode == 'auto':
+        mode = 'single' if len(filtered_df) > PAYROLL_SCATTER_GL_THRESHOLD else 'grouped'
+    marker = dict(size=12, opacity=0.8, line=dict(width=1, color='DarkSlateGrey'))
+    
+    if mode == 'single':
+        return [go.Scattergl(
+            x=filtered_df['Est. Payroll'].to_numpy(),
+            y=filtered_df['attendance'].to_numpy(),
+            mode='markers',
+            name='Team-seasons',
+            text=filtered_df['team'],
+            hovertemplate='<b>%{text}</b> (%{marker.color})<br>Season: %{marker.color}<br>Payroll: $%{x:,.0f}<br>Attendance: %{y:,.0f}<extra></extra>',
+            marker=dict(marker, color=filtered_df['Season'].to_numpy(), colorscale='Viridis',
+                        showscale=True, colorbar=dict(title='Season'))
+        )]
+    
+    # Season is baked into each trace's hovertemplate, so no per-point customdata
+    traces = []
+    for season, season_data in filtered_df.groupby('Season', sort=True):
+        season = int(season)
+        traces.append(go.Scatter(
+            x=season_data['Est. Payroll'].to_numpy(),
+            y=season_data['attendance'].to_numpy(),
+            mode='markers',
+            name=str(season),
+            text=season_data['team'],
+            hovertemplate=f'<b>%{{text}}</b> ({season})<br>Season: {season}<br>Payroll: $%{{x:,.0f}}<br>Attendance: %{{y:,.0f}}<extra></extra>',
+            marker=marker
+        ))
+    return traces
 
 # Callback for payroll correlation graph
 @app.callback(
     Output('payroll-correlation-graph', 'figure'),
-    [Input('tabs', 'value')]  # This ensures the callback fires when tab is selected
+    [Input('payroll-correlation-graph', 'id')]  # Fires once, when the graph is mounted with its tab
 )
-def update_payroll_correlation_graph(tab_value):
+@figure_cache.memoize(version=get_dataset_version)
+def update_payroll_correlation_graph(graph_id):
     """Update the payroll correlation graph"""
     try:
-        # Only generate the graph if we're on the correct tab
-        if tab_value != 'tab-payroll-analysis':
-            return go.Figure()
-        
         # Filter out rows with NaN values in critical columns
         filtered_df = df.dropna(subset=['Est. Payroll', 'attendance'])
+        metrics.mark_filtered()
         
         # Create scatter plot with regression line for all seasons without using size
-        fig = go.Figure()
-        
-        # Group by season for color-coding
-        for season in sorted(filtered_df['Season'].unique()):
-            season_data = filtered_df[filtered_df['Season'] == season]
-            
-            fig.add_trace(go.Scatter(
-                x=season_data['Est. Payroll'],
-                y=season_data['attendance'],
-                mode='markers',
-                name=str(int(season)),
-                text=season_data['team'],
-                hovertemplate='<b>%{text}</b> (%{customdata})<br>Season: %{customdata}<br>Payroll: $%{x:,.0f}<br>Attendance: %{y:,.0f}<extra></extra>',
-                customdata=np.full(len(season_data), int(season)),
-                marker=dict(
-                    size=12,
-                    opacity=0.8,
-                    line=dict(width=1, color='DarkSlateGrey')
-                )
-            ))
+        fig = go.Figure(data=payroll_scatter_traces(filtered_df))
         
         # Add a trendline for the entire dataset
-        # Calculate regression line
-        x = filtered_df['Est. Payroll']
-        y = filtered_df['attendance']
-        
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
-        x_range = np.linspace(x.min(), x.max(), 100)
+        # Regression line comes from the fits computed at load time
+        fit = regressions.global_fit()
+        slope, intercept, r_value = fit['slope'], fit['intercept'], fit['r']
+        x_range = np.linspace(fit['x_min'], fit['x_max'], 100)
         y_range = slope * x_range + intercept
         
         fig.add_trace(go.Scatter(
@@ -761,34 +1317,29 @@ def update_payroll_correlation_graph(tab_value):
         
         return fig
     except Exception as e:
-        print(f"Error in payroll correlation graph: {e}")
-        traceback.print_exc()
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('payroll correlation graph', e)
 
 # Callback for year-over-year changes graph
 @app.callback(
     Output('yoy-change-graph', 'figure'),
     [Input('yoy-team-dropdown', 'value')]
 )
+@figure_cache.memoize(version=get_dataset_version)
 def update_yoy_change_graph(team):
     """Update the year-over-year efficiency changes graph"""
     try:
         if not team:
             return go.Figure().update_layout(title="Please select a team")
         
-        # Get data for the selected team
-        team_data = df[df['team'] == team].sort_values('Season')
+        # Season-ordered rows with the year-over-year % changes precomputed at load time
+        team_data = trends.team(team)
         
         if len(team_data) <= 1:
             return go.Figure().update_layout(title=f"Insufficient data for {team} to calculate year-over-year changes")
         
-        # Calculate year-over-year percentage changes
-        team_data['attendance_yoy'] = team_data['attendance'].pct_change(fill_method=None) * 100
-        team_data['payroll_yoy'] = team_data['Est. Payroll'].pct_change(fill_method=None) * 100
-        team_data['efficiency_yoy'] = team_data['efficiency'].pct_change(fill_method=None) * 100
-        
         # Remove the first row with NaN yoy changes
         team_data = team_data.dropna(subset=['attendance_yoy'])
+        metrics.mark_filtered()
         
         # Create figure with secondary y-axis
         fig = make_subplots(specs=[[{"secondary_y": True}]])
@@ -855,49 +1406,32 @@ def update_yoy_change_graph(team):
         
         return fig
     except Exception as e:
-        print(f"Error in YoY change graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('YoY change graph', e)
 
 # Callback for championship impact graph
-@app.callback(
+@callback_if(
+    not figure_pool.enabled,
     Output('championship-impact-graph', 'figure'),
-    [Input('tabs', 'value')]
+    [Input('championship-impact-graph', 'id')]  # Fires once, when the graph is mounted with its tab
 )
-def update_championship_impact_graph(tab_value):
+@figure_cache.memoize(version=get_ws_dataset_version)
+def update_championship_impact_graph(graph_id):
     """Update the championship impact graph"""
     try:
-        if tab_value != 'tab-championship-analysis':
-            return go.Figure()
-        
-        # Load World Series data
-        if not os.path.exists('MLB Wolrd Series Winners 2000-25.csv'):
+        # Champions vs non-champions, computed once per dataset and World Series version
+        stats = get_championship_stats()
+        if stats is None:
             return go.Figure().update_layout(title="World Series data not available")
-        
-        ws_df = pd.read_csv('MLB Wolrd Series Winners 2000-25.csv', skiprows=1)
-        ws_df.columns = ['Season', 'Winner', 'Loser', 'Series']
-        ws_df['Winner'] = ws_df['Winner'].str.strip().replace({
-            'Anaheim Angels': 'Los Angeles Angels',
-            'Florida Marlins': 'Miami Marlins',
-            'Cleveland Indians': 'Cleveland Guardians'
-        })
-        
-        # Get championship counts
-        from collections import Counter
-        champ_counts = Counter(ws_df['Winner'])
-        
-        # Calculate average attendance for champions vs non-champions
-        champions = list(champ_counts.keys())
-        champs_att = df[df['team'].isin(champions)].groupby('team')['attendance'].mean()
-        non_champs_att = df[~df['team'].isin(champions)].groupby('team')['attendance'].mean()
+        metrics.mark_filtered()
         
         # Create comparison figure
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
             x=['Teams WITH Championships', 'Teams WITHOUT Championships'],
-            y=[champs_att.mean(), non_champs_att.mean()],
+            y=[stats.with_titles, stats.without_titles],
             marker_color=['#FFD700', '#C0C0C0'],
-            text=[f'{champs_att.mean():,.0f}', f'{non_champs_att.mean():,.0f}'],
+            text=[f'{stats.with_titles:,.0f}', f'{stats.without_titles:,.0f}'],
             textposition='auto',
         ))
         
@@ -909,7 +1443,7 @@ def update_championship_impact_graph(tab_value):
                 dict(
                     x=0.5, y=0.95,
                     xref="paper", yref="paper",
-                    text=f"Championship Premium: +{champs_att.mean() - non_champs_att.mean():,.0f} fans (+{((champs_att.mean() - non_champs_att.mean()) / non_champs_att.mean() * 100):.1f}%)",
+                    text=f"Championship Premium: {stats.premium:+,.0f} fans ({stats.premium_pct:+.1f}%)",
                     showarrow=False,
                     font=dict(size=14, color='#0B3D91'),
                     bgcolor="rgba(255,255,255,0.8)",
@@ -922,44 +1456,29 @@ def update_championship_impact_graph(tab_value):
         
         return fig
     except Exception as e:
-        print(f"Error in championship impact graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('championship impact graph', e)
 
 # Callback for championships by team graph
-@app.callback(
+@callback_if(
+    not figure_pool.enabled,
     Output('championships-by-team-graph', 'figure'),
-    [Input('tabs', 'value')]
+    [Input('championships-by-team-graph', 'id')]  # Fires once, when the graph is mounted with its tab
 )
-def update_championships_by_team_graph(tab_value):
+@figure_cache.memoize(version=get_ws_dataset_version)
+def update_championships_by_team_graph(graph_id):
     """Update the championships by team graph"""
     try:
-        if tab_value != 'tab-championship-analysis':
-            return go.Figure()
-        
-        # Load World Series data
-        if not os.path.exists('MLB Wolrd Series Winners 2000-25.csv'):
+        # Shared World Series data (parsed once, refreshed on file change)
+        ws_data = get_ws_data()
+        if ws_data is None:
             return go.Figure().update_layout(title="World Series data not available")
         
-        ws_df = pd.read_csv('MLB Wolrd Series Winners 2000-25.csv', skiprows=1)
-        ws_df.columns = ['Season', 'Winner', 'Loser', 'Series']
-        ws_df['Winner'] = ws_df['Winner'].str.strip().replace({
-            'Anaheim Angels': 'Los Angeles Angels',
-            'Florida Marlins': 'Miami Marlins',
-            'Cleveland Indians': 'Cleveland Guardians'
-        })
-        
-        # Get championship counts
-        from collections import Counter
-        champ_counts = Counter(ws_df['Winner'])
-        
-        # Create dataframe for plotting
-        champ_df = pd.DataFrame(list(champ_counts.items()), columns=['Team', 'Championships'])
+        # Champions in file order, with their titles and average attendance from the team summary
+        summary = team_summary.with_titles(ws_data)
+        champ_df = summary.loc[ws_data.champions, ['titles', 'attendance_mean']].reset_index()
+        champ_df.columns = ['Team', 'Championships', 'Avg_Attendance']
         champ_df = champ_df.sort_values('Championships', ascending=True)
-        
-        # Get average attendance for each champion
-        champ_df['Avg_Attendance'] = champ_df['Team'].apply(
-            lambda team: df[df['team'] == team]['attendance'].mean()
-        )
+        metrics.mark_filtered()
         
         # Create horizontal bar chart
         fig = go.Figure()
@@ -985,8 +1504,158 @@ def update_championships_by_team_graph(tab_value):
         
         return fig
     except Exception as e:
-        print(f"Error in championships by team graph: {e}")
-        return go.Figure().update_layout(title=f"Error: {str(e)}")
+        return figure_error('championships by team graph', e)
+
+# Exportable views (exports.py): figure function, callback inputs -> its arguments, rows behind the graph.
+# The args functions also validate the inputs, so a bad export request is answered 400 up front
+def team_rows(selected_teams, columns):
+    """Rows of the selected teams (in selection order), restricted to columns"""
+    frames = [data_index.team(team) for team in selected_teams or []]
+    return pd.concat(frames)[columns] if frames else pd.DataFrame(columns=columns)
+
+def checked(value, allowed, name):
+    """value if it is one of allowed; raises ValueError"""
+    if not isinstance(value, (str, int, float)) or isinstance(value, bool) or value not in allowed:
+        raise ValueError(f"Unknown {name}: {value!r}")
+    return value
+
+def checked_list(values, allowed, name):
+    """A non-empty list of allowed values; raises ValueError"""
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"Select at least one {name} (a list)")
+    return [checked(value, allowed, name) for value in values]
+
+def checked_count(value, name):
+    """A positive integer; raises ValueError"""
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"{name} must be a positive integer, not {value!r}")
+    return value
+
+def graph_id_args(graph_id):
+    """args of a view whose callback has no inputs: its only argument is the graph's own id
+
+    Clients send no inputs (or the id, as Dash does); either way the figure
+    is built, and cached, as the dashboard builds it.
+    """
+    return lambda _=None: (graph_id,)
+
+def checked_zoom(zoom):
+    """The graph's relayoutData (a dict) or None; raises ValueError"""
+    if zoom is not None and not isinstance(zoom, dict):
+        raise ValueError(f"zoom must be the graph's relayoutData (an object), not {zoom!r}")
+    return zoom
+
+exports.register(
+    'team-analysis-graph.figure', build_team_analysis_figure,
+    data=lambda selected_teams, metric, *_: team_rows(selected_teams, ['team', 'Season', metric]),
+    args=lambda selected_teams, metric, chart_type, zoom=None, viewport_width=None: (
+        checked_list(selected_teams, teams, 'team'), checked(metric, METRIC_LABELS, 'metric'),
+        checked(chart_type, CHART_TYPES, 'chart type'), visible_x_range(checked_zoom(zoom)),
+        target_points(viewport_width and checked_count(viewport_width, 'viewport_width'))))
+exports.register(
+    'attendance-payroll-graph.figure', update_attendance_payroll_graph,
+    data=lambda selected_teams: team_rows(selected_teams[:1], ['team', 'Season', 'Est. Payroll', 'attendance',
+                                                               'Attend/G']).dropna(),
+    args=lambda selected_teams: (checked_list(selected_teams, teams, 'team'),))
+exports.register(
+    'top-teams-graph.figure', update_top_teams_graph,
+    data=lambda season, n_teams: data_index.season(season).sort_values('attendance', ascending=False).head(n_teams),
+    args=lambda season, n_teams: (checked(season, seasons, 'season'), checked_count(n_teams, 'n_teams')))
+exports.register('team-distribution-graph.figure', update_team_distribution_graph,
+                 data=lambda season: data_index.season(season),
+                 args=lambda season: (checked(season, seasons, 'season'),))
+exports.register('league-trends-graph.figure', update_league_trends_graph, data=lambda *_: aggregates.season_stats(),
+                 args=graph_id_args('league-trends-graph'))
+exports.register('attendance-distribution-graph.figure', update_attendance_distribution_graph,
+                 data=lambda selected_seasons: data_index.seasons(selected_seasons),
+                 args=lambda selected_seasons: (checked_list(selected_seasons, seasons, 'season'),))
+exports.register('payroll-correlation-graph.figure', update_payroll_correlation_graph,
+                 data=lambda *_: df.dropna(subset=['Est. Payroll', 'attendance']),
+                 args=graph_id_args('payroll-correlation-graph'))
+exports.register('yoy-change-graph.figure', update_yoy_change_graph, data=lambda team: trends.team(team),
+                 args=lambda team: (checked(team, teams, 'team'),))
+exports.register('championship-impact-graph.figure', update_championship_impact_graph,
+                 data=lambda *_: team_summary.with_titles(get_ws_data()).reset_index(),
+                 args=graph_id_args('championship-impact-graph'))
+exports.register('championships-by-team-graph.figure', update_championships_by_team_graph,
+                 data=lambda *_: team_summary.with_titles(get_ws_data()).query('titles > 0').reset_index(),
+                 args=graph_id_args('championships-by-team-graph'))
+
+# Consolidated callbacks building each tab's figures concurrently
+if pool_team_tab:
+    @app.callback(
+        [Output('team-analysis-graph', 'figure'),
+         Output('attendance-payroll-graph', 'figure')],
+        [Input('team-dropdown', 'value'),
+         Input('metric-dropdown', 'value'),
+         Input('chart-type', 'value'),
+         Input('team-analysis-zoom', 'data')],
+        State('viewport-width', 'data')
+    )
+    def update_team_tab_graphs(selected_teams, metric, chart_type, zoom=None, viewport_width=None):
+        """Update the team analysis and attendance vs payroll graphs together"""
+        calls = [(build_team_analysis_figure,
+                  team_analysis_args(selected_teams, metric, chart_type, zoom, viewport_width))]
+        # The payroll graph only depends on the team selection
+        if triggered_id() in (None, 'team-dropdown'):
+            calls.append((update_attendance_payroll_graph, (selected_teams,)))
+        figures = figure_pool.build(calls)
+        return figures[0], figures[1] if len(figures) > 1 else dash.no_update
+
+if figure_pool.enabled:
+    @app.callback(
+        [Output('championship-impact-graph', 'figure'),
+         Output('championships-by-team-graph', 'figure')],
+        [Input('championship-impact-graph', 'id'),
+         Input('championships-by-team-graph', 'id')]  # Fires once, when the graphs are mounted with their tab
+    )
+    def update_championship_graphs(impact_id, by_team_id):
+        """Update both championship graphs together"""
+        return tuple(figure_pool.build([(update_championship_impact_graph, (impact_id,)),
+                                        (update_championships_by_team_graph, (by_team_id,))]))
+
+# Client-side filtering: the server only sends the rows, assets/clientside_filtering.js draws the figures
+if clientside_filtering:
+    @app.callback(
+        Output('top-teams-store', 'data'),
+        [Input('season-dropdown', 'value')]
+    )
+    def update_top_teams_store(season):
+        """Teams of the selected season ranked by attendance, for the top-N slider to cut in the browser"""
+        if not season:
+            return None
+        season_data = data_index.season(season)
+        if len(season_data) == 0:
+            return {'message': f"No data found for season {season}"}
+        return season_ranking(season, season_data, team_color_map)
+
+    app.clientside_callback(
+        ClientsideFunction('filtering', 'topTeams'),
+        Output('top-teams-graph', 'figure'),
+        [Input('top-teams-store', 'data'),
+         Input('top-teams-slider', 'value')],
+        State('figure-template', 'data')
+    )
+
+    @app.callback(
+        Output('team-analysis-store', 'data'),
+        [Input('team-dropdown', 'value')]
+    )
+    def update_team_analysis_store(selected_teams):
+        """Metric columns of the selected teams, for metric and chart type changes in the browser"""
+        if not selected_teams or not selected_teams[0]:
+            return None
+        return team_series([(team, data_index.team(team)) for team in selected_teams],
+                           seasons, team_color_map, METRIC_LABELS)
+
+    app.clientside_callback(
+        ClientsideFunction('filtering', 'teamAnalysis'),
+        Output('team-analysis-graph', 'figure'),
+        [Input('team-analysis-store', 'data'),
+         Input('metric-dropdown', 'value'),
+         Input('chart-type', 'value')],
+        State('figure-template', 'data')
+    )
 
 # Add global error handler for callbacks
 app.config.suppress_callback_exceptions = True
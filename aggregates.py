@@ -0,0 +1,65 @@
+"""
+Materialized rollups over the prepared attendance frame.
+
+Season-level sums and non-null counts are computed once at load time. Because every rollup is a sum, new rows can be folded in with
+append() without revisiting the rows that are already loaded.
+"""
+import pandas as pd
+
+# Metrics rolled up as (sum, non-null count) so means stay exact when merging
+METRIC_COLUMNS = ['attendance', 'Est. Payroll', 'Attend/G', 'efficiency']
+
+
+def rollup(df, key):
+    """Sums and non-null counts of the metric columns of df grouped by key"""
+    metrics = [col for col in METRIC_COLUMNS if col in df]
+    # Summed in float64: float32 season totals would round
+    values = df[[key] + metrics].astype({col: 'float64' for col in metrics})
+    grouped = values.groupby(key, sort=True, observed=True)
+    return pd.concat([
+        grouped[metrics].sum().add_suffix('_sum'),
+        grouped[metrics].count().add_suffix('_count'),
+    ], axis=1)
+
+
+def merge_rollups(old, new):
+    """Combine two rollups of disjoint row sets"""
+    return old.add(new, fill_value=0).sort_index()
+
+
+class Aggregates:
+    """Season rollups for a prepared attendance frame"""
+
+    def __init__(self, df):
+        self.by_season = pd.DataFrame()
+        if len(df) and 'Season' in df:
+            self.by_season = rollup(df, 'Season')
+
+    def append(self, rows):
+        """Fold newly loaded rows into the rollups.
+
+        Only seasons present in rows are recomputed; everything
+        else is left untouched. Returns the set of seasons affected.
+        """
+        if not len(rows):
+            return set()
+        if self.by_season.empty:
+            self.by_season = rollup(rows, 'Season')
+        else:
+            self.by_season = merge_rollups(self.by_season, rollup(rows, 'Season'))
+        return {int(s) for s in rows['Season'].unique()}
+
+    def _means(self, rolled, col):
+        return rolled[f'{col}_sum'] / rolled[f'{col}_count']
+
+    def season_stats(self):
+        """League-wide totals per season: attendance and payroll sums, mean Attend/G"""
+        if self.by_season.empty:
+            return pd.DataFrame(columns=['Season', 'attendance', 'Est. Payroll', 'Attend/G'])
+        stats = pd.DataFrame({
+            'attendance': self.by_season['attendance_sum'],
+            'Est. Payroll': self.by_season['Est. Payroll_sum'],
+            'Attend/G': self._means(self.by_season, 'Attend/G'),
+        })
+        stats.index.name = 'Season'
+        return stats.reset_index()
@@ -0,0 +1,91 @@
+// Figures drawn in the browser from the arrays in client_data.py stores
+// (MLB_CLIENTSIDE_FILTERING=1). They mirror update_top_teams_graph and
+// build_team_analysis_figure in MLBAttendance.py.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    filtering: {
+        message: function (text, template) {
+            return {data: [], layout: {title: {text: text}, template: template}};
+        },
+
+        topTeams: function (ranking, nTeams, template) {
+            var filtering = window.dash_clientside.filtering;
+            if (!ranking || !nTeams) {
+                return filtering.message('Please select a season', template);
+            }
+            if (ranking.message) {
+                return filtering.message(ranking.message, template);
+            }
+            var teams = ranking.teams.slice(0, nTeams);
+            var data = teams.map(function (team, i) {
+                return {
+                    type: 'bar',
+                    name: team,
+                    legendgroup: team,
+                    x: [team],
+                    y: [ranking.attendance[i]],
+                    marker: {color: ranking.colors[i], pattern: {shape: ''}},
+                    orientation: 'v',
+                    showlegend: true,
+                    textposition: 'auto',
+                    hovertemplate: 'Team=%{x}<br>Total Attendance=%{y}<extra></extra>',
+                    xaxis: 'x',
+                    yaxis: 'y'
+                };
+            });
+            return {
+                data: data,
+                layout: {
+                    template: template,
+                    title: {text: 'Top ' + nTeams + ' Teams by Total Attendance in ' + ranking.season + ' Season'},
+                    xaxis: {anchor: 'y', domain: [0, 1], title: {text: 'Team'},
+                            categoryorder: 'total descending', categoryarray: teams},
+                    yaxis: {anchor: 'x', domain: [0, 1], title: {text: 'Total Attendance'}},
+                    legend: {title: {text: 'Team'}, tracegroupgap: 0},
+                    barmode: 'relative'
+                }
+            };
+        },
+
+        teamAnalysis: function (series, metric, chartType, template) {
+            var filtering = window.dash_clientside.filtering;
+            if (!series || !metric || !series.teams.length) {
+                return filtering.message('Please select teams and a metric', template);
+            }
+            var data = [];
+            series.teams.forEach(function (team) {
+                if (!team.Season.length) {
+                    return;
+                }
+                var trace = {name: team.team, x: team.Season, y: team[metric]};
+                if (chartType === 'line') {
+                    trace.type = 'scatter';
+                    trace.mode = 'lines+markers';
+                    trace.line = {color: team.color};
+                    trace.marker = {size: 8};
+                } else if (chartType === 'bar') {
+                    trace.type = 'bar';
+                    trace.marker = {color: team.color};
+                } else if (chartType === 'scatter') {
+                    trace.type = 'scatter';
+                    trace.mode = 'markers';
+                    trace.marker = {size: 12, color: team.color};
+                } else {
+                    return;
+                }
+                data.push(trace);
+            });
+            var label = series.labels[metric] || metric;
+            return {
+                data: data,
+                layout: {
+                    template: template,
+                    title: {text: label + ' by Season'},
+                    xaxis: {title: {text: 'Season'}, tickmode: 'array', tickvals: series.seasons},
+                    yaxis: {title: {text: label}},
+                    legend: {title: {text: 'Teams'}},
+                    hovermode: 'x unified'
+                }
+            };
+        }
+    }
+});
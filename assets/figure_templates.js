@@ -0,0 +1,55 @@
+// Figures arrive with layout.template set to the name of a shared template
+// ("plotly_white") instead of the template itself (payloads.py). The
+// templates are inlined once in the index page as window.mlbFigureTemplates;
+// this wraps Plotly.newPlot/react to put them back before drawing.
+(function () {
+    function withTemplate(layout) {
+        var templates = window.mlbFigureTemplates;
+        if (!templates || !layout || typeof layout.template !== 'string' || !templates[layout.template]) {
+            return layout;
+        }
+        return Object.assign({}, layout, {template: templates[layout.template]});
+    }
+
+    function wrap(Plotly) {
+        ['newPlot', 'react'].forEach(function (name) {
+            var draw = Plotly[name];
+            if (typeof draw !== 'function' || draw.mlbFigureTemplates) {
+                return;
+            }
+            var wrapped = function (gd, data, layout) {
+                var args = Array.prototype.slice.call(arguments);
+                if (data && !Array.isArray(data) && typeof data === 'object') {
+                    // Plotly.react(gd, {data, layout, frames, config})
+                    var figure = data.layout && withTemplate(data.layout);
+                    if (figure !== data.layout) {
+                        args[1] = Object.assign({}, data, {layout: figure});
+                    }
+                } else {
+                    args[2] = withTemplate(layout);
+                }
+                return draw.apply(this, args);
+            };
+            wrapped.mlbFigureTemplates = true;
+            Plotly[name] = wrapped;
+        });
+        return Plotly;
+    }
+
+    if (window.Plotly) {
+        wrap(window.Plotly);
+        return;
+    }
+    // plotly.js is loaded after the assets: wrap it as soon as it is defined
+    var plotly;
+    Object.defineProperty(window, 'Plotly', {
+        configurable: true,
+        enumerable: true,
+        get: function () {
+            return plotly;
+        },
+        set: function (value) {
+            plotly = value ? wrap(value) : value;
+        }
+    });
+})();
@@ -0,0 +1,62 @@
+"""
+Benchmark: appending a new season vs reloading the whole dataset.
+
+  - reload: MLBAttendance.reload_data() over the base rows plus the new
+    season (CSV parsing excluded, so this understates the real restart cost)
+  - append: MLBAttendance.append_rows() with just the new season's rows
+
+Also reports how many cached season figures survive the append.
+
+Run from the repository root:
+    python -m benchmarks.bench_append
+    python -m benchmarks.bench_append --sizes 780,1M
+"""
+import argparse
+import os
+
+os.environ.setdefault('MLB_UPDATES_DIR', '')
+
+import pandas as pd
+
+import MLBAttendance
+from benchmarks.synthetic import ATTENDANCE_CSV, make_attendance_frame, parse_sizes, timed
+
+
+def new_season_rows(season=2026):
+    """One row per team, shaped like the attendance CSV, for a season not loaded yet"""
+    rows = pd.read_csv(ATTENDANCE_CSV)
+    rows = rows[rows['Season'] == rows['Season'].max()].copy()
+    rows['Season'] = season
+    return rows
+
+
+def load(raw):
+    """Make raw the loaded dataset through the regular reload path"""
+    MLBAttendance.load_and_prepare_data = lambda: MLBAttendance.prepare_frame(raw.copy())
+    MLBAttendance.reload_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    new_rows = new_season_rows()
+    print(f"{'rows':>12} {'reload (ms)':>12} {'append (ms)':>12} {'speedup':>8} {'season figures kept':>20}")
+    for n_rows in args.sizes:
+        raw = make_attendance_frame(n_rows, raw=True)
+        reload_time, _ = timed(load, pd.concat([raw, new_rows], ignore_index=True))
+
+        load(raw)
+        for season in MLBAttendance.seasons:
+            MLBAttendance.update_top_teams_graph(season, 10)
+        cached = len(MLBAttendance.figure_cache)
+        append_time, _ = timed(MLBAttendance.append_rows, new_rows)
+        assert len(MLBAttendance.df) == n_rows + len(new_rows)
+
+        print(f"{n_rows:>12,} {reload_time * 1000:12.1f} {append_time * 1000:12.1f} "
+              f"{reload_time / append_time:7.0f}x {len(MLBAttendance.figure_cache):>9}/{cached}")
+
+
+if __name__ == "__main__":
+    main()
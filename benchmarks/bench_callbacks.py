@@ -0,0 +1,242 @@
+"""
+Benchmark suite: Dash callback latency, payload size and throughput.
+
+For each dataset scale (1 = the real CSV, N = N times as many synthetic
+team-seasons) the data is loaded through MLBAttendance.load_and_prepare_data /
+reload_data, then every server-side callback is run:
+  - direct, cold: the callback function with an empty figure cache
+  - direct, warm: the same call answered from the figure cache
+  - http:         POST /_dash-update-component through the Flask test client,
+                  cold cache, so Dash's request handling and JSON encoding count
+and p50/p95/p99 latency plus response bytes are reported. Throughput is then
+measured with concurrent clients posting a mix of all callbacks.
+
+--save writes the results as JSON; --compare checks a run against a saved one
+and exits with status 1 if any p50 got slower than --tolerance allows.
+
+Run from the repository root:
+    python -m benchmarks.bench_callbacks
+    python -m benchmarks.bench_callbacks --scales 1,10 --save bench.json
+    python -m benchmarks.bench_callbacks --compare bench.json
+
+The 100000x scale (78M rows) needs well over 16 GB of RAM and is not in the
+default set; pass --scales 1,10,1000,100000 on a machine that has it.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('MLB_UPDATES_DIR', '')
+os.environ.setdefault('MLB_PREPARED_CACHE', '0')
+
+import numpy as np
+
+import MLBAttendance
+from benchmarks.synthetic import ATTENDANCE_CSV, WS_CSV, make_attendance_frame, parse_sizes, timed
+
+DATA_FILE = 'MLB_attendance_data_2000-2025.csv'
+
+
+def callback_cases():
+    """(output, function, arguments) for every server-side callback"""
+    m = MLBAttendance
+    teams = m.teams[:3]
+    season = int(m.seasons[-1])
+    return [
+        ('tab-content.children', m.render_tab_content, ['tab-team-analysis']),
+        ('team-analysis-graph.figure', m.update_team_analysis_graph, [teams, 'attendance', 'line', None, 1200]),
+        ('attendance-payroll-graph.figure', m.update_attendance_payroll_graph, [teams]),
+        ('top-teams-graph.figure', m.update_top_teams_graph, [season, 10]),
+        ('team-distribution-graph.figure', m.update_team_distribution_graph, [season]),
+        ('league-trends-graph.figure', m.update_league_trends_graph, ['league-trends-graph']),
+        ('attendance-distribution-graph.figure', m.update_attendance_distribution_graph, [[season, season - 5]]),
+        ('payroll-correlation-graph.figure', m.update_payroll_correlation_graph, ['payroll-correlation-graph']),
+        ('yoy-change-graph.figure', m.update_yoy_change_graph, [teams[0]]),
+        ('championship-impact-graph.figure', m.update_championship_impact_graph, ['championship-impact-graph']),
+        ('championships-by-team-graph.figure', m.update_championships_by_team_graph, ['championships-by-team-graph']),
+    ]
+
+
+def dash_request(output, args):
+    """Body of the /_dash-update-component request Dash sends for output"""
+    spec = MLBAttendance.app.callback_map[output]
+    deps = spec['inputs'] + spec.get('state', [])
+    values = [dict(dep, value=value) for dep, value in zip(deps, args)]
+    component, prop = output.rsplit('.', 1)
+    return {
+        'output': output,
+        'outputs': {'id': component, 'property': prop},
+        'inputs': values[:len(spec['inputs'])],
+        'state': values[len(spec['inputs']):],
+        'changedPropIds': [f"{values[0]['id']}.{values[0]['property']}"],
+    }
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99}
+
+
+def sample(func, iterations, budget, before=None):
+    """Latency samples of func: up to iterations calls, stopping after budget seconds (min 3)"""
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < iterations and (len(samples) < 3 or time.perf_counter() < deadline):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def load_scale(scale, scratch):
+    """Write the dataset for scale into scratch and load it through the app's own path"""
+    if scale == 1:
+        shutil.copy(ATTENDANCE_CSV, os.path.join(scratch, DATA_FILE))
+    else:
+        make_attendance_frame(780 * scale, raw=True).to_csv(os.path.join(scratch, DATA_FILE), index=False)
+    shutil.copy(WS_CSV, os.path.join(scratch, MLBAttendance.WS_DATA_FILE))
+    prepare, _ = timed(MLBAttendance.load_and_prepare_data)
+    reload, _ = timed(MLBAttendance.reload_data)
+    return {'load_and_prepare_data_s': prepare, 'reload_data_s': reload, 'rows': len(MLBAttendance.df)}
+
+
+def bench_callbacks(iterations, budget):
+    cache = MLBAttendance.figure_cache
+    client = MLBAttendance.server.test_client()
+    results = {}
+    for output, func, args in callback_cases():
+        body = dash_request(output, args)
+        response = client.post('/_dash-update-component', json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"{output}: HTTP {response.status_code}")
+        cold = sample(lambda: func(*args), iterations, budget, before=cache.clear)
+        warm = sample(lambda: func(*args), iterations, budget)
+        http = sample(lambda: client.post('/_dash-update-component', json=body), iterations, budget,
+                      before=cache.clear)
+        results[output] = {
+            'direct_cold': percentiles(cold),
+            'direct_warm': percentiles(warm),
+            'http': percentiles(http),
+            'bytes': len(response.data),
+        }
+    return results
+
+
+def bench_throughput(clients, seconds, warm):
+    """Requests per second with clients threads posting every callback in turn"""
+    cache = MLBAttendance.figure_cache
+    bodies = [dash_request(output, args) for output, _, args in callback_cases()]
+    max_entries = cache.max_entries
+    cache.clear()
+    if warm:
+        warmup = MLBAttendance.server.test_client()
+        for body in bodies:
+            warmup.post('/_dash-update-component', json=body)
+    else:
+        cache.max_entries = 0  # every lookup misses
+    done = []
+    stop = time.perf_counter() + seconds
+
+    def run(offset):
+        client = MLBAttendance.server.test_client()
+        count = 0
+        while time.perf_counter() < stop:
+            client.post('/_dash-update-component', json=bodies[(offset + count) % len(bodies)])
+            count += 1
+        done.append(count)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.max_entries = max_entries
+    return sum(done) / (time.perf_counter() - start)
+
+
+def report(scale, loaded, results, throughput):
+    print(f"\n=== scale {scale}x: {loaded['rows']:,} rows; load_and_prepare_data "
+          f"{loaded['load_and_prepare_data_s']:.3f}s, reload_data {loaded['reload_data_s']:.3f}s")
+    print(f"{'callback output':<38} {'mode':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'bytes':>10}")
+    for output, modes in results.items():
+        for mode in ('direct_cold', 'direct_warm', 'http'):
+            p = modes[mode]
+            print(f"{output:<38} {mode:<12} {p['p50_ms']:9.2f} {p['p95_ms']:9.2f} {p['p99_ms']:9.2f} "
+                  f"{modes['bytes'] if mode == 'http' else '':>10}")
+    print(f"{'clients':>8} {'req/s warm':>11} {'req/s cold':>11}")
+    for clients, rates in throughput.items():
+        print(f"{clients:>8} {rates['warm']:11.1f} {rates['cold']:11.1f}")
+
+
+def compare(current, baseline, tolerance):
+    """Lines describing every p50 that got slower than baseline by more than tolerance"""
+    regressions = []
+    for scale, run in current.items():
+        old_run = baseline.get(scale)
+        if old_run is None:
+            continue
+        for key in ('load_and_prepare_data_s', 'reload_data_s'):
+            old, new = old_run['load'][key], run['load'][key]
+            if new > old * (1 + tolerance):
+                regressions.append(f"{scale}x {key}: {old:.3f}s -> {new:.3f}s")
+        for output, modes in run['callbacks'].items():
+            for mode, p in modes.items():
+                old = old_run['callbacks'].get(output, {}).get(mode)
+                if isinstance(p, dict) and old and p['p50_ms'] > old['p50_ms'] * (1 + tolerance):
+                    regressions.append(f"{scale}x {output} {mode}: p50 {old['p50_ms']:.2f}ms -> {p['p50_ms']:.2f}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=parse_sizes, default=[1, 10, 1000])
+    parser.add_argument('--iterations', type=int, default=50, help="calls per callback and mode")
+    parser.add_argument('--budget', type=float, default=5.0, help="seconds per callback and mode")
+    parser.add_argument('--clients', type=parse_sizes, default=[1, 4, 16])
+    parser.add_argument('--seconds', type=float, default=5.0, help="duration of each throughput run")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of a previous run to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed p50 slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    repo_dir = os.getcwd()
+    all_results = {}
+    for scale in args.scales:
+        scratch = tempfile.mkdtemp(prefix='mlb-callbacks-')
+        try:
+            os.chdir(scratch)
+            loaded = load_scale(scale, scratch)
+            results = bench_callbacks(args.iterations, args.budget)
+            throughput = {clients: {'warm': bench_throughput(clients, args.seconds, warm=True),
+                                    'cold': bench_throughput(clients, args.seconds, warm=False)}
+                          for clients in args.clients}
+        finally:
+            os.chdir(repo_dir)
+            shutil.rmtree(scratch, ignore_errors=True)
+        report(scale, loaded, results, throughput)
+        all_results[str(scale)] = {'load': loaded, 'callbacks': results, 'throughput': throughput}
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump(all_results, fh, indent=2)
+        print(f"\n✓ Results written to {args.save}")
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(all_results, json.load(fh), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            print('\n'.join(f"  {line}" for line in regressions))
+            sys.exit(1)
+        print(f"\n✓ No p50 regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
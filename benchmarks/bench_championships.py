@@ -0,0 +1,54 @@
+"""
+Benchmark: championship statistics per render vs computed once per version.
+
+  - per render: the premium as update_championship_impact_graph used to
+                compute it on every render (two groupby('team') passes)
+  - build:      championships.championship_stats(), all Key Findings
+                including the bootstrap intervals, once per dataset version
+  - lookup:     MLBAttendance.get_championship_stats() for an unchanged version
+
+Run from the repository root:
+    python -m benchmarks.bench_championships
+    python -m benchmarks.bench_championships --sizes 780,1M,10M
+"""
+import argparse
+
+import MLBAttendance
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+from championships import championship_stats
+from schema import compact_frame
+from team_summary import TeamSummary
+from ws_data import get_ws_data
+
+
+def per_render_premium(df, champions):
+    champs_att = df[df['team'].isin(champions)].groupby('team', observed=True)['attendance'].mean()
+    non_champs_att = df[~df['team'].isin(champions)].groupby('team', observed=True)['attendance'].mean()
+    return champs_att.mean() - non_champs_att.mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    ws_data = get_ws_data()
+    print(f"{'rows':>12} {'per render (ms)':>16} {'build (ms)':>11} {'lookup (us)':>12}")
+    for n_rows in args.sizes:
+        df = make_attendance_frame(n_rows)
+        MLBAttendance.add_ws_markers(df, ws_data.frame)
+        df = compact_frame(df)
+        old, _ = timed(per_render_premium, df, ws_data.champions, repeat=3)
+        team_summary = TeamSummary(df)
+        team_means = team_summary.table['attendance_mean'].dropna()
+        build, _ = timed(championship_stats, df, team_means, ws_data, repeat=3)
+        # Served from the module's cache, as the dashboard does between versions
+        MLBAttendance.df, MLBAttendance.team_summary = df, team_summary
+        MLBAttendance.dataset_version += 1
+        MLBAttendance.get_championship_stats()
+        lookup, _ = timed(MLBAttendance.get_championship_stats, repeat=100)
+        print(f"{n_rows:>12,} {old * 1000:16.2f} {build * 1000:11.2f} {lookup * 1e6:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: server round-trips vs client-side filtering for slider, metric
+and chart-type changes.
+
+  - server: the POST /_dash-update-component a control change costs today
+    (Flask test client; cold = empty figure cache, warm = cached figure),
+    with its response size
+  - client: the clientside function in assets/clientside_filtering.js
+    that redraws the figure from the store (timed under node, no request),
+    plus the one-off store payload sent on a season or team change
+
+Needs node on PATH for the client timings.
+
+Run from the repository root:
+    python -m benchmarks.bench_clientside
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import time
+
+os.environ.setdefault('MLB_UPDATES_DIR', '')
+os.environ['MLB_CLIENTSIDE_FILTERING'] = '0'
+
+import numpy as np
+
+import MLBAttendance
+from benchmarks.bench_tab_render import request_body
+from benchmarks.synthetic import REPO_ROOT
+from client_data import season_ranking, team_series
+from payloads import shared_templates
+
+NODE_TIMER = """
+const fs = require('fs');
+globalThis.window = globalThis;
+eval(fs.readFileSync(process.argv[1], 'utf8'));
+const [name, args, iterations] = JSON.parse(fs.readFileSync(0, 'utf8'));
+const func = window.dash_clientside.filtering[name];
+const start = process.hrtime.bigint();
+for (let i = 0; i < iterations; i++) func(...args);
+console.log(Number(process.hrtime.bigint() - start) / 1e6 / iterations);
+"""
+
+
+def client_ms(name, args, iterations=1000):
+    """Mean time of one clientside redraw under node, in ms"""
+    script = os.path.join(REPO_ROOT, 'assets', 'clientside_filtering.js')
+    out = subprocess.run(['node', '-e', NODE_TIMER, script], input=json.dumps([name, args, iterations]),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout)
+
+
+def server_ms(body, iterations, cold):
+    client = MLBAttendance.server.test_client()
+    samples = []
+    for _ in range(iterations):
+        if cold:
+            MLBAttendance.figure_cache.clear()
+        start = time.perf_counter()
+        response = client.post('/_dash-update-component', json=body)
+        samples.append(time.perf_counter() - start)
+    return float(np.percentile(samples, 50) * 1000), len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20, help="requests per interaction and mode")
+    args = parser.parse_args()
+    if shutil.which('node') is None:
+        parser.error("node is needed to time the clientside functions")
+
+    m = MLBAttendance
+    season, teams = int(m.seasons[-1]), m.teams[:3]
+    template = shared_templates()['plotly_white']
+    ranking = season_ranking(season, m.data_index.season(season), m.team_color_map)
+    series = team_series([(team, m.data_index.team(team)) for team in teams], m.seasons, m.team_color_map,
+                         m.METRIC_LABELS)
+    interactions = [
+        ('top-teams-slider', request_body(m.app, 'top-teams-graph.figure', [season, 20]),
+         'topTeams', [ranking, 20, template]),
+        ('metric-dropdown', request_body(m.app, 'team-analysis-graph.figure', [teams, 'Attend/G', 'line', None, 1200]),
+         'teamAnalysis', [series, 'Attend/G', 'line', template]),
+        ('chart-type', request_body(m.app, 'team-analysis-graph.figure', [teams, 'attendance', 'bar', None, 1200]),
+         'teamAnalysis', [series, 'attendance', 'bar', template]),
+    ]
+    print(f"store payloads: season ranking {len(json.dumps(ranking)):,} B, 3-team series {len(json.dumps(series)):,} B, "
+          f"template {len(json.dumps(template)):,} B (sent once per page)")
+    print(f"{'control':<18} {'server cold ms':>15} {'server warm ms':>15} {'response B':>11} "
+          f"{'client ms':>10}")
+    for control, body, name, js_args in interactions:
+        cold, size = server_ms(body, args.iterations, cold=True)
+        warm, _ = server_ms(body, args.iterations, cold=False)
+        print(f"{control:<18} {cold:15.2f} {warm:15.2f} {size:11,} {client_ms(name, js_args):10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: interactive callback latency during an export storm.
+
+An interactive figure callback (top-teams graph, figure cache cleared before
+every request) is timed through the Flask test client while --clients
+threads export views back to back:
+  - idle:   no exports running
+  - inline: each export generated on the requesting thread, in the serving
+            process (what a synchronous export endpoint would do)
+  - pool:   each export submitted to exports.ExportService and polled
+            until done; the work runs on MLB_EXPORT_WORKERS processes
+
+Exports are PNGs when kaleido is installed, otherwise CSVs of the payroll
+correlation view (every row of the dataset). Inputs vary per export so the
+result cache never answers them.
+
+Run from the repository root:
+    python -m benchmarks.bench_exports
+    python -m benchmarks.bench_exports --clients 8 --requests 100
+"""
+import argparse
+import itertools
+import os
+import threading
+import time
+
+os.environ.setdefault('MLB_UPDATES_DIR', '')
+os.environ['MLB_STATIC_BUNDLE_DIR'] = ''
+
+import numpy as np
+
+import MLBAttendance
+import exports
+from benchmarks.bench_tab_render import request_body
+
+VIEW = 'payroll-correlation-graph.figure'
+
+
+def storm(mode, export_format, clients, stop, done):
+    """Start clients threads exporting until stop is set; done counts finished exports"""
+    counter = itertools.count()
+    service = MLBAttendance.export_service
+    client = MLBAttendance.server.test_client()
+
+    def run():
+        while not stop.is_set():
+            inputs = [f'export-{next(counter)}']
+            if mode == 'inline':
+                options = (exports.IMAGE_WIDTH, exports.IMAGE_HEIGHT, 1)
+                exports._run_job(None, None, VIEW, inputs, tuple(inputs), export_format, options, None)
+            else:
+                try:
+                    job = service.submit(VIEW, inputs, export_format)
+                except exports.ExportError:
+                    time.sleep(0.05)  # queue full
+                    continue
+                while service.job(job['id'])['status'] not in ('done', 'error'):
+                    time.sleep(0.01)
+                client.get(f"/api/export/{job['id']}")
+            done.append(1)
+
+    threads = [threading.Thread(target=run, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def interactive_ms(requests):
+    """p50 and p95 of an uncached top-teams figure request"""
+    m = MLBAttendance
+    client = m.server.test_client()
+    client.get('/')  # Dash registers the callbacks on the first request
+    body = request_body(m.app, 'top-teams-graph.figure', [int(m.seasons[-1]), 10])
+    samples = []
+    for _ in range(requests):
+        m.figure_cache.clear()
+        start = time.perf_counter()
+        client.post('/_dash-update-component', json=body)
+        samples.append(time.perf_counter() - start)
+    return np.percentile(samples, 50) * 1000, np.percentile(samples, 95) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=4, help="threads exporting concurrently")
+    parser.add_argument('--requests', type=int, default=50, help="timed interactive requests per mode")
+    args = parser.parse_args()
+
+    export_format = 'png' if exports.kaleido is not None else 'csv'
+    print(f"{len(MLBAttendance.df):,} rows, {args.clients} exporting clients, {export_format} exports, "
+          f"{MLBAttendance.export_service.workers} export workers")
+    print(f"{'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'exports/s':>10}")
+    for mode in ('idle', 'inline', 'pool'):
+        stop, done = threading.Event(), []
+        threads = storm(mode, export_format, args.clients, stop, done) if mode != 'idle' else []
+        time.sleep(0.5 if threads else 0)  # let the storm get going
+        start, count = time.perf_counter(), len(done)
+        p50, p95 = interactive_ms(args.requests)
+        rate = (len(done) - count) / (time.perf_counter() - start)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        print(f"{mode:<8} {p50:8.2f} {p95:8.2f} {rate:10.1f}")
+    MLBAttendance.export_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: streaming game-log ingestion throughput and peak memory.
+
+Writes --files synthetic game-log CSVs totalling each requested row count,
+then runs ingest.ingest_game_logs in a fresh process and reports rows/s and
+the process's peak RSS. Peak RSS should stay flat as the input grows; it is
+governed by --chunk-rows.
+
+Run from the repository root:
+    python -m benchmarks.bench_ingest
+    python -m benchmarks.bench_ingest --sizes 1M,10M --files 8 --chunk-rows 500K
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import REPO_ROOT, make_game_log_frame, parse_sizes
+
+# Peak RSS comes from VmHWM: ru_maxrss survives exec and would report the
+# benchmark parent's high-water mark instead of the ingest process's own
+PEAK_RSS = """
+def peak_rss_mb():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM:')) / 1024
+"""
+
+RUNNER = PEAK_RSS + """
+import json, sys, time
+from ingest import game_log_files, ingest_game_logs
+files = game_log_files(sys.argv[1])
+start = time.perf_counter()
+table = ingest_game_logs(files, chunk_rows=int(sys.argv[2]))
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'team_seasons': len(table),
+                  'peak_rss_mb': peak_rss_mb()}))
+"""
+
+BASELINE = PEAK_RSS + """
+import json
+import pandas
+print(json.dumps({'peak_rss_mb': peak_rss_mb()}))
+"""
+
+
+def run(code, *args):
+    out = subprocess.run([sys.executable, '-c', code, *args], env=dict(os.environ, PYTHONPATH=REPO_ROOT),
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def write_logs(directory, n_rows, n_files, block=2_000_000):
+    """Write n_rows of synthetic game logs split across n_files CSVs"""
+    per_file = np.diff(np.linspace(0, n_rows, n_files + 1).astype(np.int64))
+    for i, rows in enumerate(per_file):
+        path = os.path.join(directory, f"games-{i:03d}.csv")
+        written = 0
+        while written < rows:
+            n = min(block, rows - written)
+            make_game_log_frame(n, seed=i * 1000 + written).to_csv(path, mode='a', header=written == 0, index=False)
+            written += n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[1_000_000, 10_000_000, 30_000_000])
+    parser.add_argument('--files', type=int, default=8)
+    parser.add_argument('--chunk-rows', type=lambda s: parse_sizes(s)[0], default=1_000_000)
+    args = parser.parse_args()
+
+    baseline = run(BASELINE)['peak_rss_mb']
+    print(f"chunk rows {args.chunk_rows:,}; python+pandas baseline RSS {baseline:.0f} MiB")
+    print(f"{'rows':>12} {'CSV MB':>8} {'seconds':>9} {'rows/s':>12} {'team-seasons':>13} {'peak RSS MiB':>13}")
+    for n_rows in args.sizes:
+        scratch = tempfile.mkdtemp(prefix='mlb-ingest-')
+        try:
+            write_logs(scratch, n_rows, args.files)
+            csv_mb = sum(os.path.getsize(os.path.join(scratch, f)) for f in os.listdir(scratch)) / 1e6
+            result = run(RUNNER, scratch, str(args.chunk_rows))
+            print(f"{n_rows:>12,} {csv_mb:8.0f} {result['seconds']:9.2f} {n_rows / result['seconds']:12,.0f} "
+                  f"{result['team_seasons']:>13,} {result['peak_rss_mb']:13.0f}")
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: figure payload size and serialization time, before and after the
+payloads.py response pipeline.
+
+For every figure callback (the cases of bench_callbacks):
+  - serialize ms:  turning the built go.Figure into the cached JSON on a
+                   miss (before: pio.to_json, template embedded; after:
+                   payloads.figure_json, template by name)
+  - warm ms:       POST /_dash-update-component answered from the figure
+                   cache, through the Flask test client (before: Dash decodes
+                   and re-encodes the cached JSON; after: passthrough plus
+                   compression)
+  - wire B:        the response body as sent to a client accepting gzip/br
+
+"before" is the pipeline with MLB_STRIP_TEMPLATES,
+MLB_CACHED_FIGURE_PASSTHROUGH and MLB_COMPRESS_RESPONSES all off.
+
+Run from the repository root:
+    python -m benchmarks.bench_payloads
+"""
+import argparse
+import importlib.util
+import os
+import time
+
+os.environ.setdefault('MLB_UPDATES_DIR', '')
+os.environ['MLB_STATIC_BUNDLE_DIR'] = ''
+os.environ['MLB_CLIENTSIDE_FILTERING'] = '0'
+
+import numpy as np
+import plotly.io as pio
+
+import MLBAttendance
+import payloads
+from benchmarks.bench_callbacks import callback_cases
+from benchmarks.bench_tab_render import request_body
+
+PIPELINES = {
+    'before': {'STRIP_TEMPLATES': False, 'CACHED_FIGURE_PASSTHROUGH': False, 'COMPRESS_RESPONSES': False},
+    'after': {'STRIP_TEMPLATES': True, 'CACHED_FIGURE_PASSTHROUGH': True, 'COMPRESS_RESPONSES': True},
+}
+
+SERIALIZERS = {
+    'before': lambda fig: pio.to_json(fig, validate=False, engine=payloads.JSON_ENGINE),
+    'after': payloads.figure_json,
+}
+
+
+def figure_builder(output, func, values):
+    """(memoized function, args) building output's go.Figure for the callback inputs"""
+    m = MLBAttendance
+    if output == 'team-analysis-graph.figure':
+        teams, metric, chart_type, _, viewport_width = values
+        return m.build_team_analysis_figure, (teams, metric, chart_type, None, m.target_points(viewport_width))
+    return func, tuple(values)
+
+
+def p50_ms(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return float(np.percentile(samples, 50) * 1000)
+
+
+def measure(cases, serialize_figure, iterations):
+    """{output: (serialize ms, warm ms, wire bytes)} under the current payloads settings"""
+    client = MLBAttendance.server.test_client()
+    headers = {'Accept-Encoding': 'gzip, br'}
+    MLBAttendance.figure_cache.clear()
+    results = {}
+    for output, func, values in cases:
+        builder, args = figure_builder(output, func, values)
+        fig = builder.uncached(*args)
+        serialize = p50_ms(lambda: serialize_figure(fig), iterations)
+        body = request_body(MLBAttendance.app, output, values)
+        client.post('/_dash-update-component', json=body, headers=headers)  # fills the cache
+        response = client.post('/_dash-update-component', json=body, headers=headers)
+        warm = p50_ms(lambda: client.post('/_dash-update-component', json=body, headers=headers), iterations)
+        results[output] = (serialize, warm, len(response.data))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=50, help="timed runs per callback and pipeline")
+    args = parser.parse_args()
+
+    cases = [case for case in callback_cases() if case[0].endswith('.figure')]
+    results = {}
+    for pipeline, settings in PIPELINES.items():
+        for name, value in settings.items():
+            setattr(payloads, name, value)
+        results[pipeline] = measure(cases, SERIALIZERS[pipeline], args.iterations)
+
+    engine = payloads.JSON_ENGINE
+    if engine == 'auto':
+        engine = 'orjson' if importlib.util.find_spec('orjson') else 'json'
+    encoding = 'br' if payloads.brotli is not None else 'gzip'
+    print(f"JSON engine: {engine}, compression: {encoding} level {payloads.COMPRESS_LEVEL}")
+    print(f"{'output':<38} {'serialize ms':>16} {'warm ms':>16} {'wire B':>18}")
+    print(f"{'':<38} {'before':>8}{'after':>8} {'before':>8}{'after':>8} {'before':>9}{'after':>9}")
+    totals = np.zeros(2)
+    for output, _, _ in cases:
+        (s0, w0, b0), (s1, w1, b1) = results['before'][output], results['after'][output]
+        totals += (b0, b1)
+        print(f"{output:<38} {s0:8.2f}{s1:8.2f} {w0:8.2f}{w1:8.2f} {b0:9,}{b1:9,}")
+    print(f"{'total':<38} {'':>16} {'':>16} {int(totals[0]):9,}{int(totals[1]):9,}")
+    print(f"\nshared templates, sent once per page: {len(payloads.template_script()):,} B")
+
+
+if __name__ == "__main__":
+    main()
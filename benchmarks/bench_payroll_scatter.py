@@ -0,0 +1,66 @@
+"""
+Benchmark: payroll correlation scatter construction.
+
+Compares the original per-season loop (one boolean scan and one customdata
+array per season) with MLBAttendance.payroll_scatter_traces in 'grouped'
+(one groupby pass, one trace per season) and 'single' (one Scattergl trace)
+modes. Reports server build time (figure + JSON serialization) and figure
+JSON size.
+
+Run from the repository root:
+    python -m benchmarks.bench_payroll_scatter
+    python -m benchmarks.bench_payroll_scatter --sizes 780,100K
+"""
+import argparse
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import MLBAttendance
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+
+
+def legacy_traces(filtered_df):
+    """The per-season loop the callback used before"""
+    fig = go.Figure()
+    for season in sorted(filtered_df['Season'].unique()):
+        season_data = filtered_df[filtered_df['Season'] == season]
+        fig.add_trace(go.Scatter(
+            x=season_data['Est. Payroll'],
+            y=season_data['attendance'],
+            mode='markers',
+            name=str(int(season)),
+            text=season_data['team'],
+            hovertemplate='<b>%{text}</b> (%{customdata})<br>Season: %{customdata}<br>Payroll: $%{x:,.0f}<br>Attendance: %{y:,.0f}<extra></extra>',
+            customdata=np.full(len(season_data), int(season)),
+            marker=dict(size=12, opacity=0.8, line=dict(width=1, color='DarkSlateGrey'))
+        ))
+    return fig
+
+
+def build(mode, filtered_df):
+    if mode == 'legacy':
+        fig = legacy_traces(filtered_df)
+    else:
+        fig = go.Figure(data=MLBAttendance.payroll_scatter_traces(filtered_df, mode))
+    return pio.to_json(fig, validate=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'mode':>8} {'traces':>7} {'build (ms)':>11} {'JSON KB':>10}")
+    for n_rows in args.sizes:
+        df = MLBAttendance.df if n_rows == len(MLBAttendance.df) else make_attendance_frame(n_rows)
+        filtered_df = df.dropna(subset=['Est. Payroll', 'attendance'])
+        for mode in ('legacy', 'grouped', 'single'):
+            elapsed, payload = timed(build, mode, filtered_df, repeat=3)
+            traces = len(pio.from_json(payload, skip_invalid=True).data)
+            print(f"{n_rows:>10,} {mode:>8} {traces:>7} {elapsed * 1000:11.1f} {len(payload) / 1024:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
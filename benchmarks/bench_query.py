@@ -0,0 +1,94 @@
+"""
+Benchmark: query API latency on large synthetic datasets.
+
+Runs a set of ad-hoc queries (multi-season group-bys, team filters, the
+championship split behind the Key Findings) through query.run_query on every
+available engine (DuckDB if installed, pandas always), each with and without
+the cell rollup in front (the team x season query asks for a median, so it
+always scans):
+  - cold:   the query is executed (empty result cache)
+  - cached: the same query answered from the result cache
+
+Run from the repository root:
+    python -m benchmarks.bench_query
+    python -m benchmarks.bench_query --sizes 1M,10M,50M
+"""
+import argparse
+import time
+
+import numpy as np
+
+import MLBAttendance
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+from figure_cache import FigureCache
+from query import QueryEngine, duckdb, run_query
+from schema import compact_frame
+from ws_data import get_ws_data
+
+QUERIES = {
+    'season totals 2010-2019': {
+        'filters': [{'column': 'Season', 'op': 'between', 'value': [2010, 2019]}],
+        'group_by': ['Season'],
+        'aggregates': [{'column': 'attendance', 'func': 'sum'}, {'column': 'Attend/G', 'func': 'mean'}],
+    },
+    'team x season, 3 teams': {
+        'filters': [{'column': 'team', 'op': 'in', 'value': ['Boston Red Sox', 'New York Yankees', 'Chicago Cubs']}],
+        'group_by': ['team', 'Season'],
+        'aggregates': [{'column': 'attendance', 'func': 'mean'}, {'column': 'Est. Payroll', 'func': 'median'}],
+    },
+    'champions vs rest': {
+        'group_by': ['ws_champion'],
+        'aggregates': [{'column': 'attendance', 'func': 'mean'}, {'column': 'efficiency', 'func': 'std'},
+                       {'func': 'count'}],
+    },
+    'top 5 teams since 2015': {
+        'filters': [{'column': 'Season', 'op': '>=', 'value': 2015}],
+        'group_by': ['team'],
+        'aggregates': [{'column': 'attendance', 'func': 'sum', 'as': 'total'}],
+        'order_by': [{'column': 'total', 'desc': True}],
+        'limit': 5,
+    },
+}
+
+
+def frame(n_rows):
+    df = make_attendance_frame(n_rows)
+    MLBAttendance.add_ws_markers(df, get_ws_data().frame)
+    return compact_frame(df)
+
+
+def p50_ms(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return float(np.percentile(samples, 50) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[1_000_000, 10_000_000])
+    parser.add_argument('--iterations', type=int, default=10, help="timed runs per query")
+    args = parser.parse_args()
+
+    engines = ['pandas'] + (['duckdb'] if duckdb is not None else [])
+    if duckdb is None:
+        print("duckdb is not installed; timing the pandas engine only")
+    print(f"{'rows':>12} {'engine':>14} {'query':<26} {'cold ms':>9} {'cached ms':>10}")
+    for n_rows in args.sizes:
+        df = frame(n_rows)
+        for name, rollup in ((name, rollup) for name in engines for rollup in (False, True)):
+            label = name + ('+rollup' if rollup else '')
+            setup, engine = timed(QueryEngine, df, name, rollup)
+            for query_label, query in QUERIES.items():
+                cold = p50_ms(lambda: run_query(engine, query, FigureCache(), 0), args.iterations)
+                cache = FigureCache()
+                run_query(engine, query, cache, 0)
+                cached = p50_ms(lambda: run_query(engine, query, cache, 0), args.iterations)
+                print(f"{n_rows:>12,} {label:>14} {query_label:<26} {cold:9.1f} {cached:10.3f}")
+            print(f"{'':>12} {label:>14} {'(engine setup)':<26} {setup * 1000:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
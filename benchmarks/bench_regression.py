@@ -0,0 +1,78 @@
+"""
+Benchmark: load-time batched OLS fits vs per-request fitting.
+
+Per team (Attendance vs Payroll graph):
+  - legacy: px.scatter(..., trendline='ols'), i.e. a statsmodels fit per request
+  - cached: px.scatter without a trendline plus a lookup in regression.Regressions
+League-wide (Payroll Correlation graph):
+  - legacy: scipy.stats.linregress over the whole table per request
+  - cached: Regressions(df) built once at load, then global_fit()
+
+Run from the repository root:
+    python -m benchmarks.bench_regression
+    python -m benchmarks.bench_regression --sizes 780,1M,10M
+"""
+import argparse
+import time
+
+import plotly.express as px
+from scipy import stats
+
+import MLBAttendance
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+from regression import Regressions
+
+
+def legacy_attendance_payroll(team_data, team):
+    """Figure construction as it was before the fits were cached"""
+    return px.scatter(
+        team_data, x='Est. Payroll', y='attendance', color='Season', size='Attend/G',
+        hover_name='Season', trendline='ols',
+        title=f"{team} - Attendance vs Payroll Relationship", template='plotly_white'
+    )
+
+
+def bench_team_graphs():
+    teams = MLBAttendance.teams
+    frames = {team: MLBAttendance.data_index.team(team).dropna(subset=['Est. Payroll', 'attendance', 'Attend/G'])
+              for team in teams}
+
+    start = time.perf_counter()
+    legacy_attendance_payroll(frames[teams[0]], teams[0])
+    first_hit = time.perf_counter() - start
+
+    legacy, _ = timed(lambda: [legacy_attendance_payroll(frames[t], t) for t in teams], repeat=3)
+    build, _ = timed(Regressions, MLBAttendance.df, repeat=3)
+    cached, _ = timed(lambda: [MLBAttendance.update_attendance_payroll_graph.uncached([t]) for t in teams],
+                      repeat=3)
+
+    print(f"Attendance vs Payroll, {len(teams)} teams")
+    print(f"  legacy first request (statsmodels import + fit): {first_hit * 1000:9.1f} ms")
+    print(f"  legacy per request:                             {legacy / len(teams) * 1000:9.2f} ms")
+    print(f"  cached per request:                             {cached / len(teams) * 1000:9.2f} ms")
+    print(f"  one-time batched fit of all teams:              {build * 1000:9.2f} ms")
+
+
+def bench_global_fit(sizes):
+    print("\nLeague-wide fit")
+    print(f"{'rows':>12} {'linregress/request (ms)':>24} {'batched build (ms)':>19} {'lookup (us)':>12}")
+    for n_rows in sizes:
+        df = make_attendance_frame(n_rows)
+        complete = df.dropna(subset=['Est. Payroll', 'attendance'])
+        legacy, old = timed(lambda: stats.linregress(complete['Est. Payroll'], complete['attendance']), repeat=3)
+        build, regressions = timed(Regressions, df)
+        lookup, new = timed(regressions.global_fit, repeat=1000)
+        assert abs(old.slope - new['slope']) <= 1e-6 * abs(old.slope)
+        print(f"{n_rows:>12,} {legacy * 1000:24.2f} {build * 1000:19.2f} {lookup * 1e6:12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 100_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+    bench_team_graphs()
+    bench_global_fit(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
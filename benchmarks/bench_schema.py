@@ -0,0 +1,88 @@
+"""
+Benchmark: memory footprint and filter latency of the prepared frame's schema.
+
+Three layouts of the same synthetic rows:
+  - object:  team and the World Series markers as Python object strings
+             (emoji markers), Season int64, float64 metrics
+  - str:     pandas' default string dtype for the same columns
+  - compact: schema.compact_frame (categorical team, int16 Season, bool
+             flags, float32 where lossless)
+
+Attendance figures are rounded to whole numbers, as in the real data, so the
+float32 columns are exact.
+
+Run from the repository root:
+    python -m benchmarks.bench_schema
+    python -m benchmarks.bench_schema --sizes 1M,10M --lookups 10
+"""
+import argparse
+import gc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+from data_index import DataIndex
+from schema import compact_frame
+from ws_data import get_ws_data
+
+
+def prepared_frame(n_rows):
+    """Synthetic prepared frame with emoji World Series markers"""
+    df = make_attendance_frame(n_rows)
+    df['attendance'] = df['attendance'].round()
+    df['Attend/G'] = df['Attend/G'].round()
+    ws = get_ws_data().frame
+    row_keys = pd.MultiIndex.from_arrays([df['team'], df['Season']])
+    for col, ws_col, marker in (('ws_champion', 'Winner', '🏆'), ('ws_finalist', 'Loser', '🥈')):
+        df[col] = np.where(row_keys.isin(pd.MultiIndex.from_arrays([ws[ws_col], ws['Season']])), marker, '')
+    return df
+
+
+def layouts(df):
+    """Yield (name, frame) for each layout, one at a time"""
+    strings = ['team', 'ws_champion', 'ws_finalist']
+    yield 'object', df.astype({col: object for col in strings})
+    yield 'str', df.astype({col: 'str' for col in strings})
+    yield 'compact', compact_frame(df.astype({col: 'str' for col in strings}))
+
+
+def bench(df, teams, seasons):
+    team_filter, _ = timed(lambda: [df[df['team'] == team] for team in teams], repeat=3)
+    season_filter, _ = timed(lambda: [df[df['Season'] == season] for season in seasons], repeat=3)
+    index_build, index = timed(DataIndex, df)
+    lookup, _ = timed(lambda: [index.team(team) for team in teams], repeat=3)
+    return {
+        'mb': df.memory_usage(deep=True).sum() / 2 ** 20,
+        'team_ms': team_filter / len(teams) * 1000,
+        'season_ms': season_filter / len(seasons) * 1000,
+        'index_s': index_build,
+        'lookup_us': lookup / len(teams) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[1_000_000, 10_000_000])
+    parser.add_argument('--lookups', type=int, default=5, help="teams and seasons filtered per size")
+    args = parser.parse_args()
+
+    for n_rows in args.sizes:
+        base = prepared_frame(n_rows)
+        teams = list(base['team'].drop_duplicates().sample(args.lookups, random_state=0))
+        seasons = list(base['Season'].drop_duplicates().sample(args.lookups, random_state=0))
+        print(f"\n{n_rows:,} rows")
+        print(f"{'layout':>8} {'memory MiB':>11} {'B/row':>6} {'team filter ms':>15} {'season filter ms':>17} "
+              f"{'DataIndex build s':>18} {'index lookup us':>16}")
+        for name, df in layouts(base):
+            r = bench(df, teams, seasons)
+            print(f"{name:>8} {r['mb']:11.0f} {r['mb'] * 2 ** 20 / n_rows:6.0f} {r['team_ms']:15.2f} "
+                  f"{r['season_ms']:17.2f} {r['index_s']:18.2f} {r['lookup_us']:16.1f}")
+            del df
+            gc.collect()
+        del base
+        gc.collect()
+
+
+if __name__ == "__main__":
+    main()
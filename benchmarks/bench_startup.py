@@ -0,0 +1,58 @@
+"""
+Benchmark: cold vs warm data loading with the prepared-data cache.
+
+For each size a synthetic attendance CSV is written to a scratch directory
+(next to a copy of the World Series CSV) and MLBAttendance.load_and_prepare_data
+is timed:
+  - no cache: prepare_data() only (the pre-cache startup path)
+  - cold:     first start, hashes the sources, prepares and writes the cache
+  - warm:     later starts, memory-maps the cached Feather file
+
+Run from the repository root:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --sizes 780,10M
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import MLBAttendance
+import prepared_cache
+from benchmarks.synthetic import WS_CSV, make_attendance_frame, parse_sizes, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 10_000_000])
+    args = parser.parse_args()
+
+    if prepared_cache.feather is None:
+        print("pyarrow is not installed; the prepared-data cache is disabled")
+        return
+
+    repo_dir = os.getcwd()
+    print(f"{'rows':>12} {'csv MB':>8} {'no cache (s)':>13} {'cold (s)':>10} {'warm (s)':>10} {'speedup':>9}")
+    for n_rows in args.sizes:
+        scratch = tempfile.mkdtemp(prefix='mlb-startup-')
+        try:
+            os.chdir(scratch)
+            prepared_cache.CACHE_DIR = os.path.join(scratch, 'cache')
+            make_attendance_frame(n_rows, raw=True).to_csv('MLB_attendance_data_2000-2025.csv', index=False)
+            shutil.copy(WS_CSV, MLBAttendance.WS_DATA_FILE)
+            csv_mb = os.path.getsize('MLB_attendance_data_2000-2025.csv') / 1e6
+
+            no_cache, _ = timed(MLBAttendance.prepare_data, 'MLB_attendance_data_2000-2025.csv')
+            cold, expected = timed(MLBAttendance.load_and_prepare_data)
+            warm, result = timed(MLBAttendance.load_and_prepare_data, repeat=3)
+            assert len(result) == len(expected)
+            assert result['attendance'].equals(expected['attendance'])
+
+            print(f"{n_rows:>12,} {csv_mb:8.1f} {no_cache:13.3f} {cold:10.3f} {warm:10.4f} {no_cache / warm:8.0f}x")
+        finally:
+            os.chdir(repo_dir)
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: pre-rendered figure bundle vs live callbacks.
+
+Builds the bundle of the real dataset with `python -m static_bundle build`
+(once per --workers value), then times one request per bundled output
+through the Flask test client:
+  - live cold:  the callback runs with an empty figure cache
+  - live warm:  the callback is answered from the figure cache
+  - static:     the gzipped body is returned from the bundle
+
+Run from the repository root:
+    python -m benchmarks.bench_static_bundle
+    python -m benchmarks.bench_static_bundle --workers 1,4 --iterations 50
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('MLB_UPDATES_DIR', '')
+os.environ['MLB_STATIC_BUNDLE_DIR'] = ''
+
+import numpy as np
+
+import MLBAttendance
+import static_bundle
+from benchmarks.bench_tab_render import request_body
+from benchmarks.synthetic import REPO_ROOT, parse_sizes
+
+
+def build(directory, workers):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'static_bundle', 'build', directory, '--workers', str(workers)],
+                   cwd=REPO_ROOT, env=dict(os.environ, PYTHONPATH=REPO_ROOT), check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def request_cases():
+    """One /_dash-update-component body per bundled output (the first job of each)"""
+    cases = {}
+    for output, key, name, args in static_bundle.bundle_jobs(MLBAttendance):
+        if output in cases:
+            continue
+        spec = MLBAttendance.app.callback_map[output]
+        values = [dep['id'] if dep['property'] == 'id' else None for dep in spec['inputs'] + spec.get('state', [])]
+        by_dep = dict(zip(static_bundle.BUNDLED_OUTPUTS[output], json.loads(key)[1:]))
+        for i, dep in enumerate(spec['inputs']):
+            values[i] = by_dep.get(f"{dep['id']}.{dep['property']}", values[i])
+        cases[output] = request_body(MLBAttendance.app, output, values)
+    return cases
+
+
+def p50_ms(func, iterations, before=None):
+    samples = []
+    for _ in range(iterations):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return float(np.percentile(samples, 50) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=parse_sizes, default=[os.cpu_count()], help="render processes per build")
+    parser.add_argument('--iterations', type=int, default=20, help="requests per output and mode")
+    args = parser.parse_args()
+
+    directory = os.path.join(tempfile.mkdtemp(prefix='mlb-bundle-'), 'bundle')
+    try:
+        print(f"{'workers':>8} {'build (s)':>10}")
+        for workers in args.workers:
+            print(f"{workers:>8} {build(directory, workers):10.1f}")
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        client = MLBAttendance.server.test_client()
+        post = lambda body, **kw: client.post('/_dash-update-component', json=body, **kw)
+        cache = MLBAttendance.figure_cache
+        results = {}
+        for output, body in request_cases().items():
+            results[output] = {
+                'live cold': p50_ms(lambda: post(body), args.iterations, before=cache.clear),
+                'live warm': p50_ms(lambda: post(body), args.iterations),
+            }
+        bundle = MLBAttendance.use_static_bundle(directory)
+        for output, body in request_cases().items():
+            assert bundle.lookup(body) is not None, output
+            results[output]['static'] = p50_ms(lambda: post(body, headers={'Accept-Encoding': 'gzip'}),
+                                               args.iterations)
+    finally:
+        shutil.rmtree(os.path.dirname(directory), ignore_errors=True)
+
+    print(f"\nbundle: {len(bundle)} figures, {size / 2 ** 20:.1f} MiB gzipped")
+    print(f"{'output':<38} {'live cold ms':>13} {'live warm ms':>13} {'static ms':>10}")
+    for output, r in results.items():
+        print(f"{output:<38} {r['live cold']:13.2f} {r['live warm']:13.2f} {r['static']:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
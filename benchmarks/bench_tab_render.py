@@ -0,0 +1,142 @@
+"""
+Benchmark: tab-open latency with serial vs concurrent sibling figure builds.
+
+Opening the Team Analysis or Championships tab needs two figures. Measured
+with a cold figure cache, through the Flask test client:
+  - serial:        one callback per graph (MLB_FIGURE_WORKERS=0); the two
+                   requests are sent concurrently, as the browser does
+  - pool=thread:   one multi-output callback building both on threads
+  - pool=process:  the same on spawned worker processes
+
+Each mode runs in its own interpreter because the callbacks are registered
+at import time. The pool modes can only beat serial on a machine with at
+least two free cores.
+
+Run from the repository root:
+    python -m benchmarks.bench_tab_render
+    python -m benchmarks.bench_tab_render --scales 1,1000 --iterations 20
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import ATTENDANCE_CSV, REPO_ROOT, WS_CSV, make_attendance_frame, parse_sizes
+
+MODES = {
+    'serial': {'MLB_FIGURE_WORKERS': '0'},
+    'pool=thread': {'MLB_FIGURE_WORKERS': '2', 'MLB_FIGURE_POOL': 'thread'},
+    'pool=process': {'MLB_FIGURE_WORKERS': '2', 'MLB_FIGURE_POOL': 'process'},
+}
+
+
+def request_body(app, output, values):
+    """Body of the /_dash-update-component request for output (single or multi-output)"""
+    spec = app.callback_map[output]
+    n_inputs = len(spec['inputs'])
+    filled = [dict(dep, value=value) for dep, value in zip(spec['inputs'] + spec.get('state', []), values)]
+    outputs = [dict(zip(('id', 'property'), part.rsplit('.', 1))) for part in output.strip('.').split('...')]
+    return {
+        'output': output,
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': filled[:n_inputs],
+        'state': filled[n_inputs:],
+        'changedPropIds': [f"{filled[0]['id']}.{filled[0]['property']}"],
+    }
+
+
+def tab_requests(m):
+    """{tab: [request bodies sent when the tab opens]} for the callbacks registered in m"""
+    teams = m.teams[:3]
+    team_args = [teams, 'attendance', 'line', None, 1200]
+    champ_ids = ['championship-impact-graph', 'championships-by-team-graph']
+    if m.figure_pool.enabled:
+        return {
+            'team analysis': [request_body(m.app, '..team-analysis-graph.figure...attendance-payroll-graph.figure..',
+                                           team_args)],
+            'championships': [request_body(m.app, '..championship-impact-graph.figure...'
+                                                  'championships-by-team-graph.figure..', champ_ids)],
+        }
+    return {
+        'team analysis': [request_body(m.app, 'team-analysis-graph.figure', team_args),
+                          request_body(m.app, 'attendance-payroll-graph.figure', [teams])],
+        'championships': [request_body(m.app, f'{graph_id}.figure', [graph_id]) for graph_id in champ_ids],
+    }
+
+
+def child(iterations):
+    """Measure every tab in this interpreter and print the results as JSON"""
+    import numpy as np
+    import MLBAttendance as m
+
+    results = {}
+    for tab, bodies in tab_requests(m).items():
+        def post(body):
+            response = m.server.test_client().post('/_dash-update-component', json=body)
+            if response.status_code != 200:
+                raise RuntimeError(f"{tab}: HTTP {response.status_code}")
+
+        samples = []
+        for _ in range(iterations + 1):  # the first run starts the pool
+            m.figure_cache.clear()
+            threads = [threading.Thread(target=post, args=(body,)) for body in bodies]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            samples.append(time.perf_counter() - start)
+        results[tab] = {'p50_ms': float(np.percentile(samples[1:], 50) * 1000), 'requests': len(bodies)}
+    m.figure_pool.shutdown()
+    print(json.dumps(results))
+
+
+def run_mode(env, iterations, cwd):
+    out = subprocess.run([sys.executable, '-m', 'benchmarks.bench_tab_render', '--child',
+                          '--iterations', str(iterations)],
+                         cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=parse_sizes, default=[1, 100, 1000])
+    parser.add_argument('--iterations', type=int, default=10, help="tab opens per tab and mode")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.iterations)
+        return
+
+    print(f"{os.cpu_count()} CPU(s)")
+    for scale in args.scales:
+        scratch = tempfile.mkdtemp(prefix='mlb-tabs-')
+        try:
+            data_file = os.path.join(scratch, 'MLB_attendance_data_2000-2025.csv')
+            if scale == 1:
+                shutil.copy(ATTENDANCE_CSV, data_file)
+            else:
+                make_attendance_frame(780 * scale, raw=True).to_csv(data_file, index=False)
+            shutil.copy(WS_CSV, scratch)
+            base_env = dict(os.environ, PYTHONPATH=REPO_ROOT, MLB_UPDATES_DIR='', MLB_PREPARED_CACHE='0')
+            results = {mode: run_mode(dict(base_env, **env), args.iterations, scratch)
+                       for mode, env in MODES.items()}
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        print(f"\nscale {scale}x ({780 * scale:,} rows), cold figure cache")
+        print(f"{'tab':<15} {'mode':<14} {'requests':>8} {'p50 ms':>9} {'vs serial':>10}")
+        for tab in results['serial']:
+            serial = results['serial'][tab]['p50_ms']
+            for mode, result in results.items():
+                r = result[tab]
+                print(f"{tab:<15} {mode:<14} {r['requests']:>8} {r['p50_ms']:9.1f} {serial / r['p50_ms']:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: per-team scans vs the team summary table.
+
+  - per team: average attendance of every champion with one scan of the
+              frame per team, as update_championships_by_team_graph used to
+              (champ_df['Team'].apply(lambda team: df[df['team'] == team]...))
+  - build:    team_summary.TeamSummary, once at load time
+  - join:     TeamSummary.with_titles() for a new World Series file version
+              plus the champions' rows, as the graph reads them
+  - cached:   the same for an unchanged file (the join is reused)
+
+Run from the repository root:
+    python -m benchmarks.bench_team_summary
+    python -m benchmarks.bench_team_summary --sizes 780,1M,10M
+"""
+import argparse
+import dataclasses
+
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+from schema import compact_frame
+from team_summary import TeamSummary
+from ws_data import get_ws_data
+
+
+def per_team_apply(df, champions):
+    return [df[df['team'] == team]['attendance'].mean() for team in champions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    ws_data = get_ws_data()
+    print(f"{'rows':>12} {'per team (ms)':>14} {'build (ms)':>11} {'join (ms)':>10} {'cached (ms)':>12} {'speedup':>9}")
+    for n_rows in args.sizes:
+        df = compact_frame(make_attendance_frame(n_rows))
+        old, _ = timed(per_team_apply, df, ws_data.champions, repeat=3)
+        build, summary = timed(TeamSummary, df, repeat=3)
+
+        def join(version=[0]):
+            # A new file signature every call, so the cached join is never reused
+            version[0] += 1
+            summary.with_titles(dataclasses.replace(ws_data, signature=version[0])).loc[ws_data.champions]
+
+        new, _ = timed(join, repeat=3)
+        cached, _ = timed(lambda: summary.with_titles(ws_data).loc[ws_data.champions], repeat=3)
+        print(f"{n_rows:>12,} {old * 1000:14.2f} {build * 1000:11.2f} {new * 1000:10.2f} {cached * 1000:12.2f} "
+              f"{old / new:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: per-request year-over-year computation vs precomputed trend columns.
+
+  - per request: what update_yoy_change_graph used to do on every dropdown
+    change (one team's rows, sort by Season, three pct_change calls)
+  - lookup:      trends.Trends.team(), after the one-off build at load time
+
+Run from the repository root:
+    python -m benchmarks.bench_trends
+    python -m benchmarks.bench_trends --sizes 780,1M,10M
+"""
+import argparse
+
+from benchmarks.synthetic import make_attendance_frame, parse_sizes, timed
+from data_index import DataIndex
+from schema import compact_frame
+from trends import Trends
+
+
+def per_request_yoy(index, team):
+    team_data = index.team(team).sort_values('Season')
+    team_data['attendance_yoy'] = team_data['attendance'].astype('float64').pct_change(fill_method=None) * 100
+    team_data['payroll_yoy'] = team_data['Est. Payroll'].astype('float64').pct_change(fill_method=None) * 100
+    team_data['efficiency_yoy'] = team_data['efficiency'].astype('float64').pct_change(fill_method=None) * 100
+    return team_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=[780, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'build (s)':>10} {'MiB':>8} {'per request (ms)':>17} {'lookup (us)':>12} {'speedup':>9}")
+    for n_rows in args.sizes:
+        df = compact_frame(make_attendance_frame(n_rows))
+        index = DataIndex(df)
+        teams = list(index.by_team)
+        build, trends = timed(Trends, df)
+        old, _ = timed(lambda: [per_request_yoy(index, team) for team in teams], repeat=3)
+        new, _ = timed(lambda: [trends.team(team) for team in teams], repeat=3)
+        memory = sum(positions.nbytes + changes.memory_usage(deep=True).sum()
+                     for positions, changes in trends.by_team.values()) / 2 ** 20
+        print(f"{n_rows:>12,} {build:10.3f} {memory:8.1f} {old / len(teams) * 1000:17.3f} "
+              f"{new / len(teams) * 1e6:12.2f} {old / new:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
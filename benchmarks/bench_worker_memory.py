@@ -0,0 +1,100 @@
+"""
+Benchmark: per-worker memory with private vs shared-memory data.
+
+Starts --workers processes that each import MLBAttendance (the same thing a
+gunicorn worker does), render a few figures, and then report RSS, PSS and USS
+from /proc/self/smaps_rollup while all of them are alive:
+  - private: every worker loads the prepared frame itself (warm Feather cache)
+  - shared:  the frame is exported once to /dev/shm and every worker attaches
+
+PSS splits shared pages between the processes that map them, so the sum of
+PSS is the real memory cost of the worker pool. Linux only.
+
+Run from the repository root:
+    python -m benchmarks.bench_worker_memory
+    python -m benchmarks.bench_worker_memory --rows 1M --workers 8
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import REPO_ROOT, WS_CSV, make_attendance_frame, parse_sizes
+
+WORKER = """
+import json, sys
+import MLBAttendance as m
+m.update_team_analysis_graph(m.teams[:3], 'attendance', 'line')
+m.update_top_teams_graph(m.seasons[-1], 10)
+m.update_yoy_change_graph(m.teams[0])
+print('ready', flush=True)
+sys.stdin.readline()
+stats = {}
+with open('/proc/self/smaps_rollup') as fh:
+    for line in fh:
+        parts = line.split()
+        if parts[0] in ('Rss:', 'Pss:', 'Private_Clean:', 'Private_Dirty:'):
+            stats[parts[0][:-1]] = int(parts[1]) / 1024
+stats['Uss'] = stats.pop('Private_Clean') + stats.pop('Private_Dirty')
+print(json.dumps(stats), flush=True)
+"""
+
+
+def run_pool(n_workers, env, cwd):
+    """Start n_workers, wait until all are loaded, then collect their memory stats"""
+    procs = [subprocess.Popen([sys.executable, '-c', WORKER], cwd=cwd, env=env, text=True,
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+             for _ in range(n_workers)]
+    for proc in procs:
+        while proc.stdout.readline().strip() != 'ready':
+            if proc.poll() is not None:
+                raise RuntimeError("worker exited before loading the data")
+    for proc in procs:
+        proc.stdin.write('measure\n')
+        proc.stdin.flush()
+    results = [json.loads(proc.stdout.readline()) for proc in procs]
+    for proc in procs:
+        proc.wait()
+    return results
+
+
+def report(label, results):
+    n = len(results)
+    rss = sum(r['Rss'] for r in results) / n
+    pss = sum(r['Pss'] for r in results)
+    uss = sum(r['Uss'] for r in results) / n
+    print(f"{label:>8} {rss:14.0f} {pss / n:14.0f} {uss:14.0f} {pss:16.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=lambda s: parse_sizes(s)[0], default=10_000_000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='mlb-workers-')
+    shm_dir = tempfile.mkdtemp(prefix='mlb-shared-', dir='/dev/shm')
+    try:
+        make_attendance_frame(args.rows, raw=True).to_csv(
+            os.path.join(scratch, 'MLB_attendance_data_2000-2025.csv'), index=False)
+        shutil.copy(WS_CSV, os.path.join(scratch, os.path.basename(WS_CSV)))
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT, MLB_CACHE_DIR=os.path.join(scratch, 'cache'))
+
+        # Warm the prepared-data cache and export the shared frame
+        subprocess.run([sys.executable, '-m', 'shared_data', 'export', shm_dir], cwd=scratch,
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+
+        print(f"{args.rows:,} rows, {args.workers} workers (MiB)")
+        print(f"{'mode':>8} {'RSS/worker':>14} {'PSS/worker':>14} {'USS/worker':>14} {'PSS total':>16}")
+        report('private', run_pool(args.workers, dict(env, MLB_SHARED_DATA_DIR=''), scratch))
+        report('shared', run_pool(args.workers, dict(env, MLB_SHARED_DATA_DIR=shm_dir), scratch))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+        shutil.rmtree(shm_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
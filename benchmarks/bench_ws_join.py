@@ -0,0 +1,58 @@
+"""
+Benchmark: World Series marker join in load_and_prepare_data.
+
+Compares the keyed (team, Season) lookup in MLBAttendance.add_ws_markers with
+the previous row-wise df.apply implementation. The row-wise version is only
+timed up to --legacy-max rows because it is O(rows x WS rows).
+
+Run from the repository root:
+    python -m benchmarks.bench_ws_join
+    python -m benchmarks.bench_ws_join --sizes 780,100K,10M
+"""
+import argparse
+
+import MLBAttendance
+from benchmarks.synthetic import DEFAULT_SIZES, WS_CSV, make_attendance_frame, parse_sizes, timed
+from ws_data import parse_ws_file
+
+
+def legacy_ws_markers(df, ws_df):
+    """The original row-wise implementation, kept for comparison"""
+    df['ws_champion'] = df.apply(
+        lambda row: '🏆' if any((ws_df['Winner'] == row['team']) & (ws_df['Season'] == row['Season'])) else '',
+        axis=1
+    )
+    df['ws_finalist'] = df.apply(
+        lambda row: '🥈' if any((ws_df['Loser'] == row['team']) & (ws_df['Season'] == row['Season'])) else '',
+        axis=1
+    )
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=DEFAULT_SIZES)
+    parser.add_argument('--legacy-max', type=int, default=20_000,
+                        help="largest row count to time the row-wise version on")
+    args = parser.parse_args()
+
+    ws_df = parse_ws_file(WS_CSV)
+    print(f"{'rows':>12} {'keyed (s)':>12} {'rows/s':>14} {'row-wise (s)':>14} {'speedup':>10}")
+    for n_rows in args.sizes:
+        df = make_attendance_frame(n_rows)
+        keyed, result = timed(MLBAttendance.add_ws_markers, df.copy(), ws_df, repeat=3)
+
+        legacy = None
+        if n_rows <= args.legacy_max:
+            legacy, expected = timed(legacy_ws_markers, df.copy(), ws_df)
+            # The markers are bool flags now; the row-wise version wrote emoji strings
+            assert (result['ws_champion'] == (expected['ws_champion'] == '🏆')).all()
+            assert (result['ws_finalist'] == (expected['ws_finalist'] == '🥈')).all()
+
+        legacy_text = f"{legacy:14.3f}" if legacy is not None else f"{'skipped':>14}"
+        speedup_text = f"{legacy / keyed:9.0f}x" if legacy is not None else f"{'-':>10}"
+        print(f"{n_rows:>12,} {keyed:12.4f} {n_rows / keyed:14,.0f} {legacy_text} {speedup_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Synthetic dataset generator for the dashboard benchmarks.
+
+Builds frames with the same columns and team/season vocabulary as
+MLB_attendance_data_2000-2025.csv so the app code paths behave exactly as
+they do on the real data, just at a larger scale.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ATTENDANCE_CSV = os.path.join(REPO_ROOT, 'MLB_attendance_data_2000-2025.csv')
+WS_CSV = os.path.join(REPO_ROOT, 'MLB Wolrd Series Winners 2000-25.csv')
+
+# Row counts used when a benchmark is run without --sizes
+DEFAULT_SIZES = [780, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def parse_sizes(text):
+    """Parse a comma separated list of row counts such as '780,1e5,10M'"""
+    sizes = []
+    for part in text.split(','):
+        part = part.strip().upper()
+        if not part:
+            continue
+        scale = 1
+        if part.endswith('K'):
+            scale, part = 1_000, part[:-1]
+        elif part.endswith('M'):
+            scale, part = 1_000_000, part[:-1]
+        sizes.append(int(float(part) * scale))
+    return sizes
+
+
+def make_attendance_frame(n_rows, seed=0, raw=False):
+    """Return an n_rows frame shaped like the attendance CSV.
+
+    Rows are drawn from the real team-seasons with multiplicative noise on the
+    numeric columns. With raw=True the original (un-normalized) team names are
+    kept so the result can be written back out as a source CSV.
+    """
+    base = pd.read_csv(ATTENDANCE_CSV)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(base), size=n_rows)
+    noise = rng.normal(1.0, 0.05, size=n_rows)
+
+    df = pd.DataFrame({
+        'team': base['team'].to_numpy()[picks],
+        'attendance': base['attendance'].to_numpy()[picks] * noise,
+        'Attend/G': base['Attend/G'].to_numpy()[picks] * noise,
+        'Est. Payroll': base['Est. Payroll'].to_numpy()[picks] * rng.normal(1.0, 0.05, size=n_rows),
+        'Season': base['Season'].to_numpy()[picks],
+    })
+    if not raw:
+        import MLBAttendance
+        df['team'] = df['team'].replace(MLBAttendance.TEAM_NAME_MAP)
+        df['efficiency'] = df['attendance'] / df['Est. Payroll'] * 1000000
+    return df
+
+
+def make_game_log_frame(n_rows, seed=0):
+    """Return n_rows of per-game rows (team, Season, attendance, Est. Payroll).
+
+    Each game belongs to a real team-season; its attendance is that season's
+    Attend/G with noise and the payroll is the season payroll.
+    """
+    base = pd.read_csv(ATTENDANCE_CSV)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(base), size=n_rows)
+    return pd.DataFrame({
+        'team': base['team'].to_numpy()[picks],
+        'Season': base['Season'].to_numpy()[picks],
+        'attendance': np.round(base['Attend/G'].to_numpy()[picks] * rng.normal(1.0, 0.15, size=n_rows)),
+        'Est. Payroll': base['Est. Payroll'].to_numpy()[picks],
+    })
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Run func and return (best wall time in seconds, last result)"""
+    import time
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,141 @@
+"""
+Championship statistics behind the Championships tab's Key Findings.
+
+Everything is computed in one vectorized pass from the team-season
+attendance and the World Series results:
+  - the championship premium: average attendance of teams with a title vs
+    teams without one (each team weighted once, by its per-season mean)
+  - post-title bumps: the % change in attendance from a title season to
+    each of the BUMP_HORIZONS seasons after it, per title, with the mean,
+    median and a percentile bootstrap confidence interval of the mean
+  - the reigning champion's titles and latest attendance
+
+The dashboard computes them once per dataset and World Series version
+(MLBAttendance.get_championship_stats), so rendering the tab is a lookup.
+The bootstrap is seeded, so the same data always gives the same interval.
+"""
+import math
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+BOOTSTRAP_SAMPLES = int(os.environ.get('MLB_BOOTSTRAP_SAMPLES', 10000))
+BOOTSTRAP_SEED = 2000
+CONFIDENCE = 0.95
+
+# Seasons after a title over which the attendance bump is measured
+BUMP_HORIZONS = (1, 2)
+
+
+def bootstrap_ci(values, samples=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=BOOTSTRAP_SEED):
+    """(low, high) percentile bootstrap interval for the mean of values (NaN for fewer than 2)"""
+    values = np.asarray(values, dtype='float64')
+    if len(values) < 2:
+        return math.nan, math.nan
+    # All resamples at once: a samples x n matrix of draws, averaged along rows
+    draws = np.random.default_rng(seed).integers(0, len(values), size=(samples, len(values)))
+    means = values[draws].mean(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(means, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+@dataclass(frozen=True)
+class PostTitleBump:
+    """Attendance % change from title seasons to horizon seasons later"""
+    horizon: int
+    changes: pd.Series  # indexed by (team, title season); titles without both seasons loaded are left out
+    mean: float
+    median: float
+    ci_low: float
+    ci_high: float
+
+    @property
+    def titles(self):
+        return len(self.changes)
+
+
+@dataclass(frozen=True)
+class ChampionshipStats:
+    """Championship premium, post-title bumps and the reigning champion"""
+    with_titles: float
+    without_titles: float
+    bumps: dict = field(default_factory=dict)
+    champion: str = None
+    champion_titles: tuple = ()
+    champion_attendance: float = math.nan
+    champion_season: int = None
+
+    @property
+    def premium(self):
+        return self.with_titles - self.without_titles
+
+    @property
+    def premium_pct(self):
+        return self.premium / self.without_titles * 100 if self.without_titles else math.nan
+
+    def findings(self):
+        """The Key Findings bullets"""
+        lines = [
+            f"Teams WITH championships average {self.with_titles / 1e6:.2f}M fans/season",
+            f"Teams WITHOUT championships average {self.without_titles / 1e6:.2f}M fans/season",
+            f"Championship Premium: {self.premium / 1e3:+,.0f}K fans ({self.premium_pct:+.0f}%)",
+        ]
+        for horizon, bump in self.bumps.items():
+            if not bump.titles:
+                continue
+            after = 'the season after' if horizon == 1 else f'{horizon} seasons after'
+            line = f"Post-Championship Bump: {bump.mean:+.1f}% average attendance change {after} a title"
+            if not math.isnan(bump.ci_low):
+                line += f" ({CONFIDENCE:.0%} CI {bump.ci_low:+.1f}% to {bump.ci_high:+.1f}%"
+                line += f", median {bump.median:+.1f}%, {bump.titles} titles)"
+            lines.append(line)
+        if self.champion is not None:
+            years = ', '.join(str(season) for season in self.champion_titles)
+            line = (f"Reigning champions {self.champion}: {len(self.champion_titles)} "
+                    f"championship{'s' if len(self.champion_titles) != 1 else ''} ({years})")
+            if not math.isnan(self.champion_attendance):
+                line += f" → {self.champion_attendance / 1e6:.2f}M attendance in {self.champion_season}"
+            lines.append(line)
+        return lines
+
+
+def post_title_bump(season_attendance, ws_df, horizon):
+    """PostTitleBump for every title in ws_df, from a (team, Season)-indexed attendance Series"""
+    teams, title_seasons = ws_df['Winner'].to_numpy(), ws_df['Season'].to_numpy()
+    index = pd.MultiIndex.from_arrays([teams, title_seasons], names=['team', 'Season'])
+    base = season_attendance.reindex(index).to_numpy()
+    later = season_attendance.reindex(pd.MultiIndex.from_arrays([teams, title_seasons + horizon])).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes = pd.Series((later / base - 1) * 100, index=index)
+    changes = changes[np.isfinite(changes.to_numpy())]
+    low, high = bootstrap_ci(changes.to_numpy())
+    return PostTitleBump(horizon, changes, float(changes.mean()), float(changes.median()), low, high)
+
+
+def championship_stats(df, team_means, ws_data):
+    """ChampionshipStats for a prepared frame, its per-team mean attendance and WorldSeriesData"""
+    has_title = team_means.index.isin(ws_data.champions)
+    # One value per team-season (the real data has one row each)
+    season_attendance = df.astype({'attendance': 'float64'}).groupby(
+        ['team', 'Season'], observed=True)['attendance'].mean().dropna()
+    bumps = {horizon: post_title_bump(season_attendance, ws_data.frame, horizon) for horizon in BUMP_HORIZONS}
+
+    champion = champion_attendance = champion_season = None
+    if len(ws_data.frame):
+        champion = ws_data.frame.loc[ws_data.frame['Season'].idxmax(), 'Winner']
+        rows = season_attendance[season_attendance.index.get_level_values('team') == champion]
+        if len(rows):
+            champion_season = int(rows.index.get_level_values('Season').max())
+            champion_attendance = float(rows.iloc[-1])
+    return ChampionshipStats(
+        with_titles=float(team_means[has_title].mean()),
+        without_titles=float(team_means[~has_title].mean()),
+        bumps=bumps,
+        champion=champion,
+        champion_titles=tuple(ws_data.titles(champion)) if champion is not None else (),
+        champion_attendance=math.nan if champion_attendance is None else champion_attendance,
+        champion_season=champion_season,
+    )
@@ -0,0 +1,55 @@
+"""
+Compact arrays for client-side filtering.
+
+With MLB_CLIENTSIDE_FILTERING=1, the server sends the rows behind the Top
+Teams and Team Analysis graphs to the browser once, in a dcc.Store:
+  - the selected season's teams ranked by attendance (on a season change)
+  - the selected teams' per-season metric columns (on a team change)
+The figures are drawn by the clientside callbacks in
+assets/clientside_filtering.js, so moving the top-N slider or switching the
+metric or chart type costs no server round-trip.
+
+The mode is only used while the dataset is small enough to be drawn without
+server-side downsampling (at most MLB_WEBGL_THRESHOLD rows); larger
+datasets keep the server-side callbacks.
+"""
+import os
+
+import pandas as pd
+
+CLIENTSIDE_FILTERING = os.environ.get('MLB_CLIENTSIDE_FILTERING', '0') == '1'
+
+# Columns shipped per team for the Team Analysis metrics
+TEAM_METRIC_COLUMNS = ['attendance', 'Attend/G', 'Est. Payroll', 'efficiency']
+
+
+def column(values):
+    """Values as a JSON-ready list (NaN as null)"""
+    values = pd.Series(values)
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def season_ranking(season, season_data, color_map):
+    """A season's teams, by total attendance descending, with their colors"""
+    ranked = season_data.sort_values('attendance', ascending=False)
+    teams = [str(team) for team in ranked['team']]
+    return {
+        'season': int(season),
+        'teams': teams,
+        'attendance': column(ranked['attendance']),
+        'colors': [color_map.get(team) for team in teams],
+    }
+
+
+def team_series(team_frames, seasons, color_map, labels):
+    """Per-season metric columns for each (team, rows) pair, plus the axis labels of the metrics"""
+    return {
+        'seasons': [int(season) for season in seasons],
+        'labels': labels,
+        'teams': [{
+            'team': team,
+            'color': color_map.get(team),
+            'Season': [int(season) for season in rows['Season']],
+            **{col: column(rows[col]) for col in TEAM_METRIC_COLUMNS if col in rows},
+        } for team, rows in team_frames],
+    }
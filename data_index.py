@@ -0,0 +1,104 @@
+"""
+Startup index over the prepared attendance frame.
+
+Callbacks look up a team's or a season's rows through a dict of slices that
+is materialized once with groupby, instead of scanning the whole frame with
+a boolean mask on every request.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _categories_changed(old, new):
+    """Whether two team dtypes are categoricals with different categories"""
+    if not isinstance(old, pd.CategoricalDtype) or not isinstance(new, pd.CategoricalDtype):
+        return False
+    return not old.categories.equals(new.categories)
+
+
+class DataIndex:
+    """Per-team and per-season slices of a prepared attendance frame.
+
+    Each slice keeps the original row order of the source frame, so results
+    are identical to df[df['team'] == team] / df[df['Season'] == season].
+
+    With materialize=False only row positions are stored and slices are
+    gathered on lookup. That is used for shared-memory frames, where
+    materializing every slice would give each worker a private copy of the
+    whole dataset.
+    """
+
+    def __init__(self, df, materialize=True):
+        self._df = df
+        self._empty = df.iloc[0:0]
+        self.materialize = materialize
+        self.by_team = {}
+        self.by_season = {}
+        if len(df) and 'team' in df and 'Season' in df:
+            self.by_team = self._slices(df, 'team')
+            self.by_season = self._slices(df, 'Season')
+
+    def _slices(self, rows, key, offset=0):
+        """Slices (or int32 row positions, shifted by offset) of rows per key"""
+        grouped = rows.groupby(key, sort=True, observed=True)
+        cast = int if key == 'Season' else (lambda value: value)
+        if self.materialize:
+            return {cast(value): group for value, group in grouped}
+        return {cast(value): (pos + offset).astype('int32') for value, pos in grouped.indices.items()}
+
+    def _extend(self, index, slices):
+        merged = dict(index)
+        for key, entry in slices.items():
+            if key in merged:
+                entry = pd.concat([merged[key], entry]) if self.materialize else np.concatenate([merged[key], entry])
+            merged[key] = entry
+        return dict(sorted(merged.items()))
+
+    def append(self, df, start):
+        """Index the rows df.iloc[start:] appended to the indexed frame.
+
+        Only the teams and seasons present in the new rows are touched. The
+        lookup dicts are replaced rather than mutated, so a shallow copy of
+        an index can be extended while the original keeps serving.
+        """
+        rows = df.iloc[start:]
+        old_team = self._empty['team'].dtype if 'team' in self._empty else None
+        self._df = df
+        self._empty = df.iloc[0:0]
+        if self.materialize and _categories_changed(old_team, df['team'].dtype if 'team' in df else None):
+            # A new team widened the frame's team categories: slices with the old ones
+            # would concatenate (with each other or the new rows) to plain object columns
+            team = df['team'].dtype
+            self.by_team = {key: entry.astype({'team': team}) for key, entry in self.by_team.items()}
+            self.by_season = {key: entry.astype({'team': team}) for key, entry in self.by_season.items()}
+        if len(rows):
+            self.by_team = self._extend(self.by_team, self._slices(rows, 'team', start))
+            self.by_season = self._extend(self.by_season, self._slices(rows, 'Season', start))
+
+    def _rows(self, entry):
+        if entry is None:
+            return self._empty
+        return entry if self.materialize else self._df.take(entry)
+
+    def team(self, team):
+        """Rows for one team (empty frame if unknown)"""
+        return self._rows(self.by_team.get(team))
+
+    def team_count(self, team):
+        """Number of rows for one team, without building the slice"""
+        return len(self.by_team.get(team, ()))
+
+    def season(self, season):
+        """Rows for one season (empty frame if unknown)"""
+        try:
+            return self._rows(self.by_season.get(int(season)))
+        except (TypeError, ValueError):
+            return self._empty
+
+    def seasons(self, seasons):
+        """Rows for several seasons, in season order"""
+        keys = sorted({int(s) for s in seasons if s is not None})
+        frames = [self._rows(self.by_season[s]) for s in keys if s in self.by_season]
+        if not frames:
+            return self._empty
+        return pd.concat(frames)
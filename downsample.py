@@ -0,0 +1,107 @@
+"""
+Server-side reduction of large figures.
+
+When a figure would carry more than WEBGL_THRESHOLD points, callbacks switch
+to WebGL traces and send a downsampled series sized to the browser viewport:
+LTTB (Largest-Triangle-Three-Buckets) for lines, min/max per bucket for
+markers, and precomputed quartiles instead of raw points for box plots.
+Zooming re-queries the callback with the visible x-range, so detail comes
+back as the user zooms in.
+"""
+import os
+
+import numpy as np
+
+# Points per figure above which the large-data mode kicks in
+WEBGL_THRESHOLD = int(os.environ.get('MLB_WEBGL_THRESHOLD', 5000))
+
+# Points sent per trace for each horizontal pixel of the viewport
+POINTS_PER_PIXEL = 2
+
+# Used until the browser has reported its width (the layout is at most 1200px)
+DEFAULT_VIEWPORT_WIDTH = 1200
+
+
+def target_points(viewport_width=None):
+    """Number of points per trace worth sending for a viewport width"""
+    width = min(viewport_width or DEFAULT_VIEWPORT_WIDTH, DEFAULT_VIEWPORT_WIDTH)
+    return max(100, int(width * POINTS_PER_PIXEL))
+
+
+def lttb(x, y, n_out):
+    """Indices of the Largest-Triangle-Three-Buckets sample of (x, y).
+
+    x must be sorted. The first and last points are always kept.
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    edges = np.floor(np.arange(n_out - 1) * every).astype(np.int64) + 1
+    edges = np.append(edges, n)
+
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < n_out - 1 else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def minmax(y, n_out):
+    """Indices of the min and max of y in each of n_out // 2 equal buckets"""
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    valid = ~np.all(np.isnan(padded), axis=1)
+    offsets = np.arange(buckets)[valid] * size
+    lo = offsets + np.nanargmin(padded[valid], axis=1)
+    hi = offsets + np.nanargmax(padded[valid], axis=1)
+    return np.unique(np.concatenate([lo, hi]))
+
+
+def visible_x_range(relayout_data):
+    """(x0, x1) from a graph's relayoutData, or None when not zoomed"""
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        x0, x1 = relayout_data['xaxis.range']
+        return x0, x1
+    return None
+
+
+def box_stats(values):
+    """Quartiles, fences and mean of values, as Plotly's precomputed box fields"""
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'q1': [float(q1)],
+        'median': [float(median)],
+        'q3': [float(q3)],
+        'lowerfence': [float(inside.min())],
+        'upperfence': [float(inside.max())],
+        'mean': [float(values.mean())],
+    }
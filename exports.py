@@ -0,0 +1,334 @@
+"""
+Exports of any dashboard view, generated off the request threads.
+
+    POST /api/export {"output": "top-teams-graph.figure", "inputs": [2025, 10], "format": "png"}
+
+queues a job for the view behind a callback output, with the callback's
+input values in order (as Dash sends them), and answers 202 with a job id.
+Inputs the view does not accept are refused with 400. GET /api/export/<id>
+then answers the job's status (202) until the file is ready, and the file
+itself after that; a job that failed anyway answers its record with status
+'error' (the details go to the server log). Formats:
+  - csv, parquet: the filtered rows the graph is drawn from
+  - png, svg, pdf: the graph as a static image (needs kaleido); width,
+    height and scale can be given with the job
+
+Views are registered with register(): the memoized figure function behind
+the output, how the callback inputs map to its arguments (validating them),
+and the function returning the view's rows.
+
+Jobs run on a bounded pool of worker processes (MLB_EXPORT_WORKERS per
+serving process, default 2; 0 turns exports off), so image rendering, which
+is slow and CPU-bound, never runs on the threads serving interactive
+callbacks, and the workers run at a lower priority (MLB_EXPORT_NICE) so
+they only get the CPU time interactive requests leave over. Workers are
+spawned, not forked (see figure_pool.py): each imports the dashboard module
+once and catches up with the serving process's data through the service's
+sync function before every job. At most MLB_EXPORT_QUEUE_SIZE jobs are
+queued or running at once; further submissions are refused with 429
+until some finish, and a submission identical to a queued job joins it.
+Finished files are cached (MLB_EXPORT_CACHE_SIZE entries) keyed on the
+view, inputs, format and dataset version.
+"""
+import inspect
+import io
+import json
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+import numpy as np
+import plotly.io as pio
+
+import metrics
+from figure_cache import ErrorPayload, FigureCache
+from payloads import shared_templates
+
+try:
+    import kaleido
+except ImportError:  # pragma: no cover - optional dependency
+    kaleido = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+EXPORT_WORKERS = int(os.environ.get('MLB_EXPORT_WORKERS', 2))
+EXPORT_QUEUE_SIZE = int(os.environ.get('MLB_EXPORT_QUEUE_SIZE', 16))
+EXPORT_CACHE_SIZE = int(os.environ.get('MLB_EXPORT_CACHE_SIZE', 64))
+# Added to the workers' niceness, so the OS runs the serving processes first when CPUs are busy
+EXPORT_NICE = int(os.environ.get('MLB_EXPORT_NICE', 10))
+
+# Format -> MIME type
+DATA_FORMATS = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+IMAGE_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml', 'pdf': 'application/pdf'}
+
+# Image size when the job does not give one, and the bounds of what it may ask for
+IMAGE_WIDTH, IMAGE_HEIGHT = 1200, 700
+MAX_IMAGE_SIDE, MAX_IMAGE_SCALE = 4000, 4
+
+# Finished job records kept for polling (the files themselves live in the result cache)
+MAX_JOBS = 1024
+
+
+class ExportError(ValueError):
+    """An export that cannot be made; reported to the client as a 4xx"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class View:
+    """An exportable view: figure function, callback inputs -> its arguments, and its rows"""
+    figure: object
+    args: object
+    data: object
+
+
+# Output id -> View; filled by register() when the dashboard module is imported, in workers too
+VIEWS = {}
+
+
+def register(output, figure, data, args=None):
+    """Make the view behind output exportable.
+
+    figure is a memoized figure function (figure_cache.memoize), args maps
+    the callback input values to its arguments (the values themselves by
+    default), raising ValueError for values the view does not accept, and
+    data returns the view's rows as a DataFrame for the same inputs.
+    """
+    VIEWS[output] = View(figure, args or (lambda *inputs: inputs), data)
+
+
+def _csv_numbers(column):
+    """A float32 column (schema.py) as the numbers it stands for, so CSV holds plain decimals
+
+    pandas writes float32 values like 4.01247e+06; whole-valued columns are
+    written as integers, the others as the shortest decimal of each value.
+    """
+    values = column.to_numpy()
+    finite = values[np.isfinite(values)]
+    if (finite == np.round(finite)).all() and (np.abs(finite) < 2 ** 53).all():
+        return column.astype('Int64')
+    return column.astype(str).astype('float64')
+
+
+def frame_bytes(frame, export_format):
+    """A DataFrame as CSV or Parquet bytes"""
+    if export_format == 'csv':
+        frame = frame.assign(**{col: _csv_numbers(frame[col]) for col in frame.columns
+                                if frame[col].dtype == 'float32'})
+        return frame.to_csv(index=False).encode()
+    buffer = io.BytesIO()
+    # Categorical columns as plain strings, so the file reads the same with any tool
+    frame = frame.astype({col: str for col in frame.columns if frame[col].dtype == 'category'})
+    frame.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def image_bytes(figure_json, export_format, width, height, scale):
+    """A serialized figure rendered as an image by kaleido"""
+    figure = json.loads(figure_json)
+    layout = figure.get('layout', {})
+    # Figures are serialized with shared templates by name (payloads.py); kaleido needs the template itself
+    if isinstance(layout.get('template'), str) and layout['template'] in shared_templates():
+        layout['template'] = shared_templates()[layout['template']]
+    return pio.to_image(figure, format=export_format, width=width, height=height, scale=scale, validate=False)
+
+
+def _lower_priority(increment):
+    """Worker initializer"""
+    try:
+        os.nice(increment)
+    except OSError:  # pragma: no cover - not permitted here
+        pass
+
+
+def _run_job(sync, state, output, inputs, args, export_format, options, figure_json):
+    """The exported file's bytes (runs in a worker)"""
+    if sync is not None:
+        sync(state)
+    view = VIEWS[output]
+    if export_format in DATA_FORMATS:
+        return frame_bytes(view.data(*inputs), export_format)
+    if figure_json is None:
+        figure_json = view.figure.render(*args)
+        if isinstance(figure_json, ErrorPayload):
+            raise RuntimeError(f"{output} could not be drawn: {json.loads(figure_json)['layout']['title']}")
+    return image_bytes(figure_json, export_format, *options)
+
+
+def _figure_args(output, view, inputs):
+    """The figure arguments for a job's inputs; raises ExportError"""
+    if not isinstance(inputs, list):
+        raise ExportError("inputs must be the list of the callback's input values")
+    try:
+        inspect.signature(view.args).bind(*inputs)
+        args = tuple(view.args(*inputs))
+        inspect.signature(view.figure).bind(*args)
+    except (TypeError, ValueError) as e:
+        raise ExportError(f"Invalid inputs for {output}: {e}") from None
+    return args
+
+
+def _image_options(options):
+    """(width, height, scale) of an image job; raises ExportError"""
+    try:
+        width = int(options.get('width') or IMAGE_WIDTH)
+        height = int(options.get('height') or IMAGE_HEIGHT)
+        scale = float(options.get('scale') or 1)
+    except (TypeError, ValueError):
+        raise ExportError("width and height must be integers and scale a number") from None
+    if not (0 < width <= MAX_IMAGE_SIDE and 0 < height <= MAX_IMAGE_SIDE and 0 < scale <= MAX_IMAGE_SCALE):
+        raise ExportError(f"Images are at most {MAX_IMAGE_SIDE}px a side, at a scale of at most {MAX_IMAGE_SCALE}")
+    return width, height, scale
+
+
+class ExportService:
+    """Export jobs on a bounded pool of spawned workers, with a job table and a result cache"""
+
+    def __init__(self, workers=EXPORT_WORKERS, queue_size=EXPORT_QUEUE_SIZE, version=None,
+                 sync=None, state=None, cache=None, views=VIEWS):
+        self.workers = workers
+        self.queue_size = queue_size
+        # Version of the data the files are made from; part of the result key
+        self.version = version or (lambda: None)
+        # Workers call sync(state()) before each job, as in figure_pool.FigurePool
+        self.sync = sync
+        self.state = state or (lambda: None)
+        self.cache = cache if cache is not None else FigureCache(EXPORT_CACHE_SIZE)
+        self.views = views
+        self._executor = None
+        self._jobs = OrderedDict()
+        self._running = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def pending(self):
+        """Jobs queued or running"""
+        with self._lock:
+            return len(self._running)
+
+    def _get_executor(self):
+        # Called with self._lock held
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_lower_priority, initargs=(EXPORT_NICE,))
+        return self._executor
+
+    def submit(self, output, inputs, export_format, options=None):
+        """Job record (a dict with 'id' and 'status') for an export; raises ExportError"""
+        if not self.enabled:
+            raise ExportError("Exports are turned off (MLB_EXPORT_WORKERS=0)", 503)
+        view = self.views.get(output) if isinstance(output, str) else None
+        if view is None:
+            raise ExportError(f"Unknown view: {output!r} (exportable: {', '.join(sorted(self.views))})", 404)
+        args = _figure_args(output, view, inputs)
+        if export_format in IMAGE_FORMATS:
+            if kaleido is None:
+                raise ExportError("Image exports need kaleido (pip install kaleido)", 501)
+            options = _image_options(options or {})
+        elif export_format == 'parquet' and pyarrow is None:
+            raise ExportError("Parquet exports need pyarrow (pip install pyarrow)", 501)
+        elif export_format in DATA_FORMATS:
+            options = ()
+        else:
+            raise ExportError(f"Unknown format: {export_format!r} "
+                              f"(use one of {', '.join(list(DATA_FORMATS) + list(IMAGE_FORMATS))})")
+
+        # Version first: appends publish the data before the version, so workers are never older
+        version = self.version()
+        state = self.state()
+        key = (output, json.dumps(inputs, sort_keys=True, default=str), export_format, options, version)
+        job = {'id': uuid.uuid4().hex, 'output': output, 'format': export_format, 'status': 'queued',
+               'key': key, 'submitted': time.time()}
+        with self._lock:
+            if self.cache.get(key, record_miss=False) is not None:
+                job['status'] = 'done'
+                metrics.export_jobs.inc(export_format, 'cached')
+                return self._record(job)
+            running = self._running.get(key)
+            if running is not None:
+                metrics.export_jobs.inc(export_format, 'joined')
+                return running
+            if len(self._running) >= self.queue_size:
+                metrics.export_jobs.inc(export_format, 'busy')
+                raise ExportError(f"{self.queue_size} exports are already queued; retry shortly", 429)
+            # An image of a figure the dashboard has already built is rendered from the cached JSON
+            figure_json = None
+            if export_format in IMAGE_FORMATS:
+                figure_json = view.figure.lookup(view.figure.cache_key(*args), record_miss=False)
+            call = (_run_job, self.sync, state, output, inputs, args, export_format, options, figure_json)
+            try:
+                future = self._get_executor().submit(*call)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory): start a new pool
+                self._executor = None
+                future = self._get_executor().submit(*call)
+            self._running[key] = self._record(job)
+        metrics.export_jobs.inc(export_format, 'queued')
+        future.add_done_callback(lambda future: self._finished(job, future))
+        return job
+
+    def _record(self, job):
+        # Called with self._lock held
+        self._jobs[job['id']] = job
+        while len(self._jobs) > MAX_JOBS:
+            self._jobs.popitem(last=False)
+        return job
+
+    def _finished(self, job, future):
+        try:
+            self.cache.put(job['key'], future.result())
+        except Exception as e:
+            # Inputs were validated on submit, so this is a server-side failure: logged, not sent
+            print(f"Error in export {job['id']} of {job['output']}: {e}")
+            traceback.print_exception(e)
+            job['error'] = "The export failed; see the server log"
+            job['status'] = 'error'
+            metrics.export_jobs.inc(job['format'], 'error')
+        else:
+            job['status'] = 'done'
+            metrics.export_jobs.inc(job['format'], 'done')
+            metrics.export_seconds.observe(time.time() - job['submitted'], job['format'])
+        with self._lock:
+            self._running.pop(job['key'], None)
+
+    def job(self, job_id):
+        """Job record for job_id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @staticmethod
+    def describe(job):
+        """The client-facing fields of a job record"""
+        return {name: job[name] for name in ('id', 'output', 'format', 'status', 'error') if name in job}
+
+    def result(self, job):
+        """The file of a done job, or None once it has been evicted from the result cache"""
+        return self.cache.get(job['key'])
+
+    def media_type(self, job):
+        return {**DATA_FORMATS, **IMAGE_FORMATS}[job['format']]
+
+    def filename(self, job):
+        return f"{job['output'].rsplit('.', 1)[0]}.{job['format']}"
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
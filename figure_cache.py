@@ -0,0 +1,169 @@
+"""
+Memoized figure cache for the dashboard callbacks.
+
+Figures are cached as serialized Plotly JSON, keyed on
+(callback name, callback inputs, data version), with bounded LRU eviction.
+A hit skips pandas filtering and Plotly figure construction entirely; the
+stored JSON is sent as the response body as-is (see serve_cached_figure in
+MLBAttendance.py), or decoded and handed back to Dash. Hits, misses and the
+phases of each miss are reported to metrics.
+
+Error figures (ErrorFigure, returned by a callback that failed) are served
+but never cached, so a transient failure is retried on the next request.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+import metrics
+from payloads import figure_json
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('MLB_FIGURE_CACHE_SIZE', 1024))
+
+
+def _freeze(value):
+    """Turn callback inputs (lists, dicts) into a hashable cache key part"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ErrorFigure(go.Figure):
+    """Figure shown in place of one whose callback failed"""
+
+
+class ErrorPayload(str):
+    """Serialized ErrorFigure; FigureCache.put drops it"""
+
+
+class FigureCache:
+    """Thread-safe LRU cache of serialized figures with hit/miss counters"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, record_miss=True):
+        """Return the cached JSON payload for key, or None"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                if record_miss:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        """Store a JSON payload, evicting the least recently used entries
+
+        Error figures (ErrorPayload) are not stored.
+        """
+        if isinstance(payload, ErrorPayload):
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def evict_stale(self):
+        """Drop the entries built against data that has since changed.
+
+        Returns the number of entries dropped; entries whose version is still
+        current are kept.
+        """
+        with self._lock:
+            stale = [key for key in self._entries if self._versions[key[0]](*key[1]) != key[2]]
+            for key in stale:
+                del self._entries[key]
+            self.evictions += len(stale)
+        return len(stale)
+
+    def stats(self):
+        """Snapshot of cache size and counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'bytes': sum(len(p) for p in self._entries.values()),
+            }
+
+    def memoize(self, version):
+        """Decorator caching a figure callback.
+
+        version is called with the callback arguments and returns the
+        current version of the data the figure is built from; entries built
+        against an older version are never served. A figure that only reads
+        some seasons can return a version covering just those seasons, so
+        appending rows elsewhere leaves it cached.
+        """
+        def decorator(func):
+            self._versions[func.__name__] = version
+
+            def cache_key(*args):
+                return (func.__name__, _freeze(args), version(*args))
+
+            def lookup(key, record_miss=True):
+                payload = self.get(key, record_miss)
+                if payload is not None:
+                    metrics.observe_figure(func.__name__, True, payload)
+                return payload
+
+            def render(*args):
+                """Build and serialize the figure, bypassing the cache (an ErrorPayload if it failed)"""
+                started = metrics.start_figure()
+                fig = func(*args)
+                built = time.perf_counter()
+                payload = figure_json(fig)
+                if isinstance(fig, ErrorFigure):
+                    payload = ErrorPayload(payload)
+                metrics.observe_figure(func.__name__, False, payload, started, built, time.perf_counter())
+                return payload
+
+            @functools.wraps(func)
+            def wrapper(*args):
+                # The key (and its version) is taken before the build reads any data
+                key = cache_key(*args)
+                payload = lookup(key)
+                if payload is None:
+                    payload = render(*args)
+                    self.put(key, payload)
+                return json.loads(payload)
+            wrapper.uncached = func
+            wrapper.cache_key = cache_key
+            wrapper.lookup = lookup
+            wrapper.render = render
+            return wrapper
+        return decorator
+
+
+# Process-wide cache shared by all callbacks
+figure_cache = FigureCache()
@@ -0,0 +1,111 @@
+"""
+Concurrent builds of sibling figures.
+
+A tab with two graphs normally costs two Dash round-trips whose figures are
+built one after the other. With MLB_FIGURE_WORKERS > 0 the dashboard instead
+registers one multi-output callback per such tab, and the figures it needs
+that are not in the figure cache are built in parallel on a pool, so the tab
+opens in the time of its slowest figure rather than the sum of both.
+
+MLB_FIGURE_POOL selects the pool:
+  - thread (default): threads of the serving process. Cheap to start and
+    always see the current data, but only overlap the parts of a build that
+    release the GIL.
+  - process: spawned workers. Figure building is mostly GIL-bound Python in
+    Plotly, so only processes run it on several cores. Each worker imports
+    the dashboard module once, loading the data (and replaying the update
+    files) itself, and before every build calls the pool's sync function to
+    apply the updates the serving process has applied since. Workers are
+    spawned rather than forked: the serving process runs threads (requests,
+    the update watcher), and a fork could copy a lock one of them holds.
+    Timings recorded inside a worker stay in that worker and do not reach
+    /metrics.
+"""
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from figure_cache import figure_cache
+
+FIGURE_WORKERS = int(os.environ.get('MLB_FIGURE_WORKERS', 0))
+FIGURE_POOL = os.environ.get('MLB_FIGURE_POOL', 'thread')
+
+
+def _render(sync, state, callback, args):
+    """Serialized figure of a memoized callback (runs in a worker)"""
+    if sync is not None:
+        sync(state)
+    return callback.render(*args)
+
+
+class FigurePool:
+    """Builds the uncached figures of several memoized callbacks concurrently"""
+
+    def __init__(self, workers=FIGURE_WORKERS, kind=FIGURE_POOL, sync=None, state=None, cache=figure_cache):
+        if kind not in ('process', 'thread'):
+            raise ValueError(f"MLB_FIGURE_POOL must be 'process' or 'thread', not {kind!r}")
+        self.workers = workers
+        self.kind = kind
+        # Process workers call sync(state()) before each build, to catch up with the serving process's data;
+        # sync must be a module-level function of the dashboard module, which unpickling it imports
+        self.sync = sync
+        self.state = state
+        self.cache = cache
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.kind == 'process':
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, mp_context=multiprocessing.get_context('spawn'))
+                else:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='figure')
+            return self._executor
+
+    def build(self, calls):
+        """Figures for calls, a list of (memoized callback, args) pairs
+
+        Cache hits are answered directly; the misses are built concurrently
+        and stored under the key taken before the build started. A build
+        that fails in a worker (e.g. a killed process) is retried in the
+        calling thread.
+        """
+        keys = [callback.cache_key(*args) for callback, args in calls]
+        payloads = [callback.lookup(key) for (callback, _), key in zip(calls, keys)]
+        misses = [i for i, payload in enumerate(payloads) if payload is None]
+        if len(misses) == 1:
+            callback, args = calls[misses[0]]
+            payloads[misses[0]] = callback.render(*args)
+        elif misses:
+            executor = self._get_executor()
+            sync, state = (self.sync, self.state()) if self.kind == 'process' and self.sync else (None, None)
+            futures = {i: executor.submit(_render, sync, state, *calls[i]) for i in misses}
+            for i, future in futures.items():
+                try:
+                    payloads[i] = future.result()
+                except Exception as e:
+                    print(f"Note: concurrent build of {calls[i][0].__name__} failed ({e!r}); building inline")
+                    if isinstance(e, BrokenProcessPool):
+                        # A worker died (e.g. killed for memory): the next build starts a new pool
+                        with self._lock:
+                            if self._executor is executor:
+                                self._executor = None
+                    payloads[i] = calls[i][0].render(*calls[i][1])
+        for i in misses:
+            self.cache.put(keys[i], payloads[i])
+        return [json.loads(payload) for payload in payloads]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
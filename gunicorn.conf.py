@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the shared-memory deployment mode.
+
+    gunicorn -c gunicorn.conf.py MLBAttendance:server
+
+The master exports the prepared frame to MLB_SHARED_DATA_DIR once before
+forking; every worker memory-maps it (see shared_data.py).
+"""
+import os
+import subprocess
+import sys
+
+bind = os.environ.get('MLB_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('MLB_WORKERS', 8))
+timeout = 120
+
+os.environ.setdefault('MLB_SHARED_DATA_DIR', '/dev/shm/mlb-attendance')
+
+
+def on_starting(server):
+    """Export the shared frame in a child process so the master stays small"""
+    subprocess.run([sys.executable, '-m', 'shared_data', 'export', os.environ['MLB_SHARED_DATA_DIR']],
+                   check=True)
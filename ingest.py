@@ -0,0 +1,102 @@
+"""
+Streaming ingestion of per-game attendance logs.
+
+Game logs (one row per game, potentially tens of millions of rows across
+many CSV files) are read in fixed-size chunks with explicit dtypes and rolled
+up into the team-season table the dashboard works with. Only the running
+team-season totals are kept between chunks, so peak memory depends on the
+chunk size, not on the size of the input.
+
+Expected game-log columns: team, Season, attendance, and optionally
+Est. Payroll (the team's season payroll, repeated on every game row).
+Point the app at a directory of logs with MLB_GAME_LOG_DIR.
+"""
+import glob
+import os
+
+import pandas as pd
+
+# Team name normalization - consolidate all historical variants
+TEAM_NAME_MAP = {
+    'Anaheim Angels': 'Los Angeles Angels',
+    'Los Angeles Angels of Anaheim': 'Los Angeles Angels',
+    'Florida Marlins': 'Miami Marlins',
+    'Tampa Bay Devil Rays': 'Tampa Bay Rays',
+    'Montreal Expos': 'Washington Nationals'
+}
+
+GAME_LOG_DIR = os.environ.get('MLB_GAME_LOG_DIR') or None
+
+# Rows parsed per chunk; bounds peak memory of an ingestion run
+CHUNK_ROWS = int(os.environ.get('MLB_INGEST_CHUNK_ROWS', 1_000_000))
+
+GAME_LOG_DTYPES = {
+    'team': 'category',
+    'Season': 'int16',
+    'attendance': 'float64',
+    'Est. Payroll': 'float64',
+}
+
+
+def game_log_files(directory=None):
+    """Sorted game-log CSVs in directory"""
+    return sorted(glob.glob(os.path.join(directory or GAME_LOG_DIR, '*.csv')))
+
+
+class TeamSeasonAccumulator:
+    """Running team-season totals built from game-log chunks"""
+
+    def __init__(self):
+        self.totals = None
+        self.rows = 0
+
+    def add(self, chunk):
+        """Fold one chunk of game rows into the totals"""
+        self.rows += len(chunk)
+        if 'Est. Payroll' not in chunk:
+            chunk = chunk.assign(**{'Est. Payroll': float('nan')})
+        partial = chunk.groupby(['team', 'Season'], observed=True, sort=False).agg(
+            attendance=('attendance', 'sum'),
+            games=('attendance', 'count'),
+            payroll=('Est. Payroll', 'max'),
+        )
+        # Normalize names on the (small) grouped result rather than every row
+        partial = partial.reset_index()
+        partial['team'] = partial['team'].astype(str).replace(TEAM_NAME_MAP)
+        partial = partial.groupby(['team', 'Season'], sort=False).agg(
+            {'attendance': 'sum', 'games': 'sum', 'payroll': 'max'})
+
+        if self.totals is None:
+            self.totals = partial
+        else:
+            combined = self.totals.add(partial[['attendance', 'games']], fill_value=0)
+            combined['payroll'] = pd.concat([self.totals['payroll'], partial['payroll']], axis=1).max(axis=1)
+            self.totals = combined
+
+    def result(self):
+        """Team-season table in the same schema as the attendance CSV"""
+        columns = ['team', 'attendance', 'Attend/G', 'Est. Payroll', 'Season']
+        if self.totals is None:
+            return pd.DataFrame(columns=columns)
+        totals = self.totals.sort_index(level=['Season', 'team']).reset_index()
+        games = totals['games'].where(totals['games'] > 0)
+        return pd.DataFrame({
+            'team': totals['team'],
+            'attendance': totals['attendance'].where(games.notna()),
+            'Attend/G': (totals['attendance'] / games).round(),
+            'Est. Payroll': totals['payroll'],
+            'Season': totals['Season'].astype('int64'),
+        })[columns]
+
+
+def ingest_game_logs(paths, chunk_rows=CHUNK_ROWS):
+    """Stream game-log CSVs and return the team-season table"""
+    accumulator = TeamSeasonAccumulator()
+    for path in paths:
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [col for col in GAME_LOG_DTYPES if col in header]
+        dtypes = {col: GAME_LOG_DTYPES[col] for col in usecols}
+        for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows):
+            accumulator.add(chunk)
+    print(f"✓ Ingested {accumulator.rows} game rows from {len(paths)} files")
+    return accumulator.result()
@@ -0,0 +1,228 @@
+"""
+Callback instrumentation in Prometheus text format.
+
+Counters and histograms are sharded per thread: each thread only ever writes
+to its own cells, so recording an observation takes no lock. A scrape of
+/metrics sums the shards. Shards of finished threads are folded into a
+retired total whenever a thread registers a new shard or /metrics is scraped,
+so the shard list stays bounded by the live threads. Timing histograms record a sample of the calls
+(MLB_METRICS_SAMPLE_RATE, default 1.0 = every call); the *_total counters are
+always exact.
+
+Figure callbacks wrapped by figure_cache.memoize report their phases:
+filtering (until the callback calls mark_filtered()), figure build, JSON
+serialization, payload size and cache hit/miss.
+"""
+import bisect
+import os
+import random
+import threading
+import time
+
+SAMPLE_RATE = float(os.environ.get('MLB_METRICS_SAMPLE_RATE', 1.0))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1_000, 4_000, 16_000, 64_000, 256_000, 1_000_000, 4_000_000, 16_000_000)
+
+
+def sampled():
+    """Whether the current call should feed the timing histograms"""
+    return SAMPLE_RATE >= 1.0 or random.random() < SAMPLE_RATE
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Sharded:
+    """Per-thread cells of numbers, keyed by label values, summed on collect"""
+
+    kind = None
+    width = 1
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        # Taken once per thread (to register its shard) and on collect, never per observation
+        self._lock = threading.Lock()
+
+    def _cell(self, labels):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire()
+                self._shards.append((threading.current_thread(), shard))
+        cell = shard.get(labels)
+        if cell is None:
+            cell = shard[labels] = [0] * self.width
+        return cell
+
+    @staticmethod
+    def _add(total, labels, cell):
+        into = total.setdefault(labels, [0] * len(cell))
+        for i, value in enumerate(cell):
+            into[i] += value
+
+    def _retire(self):
+        """Fold the shards of finished threads into the retired total (caller holds the lock)"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for labels, cell in list(shard.items()):
+                    self._add(self._retired, labels, cell)
+        self._shards = live
+
+    def collect(self):
+        """{label values: summed cell} over every thread that ever recorded"""
+        with self._lock:
+            self._retire()
+            total = {labels: list(cell) for labels, cell in self._retired.items()}
+            for _, shard in self._shards:
+                for labels, cell in list(shard.items()):
+                    self._add(total, labels, list(cell))
+        return total
+
+    def _label_text(self, labels, extra=()):
+        pairs = list(zip(self.labelnames, labels)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+    def render(self):
+        """Exposition lines for this metric"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, cell in sorted(self.collect().items()):
+            lines.extend(self._samples(labels, cell))
+        return lines
+
+
+class Counter(_Sharded):
+    """Monotonic counter"""
+
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        self._cell(labels)[0] += amount
+
+    def values(self):
+        """{label values: count}"""
+        return {labels: cell[0] for labels, cell in self.collect().items()}
+
+    def _samples(self, labels, cell):
+        return [f"{self.name}{self._label_text(labels)} {cell[0]:g}"]
+
+
+class Histogram(_Sharded):
+    """Cumulative-bucket histogram"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames, buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per-bucket counts, +Inf, then the sum of the observed values
+        self.width = len(self.buckets) + 2
+
+    def observe(self, value, *labels):
+        cell = self._cell(labels)
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def _samples(self, labels, cell):
+        lines = []
+        cumulative = 0
+        for bound, count in zip([f"{b:g}" for b in self.buckets] + ['+Inf'], cell[:-1]):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{self._label_text(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(labels)} {cell[-1]:g}")
+        lines.append(f"{self.name}_count{self._label_text(labels)} {cumulative}")
+        return lines
+
+
+# Dash round-trips, measured around the /_dash-update-component request
+callback_requests = Counter(
+    'mlb_callback_requests_total', 'Dash callback requests by output', ['output'])
+callback_seconds = Histogram(
+    'mlb_callback_request_seconds', 'Server time per Dash callback request', ['output'])
+callback_response_bytes = Histogram(
+    'mlb_callback_response_bytes', 'Dash callback response size', ['output'], SIZE_BUCKETS)
+callback_errors = Counter(
+    'mlb_callback_errors_total', 'Callbacks that returned an error figure', ['callback'])
+static_bundle_responses = Counter(
+    'mlb_static_bundle_responses_total', 'Callback requests answered from the pre-rendered bundle', ['output'])
+
+# Figure callbacks, measured inside figure_cache.memoize
+figure_cache_requests = Counter(
+    'mlb_figure_cache_requests_total', 'Figure cache lookups', ['callback', 'result'])
+figure_filter_seconds = Histogram(
+    'mlb_figure_filter_seconds', 'Data selection time before the figure is built', ['callback'])
+figure_build_seconds = Histogram(
+    'mlb_figure_build_seconds', 'Figure construction time after data selection', ['callback'])
+figure_serialize_seconds = Histogram(
+    'mlb_figure_serialize_seconds', 'Figure JSON serialization time', ['callback'])
+figure_bytes = Histogram(
+    'mlb_figure_bytes', 'Serialized figure size', ['callback'], SIZE_BUCKETS)
+
+# Query API (query.py)
+query_requests = Counter(
+    'mlb_query_requests_total', 'Query API requests by engine and result (hit, miss, error)', ['engine', 'result'])
+query_seconds = Histogram(
+    'mlb_query_seconds', 'Query execution time on a result cache miss', ['engine'])
+
+# Export jobs (exports.py)
+export_jobs = Counter(
+    'mlb_export_jobs_total', 'Export submissions and outcomes by format '
+    '(queued, joined, cached, busy, done, error)', ['format', 'result'])
+export_seconds = Histogram(
+    'mlb_export_seconds', 'Time from submission to a finished export file', ['format'])
+
+REGISTRY = [
+    callback_requests, callback_seconds, callback_response_bytes, callback_errors, static_bundle_responses,
+    figure_cache_requests, figure_filter_seconds, figure_build_seconds,
+    figure_serialize_seconds, figure_bytes, query_requests, query_seconds, export_jobs, export_seconds,
+]
+
+_phase = threading.local()
+
+
+def start_figure():
+    """Start timing a figure build on this thread"""
+    _phase.filtered_at = None
+    return time.perf_counter()
+
+
+def mark_filtered():
+    """Called by a figure callback once its data is selected; splits filter from build time"""
+    _phase.filtered_at = time.perf_counter()
+
+
+def observe_figure(callback, hit, payload, started=None, built=None, serialized=None):
+    """Record one memoized figure lookup (timings are only passed on a miss)"""
+    figure_cache_requests.inc(callback, 'hit' if hit else 'miss')
+    if hit or not sampled():
+        return
+    filtered = getattr(_phase, 'filtered_at', None)
+    if filtered is not None and started <= filtered <= built:
+        figure_filter_seconds.observe(filtered - started, callback)
+        figure_build_seconds.observe(built - filtered, callback)
+    else:
+        figure_build_seconds.observe(built - started, callback)
+    figure_serialize_seconds.observe(serialized - built, callback)
+    figure_bytes.observe(len(payload), callback)
+
+
+def render(gauges=()):
+    """Prometheus text exposition of every metric plus (name, help, value) gauges"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for name, documentation, value in gauges:
+        lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {value:g}"])
+    return '\n'.join(lines) + '\n'
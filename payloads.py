@@ -0,0 +1,205 @@
+"""
+Compact figure payloads and compressed responses.
+
+Every figure is styled with a registered Plotly template (plotly_white, or
+plotly for the message figures), and that template is ~6 KB of JSON - more
+than most of the figures themselves. With MLB_STRIP_TEMPLATES on (default),
+figure_json() sends the template's name instead; the templates go to the
+browser once, inlined in the index page by template_script(), and
+assets/figure_templates.js swaps the name back for the template before
+Plotly draws the figure.
+
+Figures are serialized with orjson when it is installed (MLB_JSON_ENGINE,
+default 'auto', passed per call), with NumPy arrays as base64 typed arrays
+rather than lists of numbers. figure_json() writes the same JSON as
+pio.to_json(), but encodes the arrays straight from the figure's own dicts;
+BaseFigure.to_dict() deep-copies the figure (template included) and runs
+every array through narwhals first, which is most of the serialization time.
+That fast path uses plotly internals (the _plotly_utils helpers and the
+figure's _data/_layout), which is why requirements.txt caps plotly at the
+tested minor release; if they are missing on another version, figures are
+serialized through fig.to_dict() instead.
+
+A figure cache hit is answered with the stored JSON as the response body,
+instead of Dash decoding it and encoding it again
+(MLB_CACHED_FIGURE_PASSTHROUGH=0 to turn off).
+
+compress() gzip- or, when the brotli module is installed, brotli-encodes
+JSON and HTML responses of at least MLB_COMPRESS_MIN_BYTES for clients that
+accept it (MLB_COMPRESS_RESPONSES=0 to turn off).
+"""
+import base64
+import gzip
+import json
+import os
+
+import numpy as np
+import plotly
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+
+try:
+    from _plotly_utils.utils import is_homogeneous_array, is_skipped_key, plotlyjsShortTypes, to_typed_array_spec
+except ImportError:  # pragma: no cover - plotly internals moved; figures go through fig.to_dict()
+    to_typed_array_spec = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+STRIP_TEMPLATES = os.environ.get('MLB_STRIP_TEMPLATES', '1') != '0'
+CACHED_FIGURE_PASSTHROUGH = os.environ.get('MLB_CACHED_FIGURE_PASSTHROUGH', '1') != '0'
+COMPRESS_RESPONSES = os.environ.get('MLB_COMPRESS_RESPONSES', '1') != '0'
+COMPRESS_MIN_BYTES = int(os.environ.get('MLB_COMPRESS_MIN_BYTES', 1024))
+COMPRESS_LEVEL = int(os.environ.get('MLB_COMPRESS_LEVEL', 6))
+
+# 'auto' uses orjson when it is installed; 'json' forces the stdlib encoder
+JSON_ENGINE = os.environ.get('MLB_JSON_ENGINE', 'auto')
+
+# Templates sent by name; every figure of the dashboard uses one of them
+SHARED_TEMPLATES = ('plotly_white', 'plotly')
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html'}
+
+# Dash's JSON response for a callback is _PREFIX + '"<id>":{"<prop>":<value>}' + _SUFFIX
+_PREFIX = b'{"multi":true,"response":{'
+_SUFFIX = b'}}'
+
+_templates = {}
+
+
+def shared_templates():
+    """{name: template JSON} of the templates sent by name"""
+    if not _templates:
+        _templates.update((name, pio.templates[name].to_plotly_json()) for name in SHARED_TEMPLATES)
+    return _templates
+
+
+def figure_template(name):
+    """What a figure built in the browser should set layout.template to"""
+    return name if STRIP_TEMPLATES else shared_templates()[name]
+
+
+def typed_array(array):
+    """array as a plotly.js typed array spec, like _plotly_utils.utils.to_typed_array_spec"""
+    if array.size == 0 or array.dtype.kind not in 'iuf':
+        return to_typed_array_spec(array)
+    # 64-bit integers are narrowed to the smallest type that holds them, as Plotly does
+    if array.dtype in (np.int64, np.uint64):
+        lo, hi = array.min(), array.max()
+        for dtype in ((np.int8, np.int16, np.int32) if array.dtype == np.int64 else (np.uint8, np.uint16, np.uint32)):
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                array = array.astype(dtype)
+                break
+        else:
+            return array
+    short = plotlyjsShortTypes.get(str(array.dtype))
+    if short is None:
+        return to_typed_array_spec(array)
+    spec = {'dtype': short, 'bdata': base64.b64encode(np.ascontiguousarray(array)).decode('ascii')}
+    if array.ndim > 1:
+        spec['shape'] = str(array.shape)[1:-1]
+    return spec
+
+
+def _encode_arrays(value):
+    """Copy of value with its arrays as typed array specs (the conversion BaseFigure.to_dict() applies)"""
+    if isinstance(value, dict):
+        return {key: item if is_skipped_key(key) else _encode_arrays(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_arrays(item) for item in value]
+    if isinstance(value, (str, int, float)) or value is None:
+        return value
+    if isinstance(value, np.ndarray):
+        return typed_array(value)
+    return to_typed_array_spec(value) if is_homogeneous_array(value) else value
+
+
+# Cleared the first time the fast path fails, so a plotly upgrade costs speed, not figures
+_fast_path = [to_typed_array_spec is not None]
+
+
+def _named_template(layout):
+    """layout (a dict) with a shared template replaced by its name"""
+    template = layout.get('template')
+    for name, shared in shared_templates().items() if STRIP_TEMPLATES else ():
+        if template == shared:
+            return {**layout, 'template': name}
+    return layout
+
+
+def _fast_figure_dict(fig):
+    """What fig.to_dict() returns, encoded straight from the figure's own dicts (plotly internals)"""
+    figure = {'data': _encode_arrays(fig._data), 'layout': _encode_arrays(_named_template(dict(fig._layout)))}
+    frames = [frame._props for frame in fig._frame_objs]
+    if frames:
+        figure['frames'] = _encode_arrays(frames)
+    return figure
+
+
+def figure_json(fig):
+    """Serialize fig, with a shared template replaced by its name"""
+    figure = None
+    if _fast_path[0]:
+        try:
+            figure = _fast_figure_dict(fig)
+        except AttributeError as e:
+            print(f"Note: fast figure serialization unavailable on plotly {plotly.__version__} ({e!r}); "
+                  f"using fig.to_dict()")
+            _fast_path[0] = False
+    if figure is None:
+        figure = fig.to_dict()
+        figure['layout'] = _named_template(figure.get('layout', {}))
+    return to_json_plotly(figure, engine=JSON_ENGINE)
+
+
+def template_script():
+    """<script> defining window.mlbFigureTemplates, for the index page"""
+    if not STRIP_TEMPLATES:
+        return ''
+    templates = json.dumps(shared_templates(), separators=(',', ':')).replace('</', '<\\/')
+    return f'<script>window.mlbFigureTemplates = {templates};</script>'
+
+
+def response_body(output, figure_json):
+    """Body of the Dash response setting output to the serialized figure"""
+    component, prop = output.rsplit('.', 1)
+    return (_PREFIX + json.dumps(component).encode() + b':{' + json.dumps(prop).encode() + b':'
+            + figure_json.encode() + b'}' + _SUFFIX)
+
+
+def response_parts(body):
+    """The '"<id>":{"<prop>":<value>}' part of a response body, for splicing"""
+    return body[len(_PREFIX):-len(_SUFFIX)]
+
+
+def join_response_parts(parts):
+    """A multi-output response body from the parts of single-output ones"""
+    return _PREFIX + b','.join(parts) + _SUFFIX
+
+
+def encode(data, accept_encodings):
+    """(encoded bytes, Content-Encoding) for the best encoding the client accepts, or (data, None)"""
+    if brotli is not None and accept_encodings['br']:
+        return brotli.compress(data, quality=min(COMPRESS_LEVEL, 11)), 'br'
+    if accept_encodings['gzip']:
+        return gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0), 'gzip'
+    return data, None
+
+
+def compress(response, accept_encodings):
+    """Encode a JSON or HTML response in place if the client accepts it and it is worth it"""
+    if (not COMPRESS_RESPONSES or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    data, encoding = encode(data, accept_encodings)
+    if encoding is not None:
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,89 @@
+"""
+On-disk columnar cache of the prepared attendance frame.
+
+load_and_prepare_data() spends most of its time parsing CSVs, normalizing
+team names and joining the World Series markers. The result only depends on
+the source files, so it is written once to an uncompressed Feather (Arrow
+IPC) file named after a content hash of those files. Later starts, including
+every gunicorn worker, memory-map that file instead of redoing the work.
+
+pyarrow is optional: without it the cache is silently disabled.
+"""
+import hashlib
+import os
+
+CACHE_DIR = os.environ.get('MLB_CACHE_DIR', 'cache')
+
+# Set MLB_PREPARED_CACHE=0 to always rebuild from the CSVs
+CACHE_ENABLED = os.environ.get('MLB_PREPARED_CACHE', '1') != '0'
+
+# Bump whenever load_and_prepare_data changes what it produces
+CACHE_FORMAT_VERSION = 2
+
+try:
+    from pyarrow import feather
+except ImportError:  # pragma: no cover - optional dependency
+    feather = None
+
+
+def source_fingerprint(paths):
+    """Hash the contents of the source files (and the cache format version)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{CACHE_FORMAT_VERSION}".encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(fingerprint):
+    """Location of the cached frame for a fingerprint"""
+    return os.path.join(CACHE_DIR, f"prepared-{fingerprint}.feather")
+
+
+def read_prepared(fingerprint):
+    """Memory-map the cached frame for fingerprint, or return None if absent"""
+    if not CACHE_ENABLED or feather is None:
+        return None
+    path = cache_path(fingerprint)
+    if not os.path.exists(path):
+        return None
+    try:
+        return feather.read_feather(path, memory_map=True)
+    except Exception as e:
+        print(f"Note: ignoring unreadable prepared-data cache {path}: {e}")
+        return None
+
+
+def write_prepared(df, fingerprint):
+    """Write df to the cache atomically; returns the path or None"""
+    if not CACHE_ENABLED or feather is None:
+        return None
+    path = cache_path(fingerprint)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+        return path
+    except Exception as e:
+        print(f"Note: prepared-data cache not written: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+
+
+def load_or_prepare(paths, prepare):
+    """Return the prepared frame for paths, building it with prepare() on a miss"""
+    fingerprint = source_fingerprint(paths) if CACHE_ENABLED and feather is not None else None
+    if fingerprint is not None:
+        df = read_prepared(fingerprint)
+        if df is not None:
+            print(f"✓ Loaded prepared data from {cache_path(fingerprint)} ({len(df)} records)")
+            return df
+    df = prepare()
+    if fingerprint is not None:
+        write_prepared(df, fingerprint)
+    return df
@@ -0,0 +1,472 @@
+"""
+Read-only query API over the prepared attendance frame.
+
+POST /api/query with a JSON query such as
+
+    {"filters": [{"column": "Season", "op": "between", "value": [2010, 2019]},
+                 {"column": "ws_champion", "op": "==", "value": true}],
+     "group_by": ["team"],
+     "aggregates": [{"column": "attendance", "func": "mean", "as": "avg_attendance"},
+                    {"func": "count", "as": "titles"}],
+     "order_by": [{"column": "avg_attendance", "desc": true}],
+     "limit": 10}
+
+answers {"columns": [...], "rows": [[...], ...]}. Without aggregates the
+filtered rows themselves are returned (the "columns" listed in the query, or
+all of them). Column names are checked against the frame, filter values
+against the column types, and values are always bound as parameters, never
+spliced into SQL.
+
+Queries run on DuckDB when it is installed, scanning the in-memory frame in
+place; otherwise (or with MLB_QUERY_ENGINE=pandas) on an equivalent
+vectorized pandas plan. Queries that only filter and group on team, Season
+and the World Series flags, and do not ask for a median, skip the scan:
+they are answered from per team-season statistics computed at load time
+(CellRollup; MLB_QUERY_ROLLUP=0 to turn off). Results are cached as JSON keyed on the normalized
+query and the dataset version (MLB_QUERY_CACHE_SIZE entries).
+"""
+import copy
+import json
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - optional dependency
+    duckdb = None
+
+QUERY_ENGINE = os.environ.get('MLB_QUERY_ENGINE', 'duckdb' if duckdb is not None else 'pandas')
+QUERY_CACHE_SIZE = int(os.environ.get('MLB_QUERY_CACHE_SIZE', 256))
+MAX_ROWS = int(os.environ.get('MLB_QUERY_MAX_ROWS', 10000))
+QUERY_ROLLUP = os.environ.get('MLB_QUERY_ROLLUP', '1') != '0'
+
+# Columns the rollup cells are keyed on: one cell per team-season (and World Series flags)
+DIMENSIONS = ['team', 'Season', 'ws_champion', 'ws_finalist']
+
+# Filter operators: JSON name -> SQL operator
+OPERATORS = {'==': '=', '!=': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>=', 'in': 'IN', 'between': 'BETWEEN'}
+
+# Aggregate functions: JSON name -> DuckDB function (sample standard deviation, as pandas)
+FUNCTIONS = {'count': 'count', 'sum': 'sum', 'mean': 'avg', 'median': 'median', 'min': 'min', 'max': 'max',
+             'std': 'stddev_samp'}
+
+
+class QueryError(ValueError):
+    """An invalid query; reported to the client as a 400"""
+
+
+def _column(name, columns, what):
+    if not isinstance(name, str) or name not in columns:
+        raise QueryError(f"Unknown {what} column: {name!r}")
+    return name
+
+
+def _check_value(value, column, dtype):
+    """Raise QueryError unless value is of the column's type (bool, number or string)"""
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        kind, ok = 'true or false', isinstance(value, bool)
+    elif pd.api.types.is_numeric_dtype(dtype):
+        kind, ok = 'a number', isinstance(value, (int, float)) and not isinstance(value, bool)
+    else:
+        kind, ok = 'a string', isinstance(value, str)
+    if not ok:
+        raise QueryError(f"Filter values for {column!r} must be {kind}, not {json.dumps(value, default=str)}")
+
+
+def normalize(query, columns):
+    """Validated query with defaults filled in; raises QueryError
+
+    columns maps each column name of the frame to its dtype, which filter
+    values are checked against, so a mismatched value is the same 400 on
+    every engine.
+    """
+    if not isinstance(query, dict):
+        raise QueryError("The query must be a JSON object")
+    unknown = set(query) - {'filters', 'group_by', 'aggregates', 'columns', 'order_by', 'limit'}
+    if unknown:
+        raise QueryError(f"Unknown query keys: {', '.join(sorted(unknown))}")
+
+    filters = []
+    for spec in query.get('filters') or []:
+        if not isinstance(spec, dict):
+            raise QueryError("Each filter must be an object with column, op and value")
+        op = spec.get('op', '==')
+        if op not in OPERATORS:
+            raise QueryError(f"Unknown filter op: {op!r} (use one of {', '.join(OPERATORS)})")
+        value = spec.get('value')
+        if op == 'in' and not (isinstance(value, list) and value):
+            raise QueryError("'in' needs a non-empty list value")
+        if op == 'between' and not (isinstance(value, list) and len(value) == 2):
+            raise QueryError("'between' needs a [low, high] value")
+        if op not in ('in', 'between') and (value is None or isinstance(value, (list, dict))):
+            raise QueryError(f"{op!r} needs a single non-null value")
+        column = _column(spec.get('column'), columns, 'filter')
+        for item in value if op in ('in', 'between') else [value]:
+            _check_value(item, column, columns[column])
+        filters.append({'column': column, 'op': op, 'value': value})
+
+    group_by = [_column(col, columns, 'group_by') for col in query.get('group_by') or []]
+    aggregates = []
+    for spec in query.get('aggregates') or ([{'func': 'count'}] if group_by else []):
+        if not isinstance(spec, dict) or spec.get('func') not in FUNCTIONS:
+            raise QueryError(f"Each aggregate needs a func, one of {', '.join(FUNCTIONS)}")
+        func = spec['func']
+        column = spec.get('column')
+        if column is not None or func != 'count':
+            column = _column(column, columns, 'aggregate')
+        alias = spec.get('as') or (f"{func}_{column}" if column else func)
+        aggregates.append({'func': func, 'column': column, 'as': str(alias)})
+
+    if aggregates:
+        output = group_by + [spec['as'] for spec in aggregates]
+        select = []
+    else:
+        select = [_column(col, columns, 'select') for col in query.get('columns') or list(columns)]
+        output = select
+    if len(set(output)) != len(output):
+        raise QueryError("Output column names must be unique")
+
+    order_by = []
+    for spec in query.get('order_by') or []:
+        spec = {'column': spec} if isinstance(spec, str) else spec
+        if not isinstance(spec, dict):
+            raise QueryError("Each order_by entry must be a column name or {column, desc}")
+        order_by.append({'column': _column(spec.get('column'), output, 'order_by'), 'desc': bool(spec.get('desc'))})
+
+    limit = query.get('limit', MAX_ROWS)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        raise QueryError("limit must be a non-negative integer")
+    return {'filters': filters, 'group_by': group_by, 'aggregates': aggregates, 'columns': select,
+            'order_by': order_by, 'limit': min(limit, MAX_ROWS)}
+
+
+def _json_value(value):
+    """A result cell as a JSON value (NaN as null, NumPy scalars as Python ones)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _compare(values, op, value):
+    """Boolean array of values op value; comparisons with null are false, as in SQL"""
+    if op == 'in':
+        return np.asarray(pd.Series(values).isin(value))
+    if op == 'between':
+        return np.asarray((values >= value[0]) & (values <= value[1]))
+    mask = np.asarray({'==': values.__eq__, '!=': values.__ne__, '<': values.__lt__, '<=': values.__le__,
+                       '>': values.__gt__, '>=': values.__ge__}[op](value))
+    return mask & np.asarray(pd.notna(values)) if op == '!=' else mask
+
+
+def _filter_mask(df, filters):
+    """Boolean array of the rows of df passing every filter, or None without filters"""
+    mask = None
+    for spec in filters:
+        values = df[spec['column']]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Evaluated once per category (by value, as DuckDB does), then spread over the rows by code
+            codes = values.cat.codes.to_numpy()
+            matches = _compare(values.cat.categories.to_numpy(), spec['op'], spec['value'])
+            matches = np.append(matches, False)[codes]
+        else:
+            matches = _compare(values, spec['op'], spec['value'])
+        mask = matches if mask is None else mask & matches
+    return mask
+
+
+def _result_rows(result, query):
+    """(columns, rows) of a result frame, ordered and limited as the query asks"""
+    if query['order_by']:
+        result = result.sort_values([spec['column'] for spec in query['order_by']],
+                                    ascending=[not spec['desc'] for spec in query['order_by']],
+                                    kind='stable', na_position='last')
+    result = result.head(query['limit'])
+    columns = list(result.columns)
+    rows = [[_json_value(value) for value in row]
+            for row in zip(*(result[col].astype(object).tolist() for col in columns))] if len(result) else []
+    return columns, rows
+
+
+class PandasEngine:
+    """Vectorized pandas plan for a normalized query"""
+
+    name = 'pandas'
+
+    def __init__(self, df):
+        self.df = df
+
+    @staticmethod
+    def _aggregate(values, spec):
+        """One aggregate over a frame (a scalar) or a groupby (a Series per group)"""
+        if spec['column'] is None:
+            return len(values) if isinstance(values, pd.DataFrame) else values.size()
+        column = values[spec['column']]
+        if spec['func'] == 'sum':
+            return column.sum(min_count=1)  # null when there is nothing to sum, as in SQL
+        return getattr(column, spec['func'])()
+
+    def run(self, query):
+        """(columns, rows) for a normalized query"""
+        needed = {spec['column'] for spec in query['aggregates'] if spec['column']}
+        needed.update(query['group_by'], query['columns'])
+        mask = _filter_mask(self.df, query['filters'])
+        frame = self.df[[col for col in self.df.columns if col in needed]]
+        if mask is not None:
+            frame = frame[mask]
+
+        if not query['aggregates']:
+            return _result_rows(frame[query['columns']], query)
+        # Aggregated in float64, as DuckDB does: float32 sums would round
+        values = frame.astype({col: 'float64' for col in needed - set(query['group_by'])
+                               if frame[col].dtype.kind == 'f'})
+        if query['group_by']:
+            grouped = values.groupby(query['group_by'], sort=True, observed=True, dropna=False)
+            result = pd.DataFrame({spec['as']: self._aggregate(grouped, spec) for spec in query['aggregates']})
+            result = result.reset_index()
+        else:
+            result = pd.DataFrame({spec['as']: [self._aggregate(values, spec)] for spec in query['aggregates']})
+        return _result_rows(result, query)
+
+
+class CellRollup:
+    """Count, sum, sum of squared deviations, min and max of the metrics per cell.
+
+    A cell is one combination of the DIMENSIONS columns. Every aggregate but
+    the median over a set of cells follows from those statistics, so a query
+    that only filters and groups on dimensions is answered from the cells
+    instead of a scan of the frame. Cells of disjoint row sets merge exactly
+    (squared deviations by the parallel variance update), which is how
+    append() folds in new rows and run() rolls cells up into groups.
+    """
+
+    name = 'rollup'
+
+    def __init__(self, df):
+        self.dimensions = [col for col in DIMENSIONS if col in df]
+        # Float columns only: integer sums stay integers on the backends
+        self.metrics = [col for col in df.columns if col not in self.dimensions and df[col].dtype.kind == 'f']
+        self.cells = self._cells(df)
+
+    def _cells(self, df):
+        # Cell of every row from the dimension codes; the key space is small, so no hash table is needed
+        factorized = [pd.factorize(df[col], use_na_sentinel=False) for col in self.dimensions]
+        shape = tuple(max(len(uniques), 1) for _, uniques in factorized)
+        flat = np.ravel_multi_index([codes for codes, _ in factorized], shape) if len(df) else np.zeros(0, np.intp)
+        rows = np.bincount(flat, minlength=math.prod(shape))
+        present = np.flatnonzero(rows)
+        ids = np.full(len(rows), -1, dtype=np.intp)
+        ids[present] = np.arange(len(present))
+        ids, n_cells = ids[flat], len(present)
+
+        cells = {col: uniques.take(positions) for (_, uniques), col, positions
+                 in zip(factorized, self.dimensions, np.unravel_index(present, shape))}
+        cells['rows'] = rows[present]
+        for col in self.metrics:
+            x = df[col].to_numpy(dtype='float64', na_value=np.nan)
+            valid = ~np.isnan(x)
+            x, at = x[valid], ids[valid]
+            n = np.bincount(at, minlength=n_cells)
+            total = np.bincount(at, x, minlength=n_cells)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = total / n
+            cells[f'{col}_n'] = n
+            cells[f'{col}_sum'] = total
+            cells[f'{col}_m2'] = np.bincount(at, (x - mean[at]) ** 2, minlength=n_cells)
+            for stat, reduce in (('min', np.fmin), ('max', np.fmax)):
+                cells[f'{col}_{stat}'] = np.full(n_cells, np.nan)
+                reduce.at(cells[f'{col}_{stat}'], at, x)
+        return pd.DataFrame(cells)
+
+    def _combine(self, cells, keys, metrics):
+        """One cell per group of cells by keys (a single one without keys), with the given metrics"""
+        if keys:
+            grouped = cells.groupby(keys, sort=True, observed=True, dropna=False)
+            ids, n_groups = grouped.ngroup().to_numpy(), grouped.ngroups
+            combined = dict(grouped.size().index.to_frame(index=False).items())
+        else:
+            ids, n_groups = np.zeros(len(cells), dtype=np.intp), 1
+            combined = {}
+        combined['rows'] = np.bincount(ids, cells['rows'].to_numpy(), n_groups).astype('int64')
+        for col in metrics:
+            n, total = cells[f'{col}_n'].to_numpy(), cells[f'{col}_sum'].to_numpy()
+            group_n, group_total = np.bincount(ids, n, n_groups), np.bincount(ids, total, n_groups)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shift = np.where(n > 0, total / n - (group_total / group_n)[ids], 0.0)
+            combined[f'{col}_n'] = group_n.astype('int64')
+            combined[f'{col}_sum'] = group_total
+            combined[f'{col}_m2'] = np.bincount(ids, cells[f'{col}_m2'].to_numpy() + n * shift ** 2, n_groups)
+            for stat, reduce in (('min', np.fmin), ('max', np.fmax)):
+                combined[f'{col}_{stat}'] = np.full(n_groups, np.nan)
+                reduce.at(combined[f'{col}_{stat}'], ids, cells[f'{col}_{stat}'].to_numpy())
+        return pd.DataFrame(combined)
+
+    def append(self, df, start):
+        """Fold in the rows of df from start on (df's dimension dtypes win, e.g. grown team categories)"""
+        cells = self.cells.astype({col: df[col].dtype for col in self.dimensions})
+        rows = self._cells(df.iloc[start:])
+        self.cells = self._combine(pd.concat([cells, rows], ignore_index=True), self.dimensions, self.metrics)
+
+    def covers(self, query):
+        """Whether run() can answer the normalized query"""
+        dimensions = set(self.dimensions)
+        return (bool(query['aggregates'])
+                and dimensions.issuperset(spec['column'] for spec in query['filters'])
+                and dimensions.issuperset(query['group_by'])
+                and all(spec['column'] is None or (spec['func'] != 'median' and spec['column'] in self.metrics)
+                        for spec in query['aggregates']))
+
+    @staticmethod
+    def _aggregate(combined, spec):
+        if spec['column'] is None:
+            return combined['rows']
+        col, func = spec['column'], spec['func']
+        n = combined[f'{col}_n']
+        if func == 'count':
+            return n
+        if func in ('min', 'max'):
+            return combined[f'{col}_{func}']
+        if func == 'std':
+            return np.sqrt(combined[f'{col}_m2'] / (n - 1)).where(n > 1)
+        total = combined[f'{col}_sum'].where(n > 0)
+        return total if func == 'sum' else total / n
+
+    def run(self, query):
+        """(columns, rows) for a normalized query it covers"""
+        cells = self.cells
+        mask = _filter_mask(cells, query['filters'])
+        if mask is not None:
+            cells = cells[mask]
+        metrics = list(dict.fromkeys(spec['column'] for spec in query['aggregates'] if spec['column']))
+        combined = self._combine(cells, query['group_by'], metrics)
+        result = pd.DataFrame({**{col: combined[col] for col in query['group_by']},
+                               **{spec['as']: self._aggregate(combined, spec) for spec in query['aggregates']}})
+        return _result_rows(result, query)
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class DuckDBEngine:
+    """The query as parameterized SQL over the frame, registered in an in-memory DuckDB"""
+
+    name = 'duckdb'
+
+    def __init__(self, df):
+        self.df = df
+        self._con = duckdb.connect()
+        self._con.register('attendance', df)
+        self._lock = threading.Lock()
+
+    def sql(self, query):
+        """(SQL, parameters) for a normalized query"""
+        params = []
+        where = []
+        for spec in query['filters']:
+            column, op, value = _quote(spec['column']), spec['op'], spec['value']
+            if op == 'in':
+                where.append(f"{column} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            elif op == 'between':
+                where.append(f"{column} BETWEEN ? AND ?")
+                params.extend(value)
+            else:
+                where.append(f"{column} {OPERATORS[op]} ?")
+                params.append(value)
+        group_by = [_quote(col) for col in query['group_by']]
+        if query['aggregates']:
+            select = group_by + [
+                f"{FUNCTIONS[spec['func']]}({_quote(spec['column']) if spec['column'] else '*'}) AS {_quote(spec['as'])}"
+                for spec in query['aggregates']]
+        else:
+            select = [_quote(col) for col in query['columns']]
+        sql = f"SELECT {', '.join(select)} FROM attendance"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        if group_by:
+            sql += f" GROUP BY {', '.join(group_by)}"
+        order_by = [f"{_quote(spec['column'])} {'DESC' if spec['desc'] else 'ASC'} NULLS LAST"
+                    for spec in query['order_by']]
+        if group_by and query['aggregates']:
+            # Groups come back in key order unless ordered otherwise, as with pandas
+            order_by += [f"{col} ASC NULLS LAST" for col in group_by]
+        if order_by:
+            sql += f" ORDER BY {', '.join(order_by)}"
+        return sql + f" LIMIT {int(query['limit'])}", params
+
+    def run(self, query):
+        """(columns, rows) for a normalized query"""
+        sql, params = self.sql(query)
+        with self._lock:
+            cursor = self._con.execute(sql, params)
+            columns = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+        return columns, [[_json_value(value) for value in row] for row in rows]
+
+
+class QueryEngine:
+    """A DuckDB or pandas backend, behind the cell rollup for the queries it covers"""
+
+    def __init__(self, df, engine=None, rollup=None):
+        self.engine = engine or QUERY_ENGINE
+        self.use_rollup = QUERY_ROLLUP if rollup is None else rollup
+        self.df = df
+        self.backend = self._backend(df)
+        self.name = self.backend.name
+        self.rollup = CellRollup(df) if self.use_rollup and len(df) else None
+
+    def _backend(self, df):
+        if self.engine == 'duckdb' and duckdb is not None and len(df):
+            return DuckDBEngine(df)
+        return PandasEngine(df)
+
+    def append(self, df, start):
+        """Switch to df, whose rows from start on are new; the rollup only visits those"""
+        self.df = df
+        self.backend = self._backend(df)
+        self.name = self.backend.name
+        if self.rollup is not None:
+            rollup = copy.copy(self.rollup)
+            rollup.append(df, start)
+            self.rollup = rollup
+        elif self.use_rollup and len(df):
+            self.rollup = CellRollup(df)
+
+    def run(self, query):
+        """(columns, rows, name of the engine that answered) for a normalized query"""
+        engine = self.rollup if self.rollup is not None and self.rollup.covers(query) else self.backend
+        return (*engine.run(query), engine.name)
+
+
+def make_engine(df, engine=None):
+    """Query engine over df: DuckDB when installed (and not overridden), else pandas"""
+    return QueryEngine(df, engine)
+
+
+def run_query(engine, query, cache, version):
+    """(JSON result, cache hit) for a raw query; raises QueryError"""
+    query = normalize(query, engine.df.dtypes.to_dict())
+    key = (json.dumps(query, sort_keys=True, default=str), version)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload, True
+    try:
+        columns, rows, answered_by = engine.run(query)
+    except (TypeError, ValueError) as e:
+        raise QueryError(f"Cannot run the query: {e}") from e
+    except Exception as e:
+        if duckdb is not None and isinstance(e, duckdb.Error):
+            raise QueryError(f"Cannot run the query: {e}") from e
+        raise
+    payload = json.dumps({'columns': columns, 'rows': rows, 'engine': answered_by, 'dataset_version': version},
+                         default=str)
+    cache.put(key, payload)
+    return payload, False
@@ -0,0 +1,114 @@
+"""
+Batched payroll -> attendance OLS fits.
+
+Closed-form slope, intercept and Pearson r for every team are computed at
+load time from grouped sums (one np.bincount per moment over the team codes),
+together with the league-wide fit. Callbacks read the fitted lines instead of
+running statsmodels (px trendline='ols') or scipy.stats.linregress per request.
+Moments are additive, so append() folds in new rows without a refit from
+scratch.
+"""
+import numpy as np
+import pandas as pd
+
+MOMENT_COLUMNS = ['n', 'sum_x', 'sum_y', 'sum_xx', 'sum_yy', 'sum_xy']
+
+# Rows plotted in the per-team Attendance vs Payroll scatter
+TEAM_FIT_COLUMNS = ['Est. Payroll', 'attendance', 'Attend/G']
+
+# Rows plotted in the league-wide Payroll Correlation scatter
+GLOBAL_FIT_COLUMNS = ['Est. Payroll', 'attendance']
+
+
+def group_moments(x, y, codes, labels):
+    """Sums of x, y, x², y², xy plus the x range for each group code"""
+    n_groups = len(labels)
+    x_min = np.full(n_groups, np.inf)
+    x_max = np.full(n_groups, -np.inf)
+    np.minimum.at(x_min, codes, x)
+    np.maximum.at(x_max, codes, x)
+    return pd.DataFrame({
+        'n': np.bincount(codes, minlength=n_groups),
+        'sum_x': np.bincount(codes, weights=x, minlength=n_groups),
+        'sum_y': np.bincount(codes, weights=y, minlength=n_groups),
+        'sum_xx': np.bincount(codes, weights=x * x, minlength=n_groups),
+        'sum_yy': np.bincount(codes, weights=y * y, minlength=n_groups),
+        'sum_xy': np.bincount(codes, weights=x * y, minlength=n_groups),
+        'x_min': x_min,
+        'x_max': x_max,
+    }, index=pd.Index(labels, name='team'))
+
+
+def frame_moments(df, columns, by_team):
+    """Moments of (payroll, attendance) over rows with all of columns present"""
+    complete = df[['team'] + columns].dropna(subset=columns + (['team'] if by_team else []))
+    x = complete['Est. Payroll'].to_numpy(dtype='float64')
+    y = complete['attendance'].to_numpy(dtype='float64')
+    if by_team:
+        codes, labels = pd.factorize(complete['team'], sort=True)
+    else:
+        codes, labels = np.zeros(len(complete), dtype='intp'), ['__all__']
+    return group_moments(x, y, codes, list(labels))
+
+
+def merge_moments(old, new):
+    """Combine the moments of two disjoint row sets"""
+    combined = old[MOMENT_COLUMNS].add(new[MOMENT_COLUMNS], fill_value=0)
+    combined['x_min'] = pd.concat([old['x_min'], new['x_min']], axis=1).min(axis=1)
+    combined['x_max'] = pd.concat([old['x_max'], new['x_max']], axis=1).max(axis=1)
+    return combined.sort_index()
+
+
+def linear_fit(moments):
+    """Closed-form OLS slope, intercept and Pearson r for every row of moments"""
+    n = moments['n']
+    sx, sy = moments['sum_x'], moments['sum_y']
+    sxx = n * moments['sum_xx'] - sx * sx
+    syy = n * moments['sum_yy'] - sy * sy
+    sxy = n * moments['sum_xy'] - sx * sy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx
+        fits = pd.DataFrame({
+            'n': n,
+            'slope': slope,
+            'intercept': (sy - slope * sx) / n,
+            'r': sxy / np.sqrt(sxx * syy),
+            'x_min': moments['x_min'],
+            'x_max': moments['x_max'],
+        })
+    return fits[fits['n'] >= 2]
+
+
+class Regressions:
+    """Per-team and league-wide payroll -> attendance fits for a prepared frame"""
+
+    def __init__(self, df):
+        self.team_moments = pd.DataFrame(columns=MOMENT_COLUMNS + ['x_min', 'x_max'])
+        self.global_moments = self.team_moments
+        if len(df) and 'team' in df:
+            self.team_moments = frame_moments(df, TEAM_FIT_COLUMNS, by_team=True)
+            self.global_moments = frame_moments(df, GLOBAL_FIT_COLUMNS, by_team=False)
+        self._refit()
+
+    def _refit(self):
+        self.team_fits = linear_fit(self.team_moments)
+        global_fits = linear_fit(self.global_moments)
+        self._global_fit = global_fits.iloc[0].to_dict() if len(global_fits) else None
+
+    def append(self, rows):
+        """Fold newly loaded rows into the fits"""
+        if not len(rows):
+            return
+        self.team_moments = merge_moments(self.team_moments, frame_moments(rows, TEAM_FIT_COLUMNS, True))
+        self.global_moments = merge_moments(self.global_moments, frame_moments(rows, GLOBAL_FIT_COLUMNS, False))
+        self._refit()
+
+    def team_fit(self, team):
+        """Fit for one team as a dict (slope, intercept, r, n, x_min, x_max), or None"""
+        if team not in self.team_fits.index:
+            return None
+        return self.team_fits.loc[team].to_dict()
+
+    def global_fit(self):
+        """League-wide fit as a dict, or None if there is not enough data"""
+        return self._global_fit
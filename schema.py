@@ -0,0 +1,64 @@
+"""
+Compact column schema of the prepared attendance frame.
+
+  - team: categorical over a stable code table (1 byte per row). Team lookups
+    compare small integer codes instead of strings, and a team keeps its
+    code for the life of the process: teams first seen in appended rows are
+    added at the end of the table.
+  - Season: int16
+  - ws_champion / ws_finalist: bool flags
+  - metric columns: float32 when every value survives the round trip
+    (attendance counts do; payrolls above 2**24 dollars do not and stay
+    float64)
+
+Sums over compact columns are taken in float64 (see aggregates.rollup).
+"""
+import numpy as np
+import pandas as pd
+
+SEASON_DTYPE = 'int16'
+FLAG_COLUMNS = ['ws_champion', 'ws_finalist']
+FLOAT_COLUMNS = ['attendance', 'Attend/G', 'Est. Payroll', 'efficiency']
+
+
+def team_categories(teams, base=None):
+    """Code table for teams: base's categories first (codes unchanged), new teams sorted after"""
+    known = list(base) if base is not None else []
+    seen = set(known)
+    return known + sorted({str(team) for team in teams if pd.notna(team)} - seen)
+
+
+def lossless_float32(values):
+    """values as float32 if no value changes, otherwise unchanged"""
+    if values.dtype != 'float64':
+        return values
+    narrow = values.to_numpy().astype('float32')
+    with np.errstate(invalid='ignore'):
+        exact = (narrow == values.to_numpy()) | np.isnan(narrow)
+    return pd.Series(narrow, index=values.index, name=values.name) if exact.all() else values
+
+
+def compact_frame(df):
+    """Convert a prepared frame to the compact schema in place and return it"""
+    if 'team' in df:
+        df['team'] = pd.Categorical(df['team'], categories=team_categories(df['team'].unique()))
+    if 'Season' in df and len(df):
+        info = np.iinfo(SEASON_DTYPE)
+        if info.min <= df['Season'].min() and df['Season'].max() <= info.max:
+            df['Season'] = df['Season'].astype(SEASON_DTYPE)
+    for col in FLAG_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype(bool)
+    for col in FLOAT_COLUMNS:
+        if col in df:
+            df[col] = lossless_float32(df[col])
+    return df
+
+
+def concat_compact(df, rows):
+    """Append compact rows to a compact frame, keeping team categorical"""
+    if isinstance(df['team'].dtype, pd.CategoricalDtype) and isinstance(rows['team'].dtype, pd.CategoricalDtype):
+        categories = team_categories(rows['team'].cat.categories, df['team'].cat.categories)
+        df = df.assign(team=df['team'].cat.set_categories(categories))
+        rows = rows.assign(team=rows['team'].cat.set_categories(categories))
+    return pd.concat([df, rows], ignore_index=True)
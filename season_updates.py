@@ -0,0 +1,146 @@
+"""
+Incremental season updates.
+
+New team-season rows (e.g. the 2026 season) are dropped as CSV files into
+UPDATES_DIR, by hand or through the POST /api/seasons endpoint. Every process
+polls the directory and folds the files it has not applied yet into its
+loaded dataset, so all workers pick up an update without a restart and
+without reparsing the base CSV. Files are applied in name order and stay in
+the directory, so a restarted process replays them on top of the base data.
+"""
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+# Directory of update CSVs; set MLB_UPDATES_DIR='' to disable the watcher
+UPDATES_DIR = os.environ.get('MLB_UPDATES_DIR', 'updates') or None
+
+# Seconds between directory scans; 0 only replays the files present at startup
+POLL_SECONDS = float(os.environ.get('MLB_UPDATES_POLL_SECONDS', 5))
+
+# POST /api/seasons requires "Authorization: Bearer <token>" and is off while this is unset
+UPDATE_TOKEN = os.environ.get('MLB_UPDATE_TOKEN') or None
+
+# Opt-in: accept updates without the token from 127.0.0.1/::1. Behind a reverse
+# proxy every request comes from there, so only enable it without one
+UPDATE_ALLOW_LOCAL = os.environ.get('MLB_UPDATE_ALLOW_LOCAL', '0') == '1'
+
+REQUIRED_COLUMNS = ['team', 'attendance', 'Attend/G', 'Est. Payroll', 'Season']
+
+
+def parse_rows(rows):
+    """Validate new team-season rows (records or a DataFrame) into the CSV schema"""
+    frame = rows.copy() if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    if frame.empty:
+        raise ValueError("No rows to append")
+    missing = [col for col in REQUIRED_COLUMNS if col not in frame]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    frame = frame[REQUIRED_COLUMNS]
+    season = pd.to_numeric(frame['Season'], errors='coerce')
+    if season.isna().any() or (season % 1 != 0).any():
+        raise ValueError("Season must be a whole number on every row")
+    frame['Season'] = season.astype('int64')
+    frame['team'] = frame['team'].astype(str).str.strip()
+    if frame['team'].isin(['', 'nan', 'None']).any():
+        raise ValueError("team must be set on every row")
+    return frame
+
+
+_last_stamp = 0
+_stamp_lock = threading.Lock()
+
+
+def _stamp():
+    """Nanosecond timestamp, strictly increasing within the process"""
+    global _last_stamp
+    with _stamp_lock:
+        _last_stamp = max(time.time_ns(), _last_stamp + 1)
+        return _last_stamp
+
+
+def stage_update(rows, directory=UPDATES_DIR):
+    """Write parsed rows under a temporary name; returns (temporary path, update file path)
+
+    Scans only pick up .csv files, so the rows are not seen by other
+    processes until the temporary file is renamed to the update path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    seasons = '-'.join(str(s) for s in sorted(rows['Season'].unique()))
+    # Files replay in name order: the zero-padded timestamp keeps that the order they were submitted in
+    name = f"{_stamp():020d}-{uuid.uuid4().hex[:8]}-seasons-{seasons}.csv"
+    path = os.path.join(directory, name)
+    rows.to_csv(path + '.tmp', index=False)
+    return path + '.tmp', path
+
+
+class UpdateWatcher:
+    """Applies every update file in a directory exactly once per process"""
+
+    def __init__(self, directory, apply, interval=POLL_SECONDS):
+        self.directory = directory
+        self.apply = apply
+        self.interval = interval
+        self.applied = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def pending(self):
+        """Names of update files not applied yet, in apply order"""
+        if self.directory is None:
+            return []
+        try:
+            names = os.listdir(self.directory)
+        except (FileNotFoundError, TypeError):
+            return []
+        return sorted(name for name in names if name.endswith('.csv') and name not in self.applied)
+
+    def poll(self):
+        """Apply the pending update files; returns how many were applied"""
+        applied = 0
+        with self._lock:
+            for name in self.pending():
+                self.applied.add(name)
+                try:
+                    self.apply(parse_rows(pd.read_csv(os.path.join(self.directory, name))))
+                    applied += 1
+                except Exception as e:
+                    print(f"Note: update {name} not applied: {e}")
+        return applied
+
+    def submit(self, rows):
+        """Apply parsed rows now and persist them for the other processes
+
+        The file only gets its .csv name once the rows were applied here, so
+        other processes never apply rows this one rejects.
+        """
+        with self._lock:
+            if not self.directory:
+                return self.apply(rows)
+            # Staged before applying, so rows applied here are never missing from disk
+            staged, path = stage_update(rows, self.directory)
+            try:
+                result = self.apply(rows)
+            except Exception:
+                os.remove(staged)
+                raise
+            self.applied.add(os.path.basename(path))
+            os.replace(staged, path)
+            return result
+
+    def start(self):
+        """Replay the files already present, then keep polling in the background"""
+        if self.directory is None:
+            return
+        self.poll()
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='season-updates', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
@@ -0,0 +1,116 @@
+"""
+Shared-memory deployment mode for multi-worker servers.
+
+The prepared frame is exported once, column by column, as .npy files in a
+shared-memory directory (by default under /dev/shm). Every worker then
+memory-maps those files read-only, so N workers share one physical copy of
+the data instead of holding N private ones. String columns are stored as
+categorical codes plus a small category list.
+
+Enable it by setting MLB_SHARED_DATA_DIR; gunicorn.conf.py does that and runs
+the export in the master before any worker starts:
+    gunicorn -c gunicorn.conf.py MLBAttendance:server
+"""
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = 'manifest.json'
+
+
+def shared_data_dir():
+    """Directory of the shared frame, or None when the mode is disabled"""
+    return os.environ.get('MLB_SHARED_DATA_DIR') or None
+
+
+def export_frame(df, directory):
+    """Write df as memory-mappable column files into directory (atomically)"""
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        entry = {'name': col, 'file': f"col{i}.npy"}
+        if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+            np.save(os.path.join(tmp_dir, entry['file']), values.to_numpy())
+        else:
+            cat = values.astype('category').array
+            entry['categories'] = [str(c) for c in cat.categories]
+            np.save(os.path.join(tmp_dir, entry['file']), cat.codes)
+        columns.append(entry)
+
+    with open(os.path.join(tmp_dir, MANIFEST), 'w') as fh:
+        json.dump({'rows': len(df), 'columns': columns}, fh)
+
+    old_dir = f"{directory}.{os.getpid()}.old"
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return directory
+
+
+def attach_frame(directory):
+    """Build a DataFrame over the memory-mapped columns in directory.
+
+    Numeric columns and categorical codes are read-only views of the shared
+    files; nothing is copied into the worker's private memory.
+    """
+    with open(os.path.join(directory, MANIFEST)) as fh:
+        manifest = json.load(fh)
+
+    data = {}
+    for entry in manifest['columns']:
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(values, entry['categories'], validate=False)
+        data[entry['name']] = values
+    df = pd.DataFrame(data, copy=False)
+    df.attrs['shared_memory'] = directory
+    return df
+
+
+def load_shared():
+    """Attach to the shared frame if the mode is enabled and it has been exported"""
+    directory = shared_data_dir()
+    if directory is None:
+        return None
+    if not os.path.exists(os.path.join(directory, MANIFEST)):
+        print(f"Note: shared data not found in {directory}, loading privately")
+        return None
+    df = attach_frame(directory)
+    print(f"✓ Attached shared data in {directory} ({len(df)} records)")
+    return df
+
+
+def main(argv):
+    """python -m shared_data export [DIRECTORY]"""
+    if len(argv) < 2 or argv[1] != 'export':
+        print(main.__doc__)
+        return 2
+    directory = argv[2] if len(argv) > 2 else shared_data_dir()
+    if directory is None:
+        print("Pass a directory or set MLB_SHARED_DATA_DIR")
+        return 2
+
+    # Build the frame from the sources, never from a previous export
+    os.environ['MLB_SHARED_DATA_DIR'] = ''
+    # Season update files are replayed by every worker on top of the export
+    os.environ['MLB_UPDATES_DIR'] = ''
+    import MLBAttendance
+    if MLBAttendance.df.empty:
+        print("No data loaded; nothing exported")
+        return 1
+    export_frame(MLBAttendance.df, directory)
+    print(f"✓ Exported shared data to {directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,222 @@
+"""
+Pre-rendered figure bundle for read-only deployments.
+
+Most views come from a small, finite input space: one team x metric x chart
+type, a season x top-N, one season, and the tab graphs without inputs.
+
+    python -m static_bundle build [DIRECTORY] [--workers N]
+
+renders every figure of that space in parallel worker processes and writes
+each one as the gzipped body of the Dash response that returns it. With
+MLB_STATIC_BUNDLE_DIR set, the app answers matching /_dash-update-component
+requests straight from those bytes, before Dash, pandas or Plotly get
+involved. Everything else (multi-team selections, zoom refinements,
+downsampled figures) falls through to the live callbacks.
+
+The bundle records a fingerprint of the source files it was rendered from
+and is only served while the app has exactly that data loaded: a changed
+CSV disables it at startup, an appended season from then on.
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+from multiprocessing import get_context
+
+from figure_cache import ErrorPayload
+from payloads import join_response_parts, response_body, response_parts
+
+STATIC_BUNDLE_DIR = os.environ.get('MLB_STATIC_BUNDLE_DIR') or None
+
+MANIFEST = 'manifest.json'
+
+# Bundled figure outputs -> the callback inputs each one depends on
+BUNDLED_OUTPUTS = {
+    'team-analysis-graph.figure': ['team-dropdown.value', 'metric-dropdown.value', 'chart-type.value'],
+    'attendance-payroll-graph.figure': ['team-dropdown.value'],
+    'top-teams-graph.figure': ['season-dropdown.value', 'top-teams-slider.value'],
+    'team-distribution-graph.figure': ['season-dropdown.value'],
+    'league-trends-graph.figure': [],
+    'attendance-distribution-graph.figure': ['seasons-multi-dropdown.value'],
+    'payroll-correlation-graph.figure': [],
+    'yoy-change-graph.figure': ['yoy-team-dropdown.value'],
+    'championship-impact-graph.figure': [],
+    'championships-by-team-graph.figure': [],
+}
+
+# Requests triggered by these are viewport-dependent refinements, never bundled
+LIVE_TRIGGERS = {'team-analysis-zoom.data'}
+
+
+def entry_key(output, values):
+    """Bundle key of output for callback inputs given as {'component.property': value}"""
+    return json.dumps([output] + [values.get(dep) for dep in BUNDLED_OUTPUTS[output]],
+                      separators=(',', ':'), default=lambda value: value.item())
+
+
+class StaticBundle:
+    """Gzipped Dash response bodies by bundle key"""
+
+    def __init__(self, fingerprint, bodies):
+        self.fingerprint = fingerprint
+        self.bodies = bodies
+
+    def __len__(self):
+        return len(self.bodies)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, MANIFEST)) as fh:
+            manifest = json.load(fh)
+        bodies = {}
+        for key, name in manifest['entries'].items():
+            with open(os.path.join(directory, name), 'rb') as fh:
+                bodies[key] = fh.read()
+        return cls(manifest['fingerprint'], bodies)
+
+    def lookup(self, body):
+        """Gzipped response for a /_dash-update-component request body, or None if not bundled"""
+        if not isinstance(body, dict) or LIVE_TRIGGERS.intersection(body.get('changedPropIds') or []):
+            return None
+        values = {f"{dep.get('id')}.{dep.get('property')}": dep.get('value')
+                  for dep in (body.get('inputs') or []) + (body.get('state') or []) if isinstance(dep, dict)}
+        outputs = body.get('outputs')
+        found = []
+        for output in outputs if isinstance(outputs, list) else [outputs]:
+            name = f"{output.get('id')}.{output.get('property')}" if isinstance(output, dict) else None
+            payload = self.bodies.get(entry_key(name, values)) if name in BUNDLED_OUTPUTS else None
+            if payload is None:
+                return None
+            found.append(payload)
+        if len(found) == 1:
+            return found[0]
+        # Multi-output callback: splice the single-output bodies together
+        parts = [response_parts(gzip.decompress(payload)) for payload in found]
+        return gzip.compress(join_response_parts(parts), compresslevel=6)
+
+
+def _options(layout, component_id):
+    """Option values of the component with component_id in layout"""
+    for component in layout._traverse():
+        if getattr(component, 'id', None) == component_id:
+            return [option['value'] if isinstance(option, dict) else option for option in component.options]
+    return []
+
+
+def _slider_values(layout, component_id):
+    for component in layout._traverse():
+        if getattr(component, 'id', None) == component_id:
+            return list(range(component.min, component.max + 1, component.step or 1))
+    return []
+
+
+def bundle_jobs(app_module):
+    """(output, key, callback name, args) for every figure of the bundled input space"""
+    m = app_module
+    team_tab = m.render_tab_content('tab-team-analysis')
+    season_tab = m.render_tab_content('tab-season-analysis')
+    trends_tab = m.render_tab_content('tab-league-trends')
+    payroll_tab = m.render_tab_content('tab-payroll-analysis')
+    jobs = []
+
+    def add(output, values, name, args):
+        jobs.append((output, entry_key(output, values), name, args))
+
+    for team in _options(team_tab, 'team-dropdown'):
+        add('attendance-payroll-graph.figure', {'team-dropdown.value': [team]},
+            'update_attendance_payroll_graph', ([team],))
+        for metric in _options(team_tab, 'metric-dropdown'):
+            for chart_type in _options(team_tab, 'chart-type'):
+                add('team-analysis-graph.figure',
+                    {'team-dropdown.value': [team], 'metric-dropdown.value': metric, 'chart-type.value': chart_type},
+                    'build_team_analysis_figure', ([team], metric, chart_type, None, m.target_points(None)))
+    for season in _options(season_tab, 'season-dropdown'):
+        add('team-distribution-graph.figure', {'season-dropdown.value': season},
+            'update_team_distribution_graph', (season,))
+        for n_teams in _slider_values(season_tab, 'top-teams-slider'):
+            add('top-teams-graph.figure', {'season-dropdown.value': season, 'top-teams-slider.value': n_teams},
+                'update_top_teams_graph', (season, n_teams))
+    for season in _options(trends_tab, 'seasons-multi-dropdown'):
+        add('attendance-distribution-graph.figure', {'seasons-multi-dropdown.value': [season]},
+            'update_attendance_distribution_graph', ([season],))
+    for team in _options(payroll_tab, 'yoy-team-dropdown'):
+        add('yoy-change-graph.figure', {'yoy-team-dropdown.value': team}, 'update_yoy_change_graph', (team,))
+    for graph_id, name in (('league-trends-graph', 'update_league_trends_graph'),
+                           ('payroll-correlation-graph', 'update_payroll_correlation_graph'),
+                           ('championship-impact-graph', 'update_championship_impact_graph'),
+                           ('championships-by-team-graph', 'update_championships_by_team_graph')):
+        add(f'{graph_id}.figure', {}, name, (graph_id,))
+    return jobs
+
+
+def _render_job(job):
+    """(key, gzipped response body or None) for one job; runs in a forked worker"""
+    import MLBAttendance
+    output, key, name, args = job
+    figure_json = getattr(MLBAttendance, name).render(*args)
+    if isinstance(figure_json, ErrorPayload):
+        return key, None  # failed; left to the live callback
+    meta = json.loads(figure_json).get('layout', {}).get('meta')
+    if isinstance(meta, dict) and meta.get('downsampled'):
+        return key, None  # depends on the viewport; left to the live callback
+    return key, gzip.compress(response_body(output, figure_json), compresslevel=9)
+
+
+def build_bundle(directory, workers=None):
+    """Render every bundled figure into directory (atomically); returns (rendered, skipped)"""
+    import MLBAttendance
+    from prepared_cache import source_fingerprint
+
+    jobs = bundle_jobs(MLBAttendance)
+    tmp_dir = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    entries = {}
+    skipped = 0
+    with get_context('fork').Pool(workers or os.cpu_count()) as pool:
+        for key, payload in pool.imap_unordered(_render_job, jobs, chunksize=8):
+            if payload is None:
+                skipped += 1
+                continue
+            name = f"{len(entries):05d}.json.gz"
+            with open(os.path.join(tmp_dir, name), 'wb') as fh:
+                fh.write(payload)
+            entries[key] = name
+    with open(os.path.join(tmp_dir, MANIFEST), 'w') as fh:
+        json.dump({'fingerprint': source_fingerprint(MLBAttendance.data_sources()), 'entries': entries}, fh)
+
+    old_dir = f"{directory}.{os.getpid()}.old"
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return len(entries), skipped
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m static_bundle', description="Pre-render the figure bundle")
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('directory', nargs='?', default=STATIC_BUNDLE_DIR or 'bundle')
+    parser.add_argument('--workers', type=int, default=None, help="render processes (default: one per core)")
+    args = parser.parse_args(argv[1:])
+
+    # Render the source data only: no previous bundle, shared export or season updates
+    os.environ['MLB_STATIC_BUNDLE_DIR'] = ''
+    os.environ['MLB_SHARED_DATA_DIR'] = ''
+    os.environ['MLB_UPDATES_DIR'] = ''
+    import MLBAttendance
+    if MLBAttendance.df.empty:
+        print("No data loaded; nothing rendered")
+        return 1
+    started = time.perf_counter()
+    rendered, skipped = build_bundle(args.directory, args.workers)
+    print(f"✓ Rendered {rendered} figures to {args.directory} in {time.perf_counter() - started:.1f}s"
+          + (f" ({skipped} downsampled figures left to the live callbacks)" if skipped else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,87 @@
+"""
+Per-team summary table built at load time.
+
+One row per team with the mean, median and total of attendance, payroll and
+efficiency over its loaded seasons, computed in one grouped pass. Titles and
+pennants come from the World Series file, which can change independently of
+the attendance data, so with_titles() joins them on per file version (one
+vectorized join, cached).
+
+Every statistic of a team only depends on that team's rows, so append()
+recomputes just the teams that received rows.
+"""
+import pandas as pd
+
+SUMMARY_METRICS = ['attendance', 'Est. Payroll', 'efficiency']
+SUMMARY_STATS = ['mean', 'median', 'sum']
+
+
+def summary_columns(metrics=SUMMARY_METRICS, stats=SUMMARY_STATS):
+    """Names of the metric columns: {metric}_{stat}"""
+    return [f'{col}_{stat}' for col in metrics for stat in stats]
+
+
+def summarize(df):
+    """Summary rows (indexed by team name, sorted) of the teams in df"""
+    metrics = [col for col in SUMMARY_METRICS if col in df]
+    # In float64, as the other rollups: float32 totals would round
+    values = df[['team'] + metrics].astype({col: 'float64' for col in metrics})
+    grouped = values.groupby('team', sort=False, observed=True)
+    table = grouped[metrics].agg(SUMMARY_STATS)
+    table.columns = [f'{col}_{stat}' for col, stat in table.columns]
+    table['seasons'] = grouped.size()
+    # By name: the category order of team puts teams added by appends last
+    table.index = table.index.astype(str)
+    table.index.name = 'team'
+    table = table.sort_index()
+    # Blank or missing team names are not teams
+    return table[(table.index != '') & (table.index != 'nan')]
+
+
+class TeamSummary:
+    """Team summary table of a prepared attendance frame"""
+
+    def __init__(self, df):
+        self.table = pd.DataFrame(columns=summary_columns() + ['seasons'], index=pd.Index([], name='team'))
+        if len(df) and 'team' in df:
+            self.table = summarize(df)
+        self._with_titles = (None, None)
+
+    @property
+    def teams(self):
+        """Sorted names of the teams with loaded seasons"""
+        return list(self.table.index)
+
+    def append(self, rows, index):
+        """Recompute the teams present in rows; index is a DataIndex over the combined frame.
+
+        The table is replaced rather than modified, so a shallow copy can be
+        updated while the original keeps serving.
+        """
+        if not len(rows):
+            return
+        teams = [team for team in pd.unique(rows['team']) if isinstance(team, str)]
+        updated = summarize(pd.concat([index.team(team) for team in teams]))
+        self.table = pd.concat([self.table.drop(updated.index, errors='ignore'), updated]).sort_index()
+        self._with_titles = (None, None)
+
+    def with_titles(self, ws_data):
+        """The table with titles and pennants joined on, for WorldSeriesData (or None)
+
+        World Series teams without loaded seasons are included, with zero
+        seasons and missing metrics.
+        """
+        signature = ws_data.signature if ws_data is not None else None
+        cached_signature, table = self._with_titles
+        if table is not None and cached_signature == signature:
+            return table
+        counts = pd.DataFrame({
+            'titles': pd.Series(ws_data.champ_counts if ws_data is not None else {}, dtype='int64'),
+            'pennants': pd.Series(ws_data.pennant_counts if ws_data is not None else {}, dtype='int64'),
+        })
+        table = self.table.join(counts, how='outer')
+        table = table.fillna({'seasons': 0, 'titles': 0, 'pennants': 0})
+        table = table.astype({'seasons': 'int64', 'titles': 'int64', 'pennants': 'int64'})
+        table.index.name = 'team'
+        self._with_titles = (signature, table)
+        return table
@@ -0,0 +1,77 @@
+"""
+Per-team year-over-year changes precomputed at load time.
+
+Year-over-year % changes of attendance, payroll and efficiency are computed
+for every team in one grouped pass over the frame sorted by (team, Season).
+Only the change columns are stored, per team, with the frame positions of
+the rows they belong to; a lookup gathers the team's rows from the frame, as
+DataIndex(materialize=False) does, so no process keeps a second copy of the
+source columns (in the shared-memory mode they stay in the shared frame).
+
+Each team's changes only depend on that team's rows, so append() recomputes
+just the teams that received rows.
+"""
+import numpy as np
+import pandas as pd
+
+# Output column prefix -> source column
+TREND_METRICS = {'attendance': 'attendance', 'payroll': 'Est. Payroll', 'efficiency': 'efficiency'}
+
+
+def trend_columns(metrics=TREND_METRICS):
+    """Names of the computed columns: {name}_yoy"""
+    return [f'{name}_yoy' for name in metrics]
+
+
+def compute_trends(rows, positions):
+    """{team: (frame positions in Season order, % change columns)} for rows at positions of a frame
+
+    Computed and stored in float64.
+    """
+    sources = [col for col in TREND_METRICS.values() if col in rows]
+    names = [name for name, col in TREND_METRICS.items() if col in rows]
+    keys = pd.DataFrame({'team': rows['team'].to_numpy(), 'Season': rows['Season'].to_numpy()})
+    order = keys.sort_values(['team', 'Season'], kind='stable').index.to_numpy()
+    team = keys['team'].take(order).reset_index(drop=True)
+    values = rows[sources].astype('float64').set_axis(names, axis=1).take(order).reset_index(drop=True)
+    changes = (values.groupby(team, sort=False, observed=True).pct_change(fill_method=None) * 100).add_suffix('_yoy')
+    positions = np.asarray(positions)[order].astype('int32')
+    return {name: (positions[at], changes.take(at).reset_index(drop=True))
+            for name, at in changes.groupby(team, sort=True, observed=True).indices.items()}
+
+
+class Trends:
+    """Year-over-year changes of a prepared attendance frame, looked up per team"""
+
+    def __init__(self, df):
+        self._df = df
+        self.by_team = {}
+        self._columns = [col for col in ['team', 'Season'] + list(TREND_METRICS.values()) if col in df]
+        if len(df) and 'team' in df and 'Season' in df:
+            self.by_team = compute_trends(df, np.arange(len(df)))
+
+    def append(self, df, start):
+        """Recompute the teams of the rows df.iloc[start:] appended to the frame.
+
+        The per-team dict is replaced rather than mutated, so a shallow copy
+        can be updated while the original keeps serving.
+        """
+        rows = df.iloc[start:]
+        self._df = df
+        if not len(rows):
+            return
+        positions = []
+        for team, at in rows.groupby('team', observed=True).indices.items():
+            known = self.by_team.get(team)
+            positions.append(start + at if known is None else np.concatenate([known[0], start + at]))
+        positions = np.concatenate(positions)
+        updated = compute_trends(df.take(positions), positions)
+        self.by_team = dict(sorted({**self.by_team, **updated}.items()))
+
+    def team(self, team):
+        """One team's rows in Season order with the change columns (empty frame if unknown)"""
+        positions, changes = self.by_team.get(team, (np.array([], dtype='int32'), None))
+        rows = self._df.take(positions)[self._columns].reset_index(drop=True)
+        if changes is None:
+            changes = pd.DataFrame({col: pd.Series(dtype='float64') for col in trend_columns()})
+        return pd.concat([rows, changes], axis=1)
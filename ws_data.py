@@ -0,0 +1,104 @@
+"""
+Shared World Series data layer for the MLB Attendance Dashboard.
+
+The World Series CSV is parsed once per process and cached. Every call to
+get_ws_data() checks the file's mtime and size, so an edited file is picked up
+on the next request without restarting the app, while unchanged files cost a
+single os.stat().
+"""
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+WS_DATA_FILE = 'MLB Wolrd Series Winners 2000-25.csv'
+
+# Team name normalization for the World Series file
+WS_TEAM_NAME_MAP = {
+    'Anaheim Angels': 'Los Angeles Angels',
+    'Florida Marlins': 'Miami Marlins',
+    'Cleveland Indians': 'Cleveland Guardians'
+}
+
+
+@dataclass(frozen=True)
+class WorldSeriesData:
+    """Parsed World Series results plus precomputed per-team lookups"""
+    frame: pd.DataFrame
+    champ_counts: Counter
+    pennant_counts: Counter
+    titles_by_team: dict = field(default_factory=dict)
+    finals_losses_by_team: dict = field(default_factory=dict)
+    signature: tuple = ()
+
+    @property
+    def champions(self):
+        """Teams with at least one title, in file order"""
+        return list(self.champ_counts.keys())
+
+    def titles(self, team):
+        """Seasons in which team won the World Series"""
+        return self.titles_by_team.get(team, [])
+
+    def pennants(self, team):
+        """Seasons in which team reached the World Series (won or lost)"""
+        return sorted(self.titles(team) + self.finals_losses_by_team.get(team, []))
+
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def parse_ws_file(path=WS_DATA_FILE):
+    """Read and normalize the World Series CSV"""
+    ws_df = pd.read_csv(path, skiprows=1)
+    ws_df.columns = ['Season', 'Winner', 'Loser', 'Series']
+    ws_df['Winner'] = ws_df['Winner'].str.strip().replace(WS_TEAM_NAME_MAP)
+    ws_df['Loser'] = ws_df['Loser'].str.strip().replace(WS_TEAM_NAME_MAP)
+    return ws_df
+
+
+def _build(ws_df, signature):
+    """Precompute counts and per-team season lists for a parsed frame"""
+    titles_by_team = {}
+    for team, season in zip(ws_df['Winner'], ws_df['Season']):
+        titles_by_team.setdefault(team, []).append(int(season))
+    finals_losses_by_team = {}
+    for team, season in zip(ws_df['Loser'], ws_df['Season']):
+        finals_losses_by_team.setdefault(team, []).append(int(season))
+
+    champ_counts = Counter(ws_df['Winner'])
+    pennant_counts = champ_counts + Counter(ws_df['Loser'])
+    return WorldSeriesData(
+        frame=ws_df,
+        champ_counts=champ_counts,
+        pennant_counts=pennant_counts,
+        titles_by_team={team: sorted(s) for team, s in titles_by_team.items()},
+        finals_losses_by_team={team: sorted(s) for team, s in finals_losses_by_team.items()},
+        signature=signature,
+    )
+
+
+def get_ws_data(path=WS_DATA_FILE):
+    """Return the cached WorldSeriesData for path, or None if the file is missing.
+
+    The file is re-parsed only when its mtime or size changes.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached.signature == signature:
+        return cached
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached is None or cached.signature != signature:
+            cached = _build(parse_ws_file(path), signature)
+            _cache[path] = cached
+    return cached